@@ -0,0 +1,63 @@
+""" Dispatches 10k mouse motion events against 1k registered hitboxes
+
+    python -m benchmarks.bench_eventhandler
+"""
+import asyncio
+import os
+from time import perf_counter
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from pyscreen.eventHandler import EventHandler
+from pyscreen.hitbox import Hitbox
+
+HITBOXES = 1_000
+EVENTS = 10_000
+GRID = 40
+CELL = 20
+
+
+def setup():
+    eventHandler = EventHandler()
+    # the benchmark dispatches on its own loop, stop the handler thread
+    eventHandler._running = False
+    eventHandler.join()
+
+    hitboxes = []
+    for i in range(HITBOXES):
+        x = (i % GRID) * CELL
+        y = (i // GRID) * CELL
+        hitbox = Hitbox(eventHandler, (x, y), (CELL, CELL))
+        hitbox.addEventListener("mouseEnter", lambda: None)
+        hitbox.addEventListener("mouseLeave", lambda: None)
+        hitboxes.append(hitbox)
+    return eventHandler, hitboxes
+
+
+def events():
+    for i in range(EVENTS):
+        x = (i * 7) % (GRID * CELL)
+        y = (i * 13) % ((HITBOXES // GRID) * CELL)
+        yield pygame.event.Event(pygame.MOUSEMOTION, pos=(x, y), rel=(7, 13), buttons=(0, 0, 0))
+
+
+async def dispatch(eventHandler: EventHandler):
+    for event in events():
+        await eventHandler.handleEvent(event)
+
+
+def main():
+    eventHandler, hitboxes = setup()
+
+    start = perf_counter()
+    asyncio.run(dispatch(eventHandler))
+    elapsed = perf_counter() - start
+
+    print(f"{EVENTS} mouse motion events, {len(hitboxes)} hitboxes: "
+          f"{elapsed:.3f}s total, {elapsed / EVENTS * 1_000_000:.1f}us per event")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+""" Compares the per-call cost of a listener record against resolving the signature on every call
+
+    python -m benchmarks.bench_listener
+"""
+import inspect
+from timeit import timeit
+
+from pyscreen.eventHandler import EventListener
+
+CALLS = 100_000
+
+
+class Event:
+    pass
+
+
+def with_event(e):
+    pass
+
+
+def without_event():
+    pass
+
+
+def per_call(func):
+    # the calling convention as it was resolved before listener records
+    def eventListener(e):
+        params = inspect.signature(func).parameters
+        if len(params) == 1:
+            func(e)
+        else:
+            func()
+    return eventListener
+
+
+def main():
+    event = Event()
+    for func in (with_event, without_event):
+        old = per_call(func)
+        new = EventListener(func, "tick")
+
+        t_old = timeit(lambda: old(event), number=CALLS)
+        t_new = timeit(lambda: new(event), number=CALLS)
+
+        print(f"{func.__name__}: signature per call {t_old / CALLS * 1_000_000_000:.0f}ns, "
+              f"listener record {t_new / CALLS * 1_000_000_000:.0f}ns ({t_old / t_new:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+""" Compares declination lookups on a precomputed magnetic grid and the batch
+    evaluation of the model with calc_mag_field
+
+    python -m benchmarks.bench_magnetic
+"""
+import random
+from time import perf_counter
+
+import numpy as np
+
+from pyscreen.core.geomag.world_magnetic_model import WorldMagneticModel
+
+# operational area (latitudes, longitudes) and grid resolution in degrees
+AREA = ((35, 72), (-25, 45))
+RESOLUTION = 0.25
+POINTS = 2_000
+BATCH = 100_000
+
+
+def main():
+    wmm = WorldMagneticModel()
+    random.seed(0)
+    points = [(random.uniform(*AREA[0]), random.uniform(*AREA[1])) for _ in range(POINTS)]
+
+    start = perf_counter()
+    grid = wmm.use_grid(*AREA, resolution=RESOLUTION)
+    build = perf_counter() - start
+
+    start = perf_counter()
+    exact = [wmm.calc_mag_field(lat, lon).declination for lat, lon in points]
+    calc = perf_counter() - start
+
+    start = perf_counter()
+    interpolated = [wmm.declination_at(lat, lon) for lat, lon in points]
+    lookup = perf_counter() - start
+
+    lat = np.random.default_rng(0).uniform(*AREA[0], BATCH)
+    lon = np.random.default_rng(1).uniform(*AREA[1], BATCH)
+    start = perf_counter()
+    wmm.declination_at(lat, lon)
+    batch = perf_counter() - start
+
+    start = perf_counter()
+    wmm.fields(lat, lon)
+    fields = perf_counter() - start
+
+    error = np.abs(np.array(exact) - np.array(interpolated))
+    print(f"grid {grid.Bx.shape[0]}x{grid.Bx.shape[1]} at {RESOLUTION} degrees: built in {build:.2f}s, {grid.nbytes / 1024 / 1024:.1f}MB")
+    print(f"calc_mag_field: {calc / POINTS * 1_000_000:.1f}us per point")
+    print(f"grid lookup:    {lookup / POINTS * 1_000_000:.1f}us per point, "
+          f"{batch / BATCH * 1_000_000:.2f}us per point for {BATCH} points at once")
+    print(f"fields:         {fields / BATCH * 1_000_000:.2f}us per point for {BATCH} points at once")
+    print(f"declination error: max {error.max():.4f}, mean {error.mean():.4f} degrees")
+
+
+if __name__ == "__main__":
+    main()
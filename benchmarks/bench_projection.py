@@ -0,0 +1,74 @@
+""" Projects 100k coordinates with the batch projection and one by one with toVector2IfVisible,
+    then again for an unchanged view, where the positions cached for the generation are reused
+
+    python -m benchmarks.bench_projection
+"""
+import os
+from time import perf_counter
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import numpy as np
+import pygame
+
+from pyscreen.core.coordinate import Coordinate
+from pyscreen.core.projection import ProjectedPoints, project
+from pyscreen.core.scale import Scale
+from pyscreen.drawobj.map import Map
+
+POINTS = 100_000
+SIZE = (1920, 1080)
+
+
+class View(Map):
+    # a map without a screen, toVector2 only needs the projection
+    def __init__(self, center: Coordinate, scale: Scale, size: tuple[int,int]):
+        self.center = center
+        self._scale = scale
+        self.surface = pygame.Surface(size)
+
+    def __hash__(self) -> int:
+        return hash((self._scale, self.center))
+
+
+def main():
+    rng = np.random.default_rng(0)
+    latitude = rng.uniform(-80, 80, POINTS)
+    longitude = rng.uniform(-180, 180, POINTS)
+    center = Coordinate(48, 11)
+    scale = Scale(2000)
+
+    start = perf_counter()
+    x, y, visible = project(latitude, longitude, center, scale, SIZE)
+    batch = perf_counter() - start
+
+    view = View(center, scale, SIZE)
+    coordinates = [Coordinate(lat, lon) for lat, lon in zip(latitude.tolist(), longitude.tolist())]
+    start = perf_counter()
+    vectors = [c.toVector2IfVisible(view) for c in coordinates]
+    single = perf_counter() - start
+
+    context = view.projection
+    start = perf_counter()
+    for c in coordinates:
+        c.toVector2IfVisible(context)
+    cached = perf_counter() - start
+
+    points = ProjectedPoints(latitude, longitude)
+    points.positions(context)
+    start = perf_counter()
+    points.positions(context)
+    reused = perf_counter() - start
+
+    mismatch = 0
+    for i, v in enumerate(vectors):
+        if (v is None) == bool(visible[i]) or (v is not None and (abs(v.x - x[i]) > 1e-6 or abs(v.y - y[i]) > 1e-6)):
+            mismatch += 1
+
+    print(f"{POINTS} coordinates: batch {batch * 1000:.1f}ms, "
+          f"toVector2IfVisible {single * 1000:.1f}ms ({single / batch:.0f}x), {mismatch} mismatches")
+    print(f"same generation: toVector2IfVisible {cached * 1000:.1f}ms, ProjectedPoints {reused * 1_000_000:.1f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+from typing import Iterable
+
+from pygame import Rect
+
+from pyscreen.drawobj.base.renderable import Renderable
+
+from pyscreen.logging import getLogger
+logger = getLogger()
+
+
+# Fraction of the screen area that may be damaged before a full flip is cheaper
+DEFAULT_DAMAGE_THRESHOLD = 0.5
+
+
+class DamageStats:
+    """ Damaged-area statistics collected by the DirtyRectCompositor """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.frames = 0
+        self.full_frames = 0
+        self.partial_frames = 0
+        self.idle_frames = 0
+        self.last_rects = 0
+        self.last_area = 0
+        self.last_ratio = 0.0
+        self._ratio_sum = 0.0
+
+    @property
+    def avg_ratio(self) -> float:
+        if self.frames == 0:
+            return 0.0
+        return self._ratio_sum / self.frames
+
+    def record(self, rects: int, area: int, ratio: float, full: bool):
+        self.frames += 1
+        self.last_rects = rects
+        self.last_area = area
+        self.last_ratio = ratio
+        self._ratio_sum += ratio
+
+        if full:
+            self.full_frames += 1
+        elif rects == 0:
+            self.idle_frames += 1
+        else:
+            self.partial_frames += 1
+
+    def as_dict(self) -> dict:
+        return {
+            "frames": self.frames,
+            "full_frames": self.full_frames,
+            "partial_frames": self.partial_frames,
+            "idle_frames": self.idle_frames,
+            "last_rects": self.last_rects,
+            "last_area": self.last_area,
+            "last_ratio": self.last_ratio,
+            "avg_ratio": self.avg_ratio,
+        }
+
+    def __str__(self):
+        return (f"damage: {self.last_ratio*100:.1f}% ({self.last_rects} rects), avg {self.avg_ratio*100:.1f}%, "
+                f"full: {self.full_frames}, partial: {self.partial_frames}, idle: {self.idle_frames}")
+
+
+class DirtyRectCompositor:
+    """ Collects the damaged screen regions of a set of renderables
+
+        Every entity that reports `changed` damages both the rect it covered in the
+        last frame and the rect it covers now. Entities that cannot report a rect
+        (no `get_rect`) damage the whole screen.
+    """
+
+    def __init__(self, threshold: float = DEFAULT_DAMAGE_THRESHOLD):
+        if threshold < 0 or threshold > 1:
+            raise ValueError("threshold must be between 0 and 1")
+        self.threshold = threshold
+        self.stats = DamageStats()
+        self._last_rects: dict[int, Rect] = {}
+        self._force_full = True
+
+    def invalidate(self):
+        """ Forces the next frame to be a full redraw """
+        self._force_full = True
+
+    @staticmethod
+    def _get_rect(entity: Renderable) -> Rect|None:
+        get_rect = getattr(entity, "get_rect", None)
+        if get_rect is None:
+            return None
+        try:
+            return Rect(get_rect())
+        except (NotImplementedError, TypeError, ValueError):
+            return None
+
+    def collect(self, entities: Iterable[Renderable], screen_rect: Rect, extra: Iterable[Rect] = ()) -> list[Rect]|None:
+        """ Returns the damaged rects of this frame or None if a full redraw is required
+
+            extra are regions damaged by something else than the entities, e.g. an overlay.
+        """
+        if self._force_full:
+            return None
+
+        damaged: list[Rect] = [Rect(rect) for rect in extra]
+        seen = set()
+        for entity in entities:
+            seen.add(entity.id)
+            if not entity.changed:
+                continue
+
+            rect = self._get_rect(entity)
+            if rect is None:
+                return None
+
+            old_rect = self._last_rects.get(entity.id)
+            if old_rect is not None and old_rect.size != (0, 0):
+                damaged.append(old_rect)
+            damaged.append(rect)
+
+        # removed entities leave their last rect behind
+        for entity_id, rect in self._last_rects.items():
+            if entity_id not in seen:
+                damaged.append(rect)
+
+        damaged = self._merge([r.clip(screen_rect) for r in damaged if r.width > 0 and r.height > 0])
+        damaged = [r for r in damaged if r.width > 0 and r.height > 0]
+
+        screen_area = screen_rect.width * screen_rect.height
+        if screen_area == 0:
+            return None
+        if sum(r.width * r.height for r in damaged) / screen_area > self.threshold:
+            return None
+
+        return damaged
+
+    @staticmethod
+    def _merge(rects: list[Rect]) -> list[Rect]:
+        """ Merges overlapping rects so no pixel is redrawn twice """
+        merged: list[Rect] = []
+        for rect in rects:
+            rect = Rect(rect)
+            i = 0
+            while i < len(merged):
+                if rect.colliderect(merged[i]):
+                    rect.union_ip(merged.pop(i))
+                    i = 0
+                else:
+                    i += 1
+            merged.append(rect)
+        return merged
+
+    def commit(self, entities: Iterable[Renderable], rects: list[Rect]|None, screen_rect: Rect):
+        """ Stores the rects of this frame and records the damage statistics """
+        last_rects = {}
+        for entity in entities:
+            rect = self._get_rect(entity)
+            if rect is not None:
+                last_rects[entity.id] = rect
+        self._last_rects = last_rects
+        self._force_full = False
+
+        screen_area = max(screen_rect.width * screen_rect.height, 1)
+        if rects is None:
+            self.stats.record(1, screen_area, 1.0, True)
+        else:
+            area = sum(r.width * r.height for r in rects)
+            self.stats.record(len(rects), area, area / screen_area, False)
+
+    @staticmethod
+    def overlaps(entity: Renderable, rects: list[Rect]) -> bool:
+        rect = DirtyRectCompositor._get_rect(entity)
+        if rect is None:
+            return True
+        return rect.collidelist(rects) != -1
@@ -0,0 +1,266 @@
+import sys
+import weakref
+from collections import OrderedDict
+from fnmatch import fnmatchcase
+from functools import wraps
+from threading import Lock
+from typing import Callable
+
+# Memory bound of one method cache
+DEFAULT_MAX_BYTES = 4 * 1024 * 1024
+# Estimated cost of the dict slot and the key tuple of one entry
+ENTRY_OVERHEAD = 120
+
+_MISSING = object()
+_KWARGS = object()
+
+
+class CacheStats:
+    """ Hit/miss statistics of a MethodCache """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        if total == 0:
+            return 0.0
+        return self.hits / total
+
+    def as_dict(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hit_rate,
+        }
+
+
+class MethodCache:
+    """ LRU cache of one function, bounded by the estimated memory of its entries
+
+        Replaces functools.lru_cache for the core types. The cache can be switched off
+        at runtime, the function is then called directly. With weak_arg, the positional
+        argument at that index (e.g. the map of Coordinate.toVector2) is only referenced
+        weakly: it is keyed by identity and its current hash, and its entries are dropped
+        when it is garbage collected. Arguments that do not support weak references are
+        keyed as usual.
+    """
+
+    def __init__(self, func: Callable, name: str, max_bytes: int = DEFAULT_MAX_BYTES, enabled: bool = True,
+                 weak_arg: int|None = None):
+        if max_bytes < 0:
+            raise ValueError("cache limit cannot be negative")
+        self.func = func
+        self.name = name
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self.weak_arg = weak_arg
+        self.stats = CacheStats()
+        self._lock = Lock()
+        self._entries: OrderedDict[tuple, tuple[object, int]] = OrderedDict()
+        self._owners: dict[int, weakref.ref] = {}
+        self._released: list[int] = []
+        self._bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def nbytes(self) -> int:
+        """ Estimated memory held by the entries """
+        return self._bytes
+
+    def __call__(self, *args, **kwargs):
+        if not self.enabled:
+            return self.func(*args, **kwargs)
+
+        key = self._key(args, kwargs)
+        with self._lock:
+            if self._released:
+                self._purge()
+            entry = self._entries.get(key, _MISSING)
+            if entry is not _MISSING:
+                self._entries.move_to_end(key)
+                self.stats.hits += 1
+                return entry[0]
+            self.stats.misses += 1
+
+        value = self.func(*args, **kwargs)
+
+        size = ENTRY_OVERHEAD + sys.getsizeof(value) + sum(sys.getsizeof(arg) for arg in key)
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = (value, size)
+                self._bytes += size
+                while self._entries and self._bytes > self.max_bytes:
+                    _, (_, evicted) = self._entries.popitem(last=False)
+                    self._bytes -= evicted
+                    self.stats.evictions += 1
+        return value
+
+    def _key(self, args: tuple, kwargs: dict) -> tuple:
+        if self.weak_arg is not None and self.weak_arg < len(args):
+            owner = self._owner(args[self.weak_arg])
+            if owner is not None:
+                args = args[:self.weak_arg] + (owner,) + args[self.weak_arg + 1:]
+        if kwargs:
+            args += (_KWARGS,) + tuple(sorted(kwargs.items()))
+        return args
+
+    def _owner(self, obj) -> tuple|None:
+        """ Key of an object that is only referenced weakly, None if it has no weak references """
+        ident = id(obj)
+        ref = self._owners.get(ident)
+        if ref is None or ref() is not obj:
+            try:
+                # the callback may run in the middle of a cache operation, the entries
+                # are dropped by the next call
+                ref = weakref.ref(obj, lambda _, ident=ident: self._released.append(ident))
+            except TypeError:
+                return None
+            self._owners[ident] = ref
+        return (_MISSING, ident, hash(obj))
+
+    def _purge(self):
+        """ Drops the entries of collected weak arguments, called with the lock held """
+        released = set()
+        while self._released:
+            ident = self._released.pop()
+            ref = self._owners.get(ident)
+            if ref is not None and ref() is None:
+                del self._owners[ident]
+            released.add(ident)
+        stale = [key for key in self._entries if self._owned_by(key, released)]
+        for key in stale:
+            _, size = self._entries.pop(key)
+            self._bytes -= size
+
+    def _owned_by(self, key: tuple, idents: set[int]) -> bool:
+        if self.weak_arg >= len(key):
+            return False
+        owner = key[self.weak_arg]
+        return type(owner) is tuple and len(owner) == 3 and owner[0] is _MISSING and owner[1] in idents
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._owners.clear()
+            self._released.clear()
+            self._bytes = 0
+
+    def as_dict(self) -> dict:
+        return dict(self.stats.as_dict(), name=self.name, enabled=self.enabled, entries=len(self),
+                    nbytes=self._bytes, max_bytes=self.max_bytes)
+
+    def __str__(self):
+        state = "on" if self.enabled else "off"
+        return (f"{self.name} ({state}): {self.stats.hits} hits, {self.stats.misses} misses "
+                f"({self.stats.hit_rate*100:.0f}%), {len(self)} entries / {self._bytes / 1024 / 1024:.1f}MB")
+
+
+class CachePolicy:
+    """ Registry of the method caches of pyscreen.core
+
+        Caches are addressed by the qualified name of their function, e.g.
+        "Coordinate.toVector2". enable, disable, set_max_bytes and clear also accept
+        shell style patterns like "Vector2.*", so caches that do not pay off can be
+        switched off and their memory released.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._caches: dict[str, MethodCache] = {}
+
+    def register(self, cache: MethodCache):
+        with self._lock:
+            if cache.name in self._caches:
+                raise ValueError(f"cache {cache.name} is already registered")
+            self._caches[cache.name] = cache
+
+    def __getitem__(self, name: str) -> MethodCache:
+        return self._caches[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._caches
+
+    def __iter__(self):
+        return iter(list(self._caches.values()))
+
+    def select(self, pattern: str) -> list[MethodCache]:
+        caches = [cache for cache in self if fnmatchcase(cache.name, pattern)]
+        if not caches:
+            raise KeyError(f"no cache matches {pattern}")
+        return caches
+
+    def enable(self, pattern: str = "*"):
+        for cache in self.select(pattern):
+            cache.enabled = True
+
+    def disable(self, pattern: str = "*"):
+        """ Switches the caches off and releases their entries """
+        for cache in self.select(pattern):
+            cache.enabled = False
+            cache.clear()
+
+    def set_max_bytes(self, pattern: str, max_bytes: int):
+        if max_bytes < 0:
+            raise ValueError("cache limit cannot be negative")
+        for cache in self.select(pattern):
+            cache.max_bytes = max_bytes
+            if cache.nbytes > max_bytes:
+                cache.clear()
+
+    def clear(self, pattern: str = "*"):
+        for cache in self.select(pattern):
+            cache.clear()
+
+    def reset_stats(self):
+        for cache in self:
+            cache.stats.reset()
+
+    @property
+    def nbytes(self) -> int:
+        return sum(cache.nbytes for cache in self)
+
+    def stats(self) -> dict[str, dict]:
+        """ as_dict of every cache by name """
+        return {cache.name: cache.as_dict() for cache in self}
+
+    def __str__(self):
+        caches = list(self)
+        hits = sum(cache.stats.hits for cache in caches)
+        misses = sum(cache.stats.misses for cache in caches)
+        hit_rate = hits / (hits + misses) if hits + misses else 0.0
+        enabled = sum(cache.enabled for cache in caches)
+        return (f"core caches: {enabled}/{len(caches)} on, {hits} hits, {misses} misses ({hit_rate*100:.0f}%), "
+                f"{sum(len(cache) for cache in caches)} entries / {self.nbytes / 1024 / 1024:.1f}MB")
+
+
+cache_policy = CachePolicy()
+
+
+def cached(name: str|None = None, max_bytes: int = DEFAULT_MAX_BYTES, enabled: bool = True,
+           weak_arg: int|None = None):
+    """ Decorator caching a function in a MethodCache registered with cache_policy
+
+        name defaults to the qualified name of the function.
+    """
+    def decorator(func):
+        cache = MethodCache(func, name or func.__qualname__, max_bytes, enabled, weak_arg)
+        cache_policy.register(cache)
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not cache.enabled:
+                return func(*args, **kwargs)
+            return cache(*args, **kwargs)
+        wrapper.cache = cache
+        return wrapper
+    return decorator
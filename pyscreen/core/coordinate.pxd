@@ -2,4 +2,6 @@ cdef class Coordinate:
     cdef double _longitude
     cdef double _latitude
 
-    cdef Py_hash_t __hash_cache
\ No newline at end of file
+    cdef Py_hash_t __hash_cache
+    # (generation, Vector2, visible) of the last projection
+    cdef object _projected
\ No newline at end of file
@@ -1,8 +1,11 @@
 from typing import Iterable, overload
 from .angle import Angle
 from .distance import Distance
+from .projection import ProjectionContext
 from .vector import Vector2, Vector3
 
+from pyscreen.drawobj.map import Map
+
 
 
 class Coordinate:
@@ -29,8 +32,8 @@ class Coordinate:
     def pbd(self, bearing: Angle, distance: Distance, is_magnetic: bool = True):...
     def getPlaceByBearingDistance(self, bearing: Angle, distance: Distance, is_magnetic: bool = True):...
 
-    def toVector2(self, gamemap) -> Vector2:...
-    def toVector2IfVisible(self, gamemap) -> Vector2:...
+    def toVector2(self, gamemap: Map|ProjectionContext) -> Vector2:...
+    def toVector2IfVisible(self, gamemap: Map|ProjectionContext) -> Vector2|None:...
     def toVector3(self) -> Vector3:...
 
     def _getInitialBearing(self, other):...
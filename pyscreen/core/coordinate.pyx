@@ -1,13 +1,14 @@
 from copy import deepcopy
-from functools import lru_cache
 from math import degrees, radians
 from libc.math cimport asin, atan2, cos, sin, sqrt, acos
 from typing import Iterable, overload, Optional
 import numpy as np
 
 from .angle cimport Angle
+from .cache import cached
 from .distance cimport Distance
 from .geomag.world_magnetic_model import WorldMagneticModel
+from .projection import ProjectionContext
 from .vector cimport Vector2, Vector3, IntVector2, IntVector3, IVector2, IVector3
 
 
@@ -76,6 +77,7 @@ cdef class Coordinate:
             self._latitude = latitude
 
         self.__hash_cache = hash((self._longitude,self._longitude))
+        self._projected = None
 
     @property
     def longitude(self):
@@ -89,16 +91,17 @@ cdef class Coordinate:
             self._longitude = longitude
 
         self.__hash_cache = hash((self._longitude,self._longitude))
+        self._projected = None
     
 
     @staticmethod
-    @lru_cache(maxsize=1_000_000)
+    @cached(weak_arg=1)
     def fromVector2(vector:IVector2, arg2, arg3 = None) -> Coordinate:
         return __c_FromVector2(vector, arg2, arg3)
 
 
     @staticmethod
-    @lru_cache(maxsize=1_000_000)
+    @cached()
     def fromVector3(vector:IVector3) -> Coordinate:
         lat = degrees(asin(-vector.y))
         lon = degrees(atan2(vector.x, vector.z))
@@ -108,21 +111,23 @@ cdef class Coordinate:
     def pbd(self, bearing: Angle, distance: Distance, is_magnetic: bool = True):
         return self.getPlaceByBearingDistance(bearing, distance, is_magnetic)
 
-    @lru_cache(maxsize=10000)
+    @cached()
     def getPlaceByBearingDistance(self, bearing: Angle, distance: Distance, is_magnetic: bool = True):
         return __c_GetPlaceByBearingDistance(self, bearing, distance, is_magnetic)
 
-    @lru_cache(maxsize=1_000_000)
     def toVector2(self, gamemap) -> Vector2:
-        return __c_ToVector2(self, gamemap)
+        """Screen position on a Map or for a ProjectionContext, kept until the view changes"""
+        return __c_Project(self, gamemap)[1]
 
-    @lru_cache(maxsize=1_000_000)
     def toVector2IfVisible(self, gamemap) -> Vector2:
-        return __c_ToVector2IfVisible(self, gamemap)
+        projected = __c_Project(self, gamemap)
+        if not projected[2]:
+            return None # not visible
+        return projected[1]
 
 
     
-    @lru_cache(maxsize=1_000_000)
+    @cached()
     def toVector3(self) -> Vector3:
         z = cos(radians(self.latitude)) * cos(radians(self.longitude))
         x = cos(radians(self.latitude)) * sin(radians(self.longitude))
@@ -130,35 +135,35 @@ cdef class Coordinate:
 
         return Vector3(x, -y, z)
 
-    @lru_cache(maxsize=1000)
+    @cached()
     def _getInitialBearing(self, other):
         return __c_getInitialBearing(self, other)
 
 
-    @lru_cache(maxsize=1000)
+    @cached()
     def distance(self, other):
         return _c_distance(self, other)
     
 
 
-    @lru_cache(maxsize=1000)
+    @cached(enabled=False)
     def quj(self, other: Coordinate):
         return self._getInitialBearing(other)
 
-    @lru_cache(maxsize=1000)
+    @cached(enabled=False)
     def qte(self, other: Coordinate):
         return (other.quj(self))
 
-    @lru_cache(maxsize=1000)
+    @cached()
     def getMagneticDeclination(self) -> Angle:
-        wmm = WorldMagneticModel()
-        return  Angle.fromDeg(wmm.calc_mag_field(self.latitude, self.longitude).declination)
+        wmm = WorldMagneticModel.shared()
+        return  Angle.fromDeg(wmm.declination_at(self.latitude, self.longitude))
 
-    @lru_cache(maxsize=1000)
+    @cached(enabled=False)
     def getMagneticHeading(self, hdg: Angle) -> Angle:
         return hdg + self.getMagneticDeclination()
 
-    @lru_cache(maxsize=1000)
+    @cached(enabled=False)
     def qdm(self, other) -> Angle:
         quj = self.quj(other).deg
         if (quj > 0):
@@ -166,7 +171,7 @@ cdef class Coordinate:
         else:
             return Angle.fromDeg(quj - self.getMagneticDeclination().deg)
 
-    @lru_cache(maxsize=1000)
+    @cached(enabled=False)
     def qdr(self, other: Coordinate) -> Angle:
         return Angle.fromDeg(self.qdm(other).deg - 180)
 
@@ -181,7 +186,6 @@ cdef class Coordinate:
     def copy(self):
         return deepcopy(Coordinate(self.latitude,self.longitude))
 
-    @lru_cache(maxsize=1_000_000)
     def __add__(self, other):
         latitude = self.latitude + other.latitude
         longitude = self.longitude + other.longitude
@@ -189,7 +193,6 @@ cdef class Coordinate:
 
     __radd__ = __add__
 
-    @lru_cache(maxsize=1_000_000)
     def __sub__(self, other):
         latitude = self.latitude - other.latitude
         longitude = self.longitude - other.longitude
@@ -197,7 +200,6 @@ cdef class Coordinate:
 
     __rsub__ = __sub__
 
-    @lru_cache(maxsize=1_000_000)
     def __mul__(self, other: int):
         latitude = self.latitude * other
         longitude = self.longitude * other
@@ -205,7 +207,6 @@ cdef class Coordinate:
 
     __rmul__ = __mul__
 
-    @lru_cache(maxsize=1_000_000)
     def __truediv__(self, other: int):
         latitude = self.latitude / other
         longitude = self.longitude / other
@@ -345,39 +346,26 @@ cdef Coordinate __c_GetPlaceByBearingDistance(Coordinate self, Angle bearing, Di
     
     return Coordinate(lat2,lon2)
 
-cdef Vector2 __c_ToVector2(Coordinate self, gamemap):
-    from pyscreen.drawobj.map import Map
-    assert isinstance(gamemap, Map)
-
-    vector = next(_get_vectors_from_coordinates(gamemap.center, self))
-
-    # Z is not relevant
-    v = Vector2(vector.x, vector.y)
+cdef tuple __c_Project(Coordinate self, gamemap):
+    cdef double dlat, dlon, cos_lat
 
-    offset = Vector2(gamemap.width//2, gamemap.height//2)
-
-    #apply scale
-    v *= gamemap.scale
-    v = v + offset
-    return v
-
-cdef Vector2 __c_ToVector2IfVisible(Coordinate self, gamemap):
-    from pyscreen.drawobj.map import Map
-    assert isinstance(gamemap, Map)
+    context = gamemap if isinstance(gamemap, ProjectionContext) else gamemap.projection
 
-    vector = next(_get_vectors_from_coordinates(gamemap.center, self))
+    projected = self._projected
+    if projected is not None and projected[0] == context.generation:
+        return projected
 
-    # Z is not relevant
-    if vector.z < 0:
-        return None # not visible
-    v = Vector2(vector.x, vector.y)
+    dlat = radians(self._latitude - context.latitude)
+    dlon = radians(self._longitude - context.longitude)
+    cos_lat = cos(dlat)
 
-    offset = Vector2(gamemap.width//2, gamemap.height//2)
+    v = Vector2(cos_lat * sin(dlon) * context.scale + context.width//2,
+                -sin(dlat) * context.scale + context.height//2)
 
-    #apply scale
-    v *= gamemap.scale
-    v = v + offset
-    return v
+    # replaced as a whole, another thread sees either the old or the new projection
+    projected = (context.generation, v, cos_lat * cos(dlon) >= 0)
+    self._projected = projected
+    return projected
 
 cdef Angle __c_getInitialBearing(Coordinate self, Coordinate other):
     cdef double dLon, initX, initY, initBearing
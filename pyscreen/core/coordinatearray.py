@@ -0,0 +1,165 @@
+from typing import Iterable, overload
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+from .angle import Angle
+from .coordinate import Coordinate
+from .distance import Distance
+from .geomag.world_magnetic_model import WorldMagneticModel
+
+EARTH_RADIUS_KM = Distance.EarthRadius().km
+
+
+def _normalize(latitude: NDArray[np.float64], longitude: NDArray[np.float64]):
+    """ Folds latitudes over the poles and wraps longitudes, as the Coordinate constructor does """
+    outside = (latitude > 90) | (latitude < -90)
+    if outside.any():
+        t = np.mod(latitude[outside] + 90, 360)
+        flipped = t > 180
+        latitude[outside] = np.where(flipped, 270 - t, t - 90)
+        longitude[outside] += np.where(flipped, 180, 0)
+
+    wrap = (longitude > 180) | (longitude < -180)
+    if wrap.any():
+        longitude[wrap] = np.mod(longitude[wrap] + 540, 360) - 180
+
+
+def _radians(value: Angle|ArrayLike) -> NDArray[np.float64]|float:
+    if isinstance(value, Angle):
+        return value.rad
+    return np.asarray(value, dtype=np.float64)
+
+
+def _km(value: Distance|ArrayLike) -> NDArray[np.float64]|float:
+    if isinstance(value, Distance):
+        return value.km
+    return np.asarray(value, dtype=np.float64)
+
+
+class CoordinateArray:
+    """ Many coordinates stored as two contiguous float64 arrays
+
+        The methods are the vectorized counterparts of the Coordinate methods of the
+        same name. Distances are returned in km and bearings in radians as arrays,
+        instead of one Distance or Angle per point.
+    """
+
+    def __init__(self, latitude: ArrayLike = (), longitude: ArrayLike = ()):
+        latitude = np.array(latitude, dtype=np.float64, ndmin=1)
+        longitude = np.array(longitude, dtype=np.float64, ndmin=1)
+        latitude, longitude = np.broadcast_arrays(latitude, longitude)
+        self._latitude = np.ascontiguousarray(latitude.ravel(), dtype=np.float64).copy()
+        self._longitude = np.ascontiguousarray(longitude.ravel(), dtype=np.float64).copy()
+        _normalize(self._latitude, self._longitude)
+
+    @classmethod
+    def fromCoordinates(cls, coordinates: Iterable[Coordinate]):
+        latitude, longitude = [], []
+        for coordinate in coordinates:
+            latitude.append(coordinate.latitude)
+            longitude.append(coordinate.longitude)
+        return cls(latitude, longitude)
+
+    @property
+    def latitude(self) -> NDArray[np.float64]:
+        return self._latitude
+
+    @property
+    def longitude(self) -> NDArray[np.float64]:
+        return self._longitude
+
+    def __len__(self):
+        return len(self._latitude)
+
+    @overload
+    def __getitem__(self, key: int) -> Coordinate:...
+    @overload
+    def __getitem__(self, key: slice|ArrayLike) -> "CoordinateArray":...
+
+    def __getitem__(self, key):
+        if isinstance(key, (int, np.integer)):
+            return Coordinate(float(self._latitude[key]), float(self._longitude[key]))
+        return CoordinateArray(self._latitude[key], self._longitude[key])
+
+    def __iter__(self):
+        for latitude, longitude in zip(self._latitude.tolist(), self._longitude.tolist()):
+            yield Coordinate(latitude, longitude)
+
+    def __repr__(self):
+        return f"CoordinateArray({len(self)} coordinates)"
+
+    def _other(self, other: "Coordinate|CoordinateArray"):
+        """ Latitude and longitude of other in radians, arrays broadcast against self """
+        if isinstance(other, CoordinateArray):
+            return np.radians(other._latitude), np.radians(other._longitude)
+        return np.radians(other.latitude), np.radians(other.longitude)
+
+    def distance(self, other: "Coordinate|CoordinateArray") -> NDArray[np.float64]:
+        """ Haversine distances in km to one Coordinate or element wise to another CoordinateArray """
+        lat1 = np.radians(self._latitude)
+        lon1 = np.radians(self._longitude)
+        lat2, lon2 = self._other(other)
+        return self._haversine(lat1, lon1, lat2, lon2)
+
+    def pairwiseDistance(self, other: "CoordinateArray|None" = None) -> NDArray[np.float64]:
+        """ Matrix of the haversine distances in km from every coordinate to every coordinate of other """
+        if other is None:
+            other = self
+        lat1 = np.radians(self._latitude)[:, None]
+        lon1 = np.radians(self._longitude)[:, None]
+        lat2 = np.radians(other._latitude)[None, :]
+        lon2 = np.radians(other._longitude)[None, :]
+        return self._haversine(lat1, lon1, lat2, lon2)
+
+    def legDistances(self) -> NDArray[np.float64]:
+        """ Distances in km between consecutive coordinates, e.g. the legs of a route """
+        return self[:-1].distance(self[1:])
+
+    @staticmethod
+    def _haversine(lat1, lon1, lat2, lon2) -> NDArray[np.float64]:
+        sin_dlat = np.sin((lat2 - lat1) / 2)
+        sin_dlon = np.sin((lon2 - lon1) / 2)
+        a = sin_dlat * sin_dlat + np.cos(lat1) * np.cos(lat2) * sin_dlon * sin_dlon
+        return EARTH_RADIUS_KM * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+    def initialBearing(self, other: "Coordinate|CoordinateArray") -> NDArray[np.float64]:
+        """ Initial great circle bearings in radians to other, like Coordinate.quj """
+        lat1 = np.radians(self._latitude)
+        lon1 = np.radians(self._longitude)
+        lat2, lon2 = self._other(other)
+        dlon = lon2 - lon1
+        x = np.cos(lat2) * np.sin(dlon)
+        y = np.cos(lat1) * np.sin(lat2) - np.sin(lat1) * np.cos(lat2) * np.cos(dlon)
+        return np.mod(np.arctan2(x, y), 2 * np.pi)
+
+    quj = initialBearing
+
+    def getMagneticDeclination(self) -> NDArray[np.float64]:
+        """ Magnetic declination in degrees at every coordinate """
+        return np.asarray(WorldMagneticModel.shared().declination_at(self._latitude, self._longitude), dtype=np.float64)
+
+    def pbd(self, bearing: Angle|ArrayLike, distance: Distance|ArrayLike, is_magnetic: bool = True) -> "CoordinateArray":
+        return self.getPlaceByBearingDistance(bearing, distance, is_magnetic)
+
+    def getPlaceByBearingDistance(self, bearing: Angle|ArrayLike, distance: Distance|ArrayLike, is_magnetic: bool = True) -> "CoordinateArray":
+        """ Destinations after distance on bearing, bearings in radians and distances in km if not given as Angle and Distance """
+        brng = _radians(bearing)
+        if not is_magnetic:
+            # as Coordinate.getPlaceByBearingDistance
+            brng = brng + np.radians(self.getMagneticDeclination())
+        d = _km(distance) / EARTH_RADIUS_KM
+
+        lat1 = np.radians(self._latitude)
+        lon1 = np.radians(self._longitude)
+
+        lat2 = np.arcsin(np.sin(lat1) * np.cos(d) + np.cos(lat1) * np.sin(d) * np.cos(brng))
+        lon2 = lon1 + np.arctan2(np.sin(brng) * np.sin(d) * np.cos(lat1), np.cos(d) - np.sin(lat1) * np.sin(lat2))
+        return CoordinateArray(np.degrees(lat2), np.degrees(lon2))
+
+    def toVector3(self) -> NDArray[np.float64]:
+        """ (n, 3) array of the unit vectors, like Coordinate.toVector3 """
+        lat = np.radians(self._latitude)
+        lon = np.radians(self._longitude)
+        cos_lat = np.cos(lat)
+        return np.column_stack((cos_lat * np.sin(lon), -np.sin(lat), cos_lat * np.cos(lon)))
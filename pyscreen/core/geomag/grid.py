@@ -0,0 +1,127 @@
+from math import atan2, degrees, hypot
+from numbers import Real
+
+import numpy as np
+
+
+class MagneticGrid(object):
+    """Field components of a WorldMagneticModel precomputed on a regular lat/lon grid
+
+    Lookups interpolate the northerly, easterly and vertical intensity bilinearly
+    and derive declination and inclination from them, so the declination does not
+    jump where it wraps around +-180 degrees. Points outside of the grid are
+    evaluated exactly by the model if exact_fallback is set, otherwise they raise
+    a ValueError.
+
+    """
+
+    def __init__(self, model, lat_range=(-90, 90), lon_range=(-180, 180), resolution=0.25, date=None, altitude=0,
+                 unit='ft', exact_fallback=True):
+        self.model = model
+        self.date = date
+        self.altitude = altitude
+        self.unit = unit
+        self.resolution = resolution
+        self.exact_fallback = exact_fallback
+        self.lat_range = lat_range
+        self.lon_range = lon_range
+
+        self._lat_count = max(int(round((lat_range[1] - lat_range[0]) / resolution)) + 1, 2)
+        self._lon_count = max(int(round((lon_range[1] - lon_range[0]) / resolution)) + 1, 2)
+        self.latitudes = lat_range[0] + np.arange(self._lat_count) * resolution
+        self.longitudes = lon_range[0] + np.arange(self._lon_count) * resolution
+        self._lat_last = self.latitudes[-1].item()
+        self._lon_last = self.longitudes[-1].item()
+
+        self.Bx, self.By, self.Bz = self._evaluate()
+
+    def _evaluate(self):
+        lat, lon = np.meshgrid(self.latitudes, self.longitudes, indexing='ij')
+        field = self.model.fields(lat, lon, self.altitude, self.date, self.unit)
+        return np.stack((field.Bx, field.By, field.Bz))
+
+    @property
+    def nbytes(self):
+        return self.Bx.nbytes + self.By.nbytes + self.Bz.nbytes
+
+    def contains(self, dlat, dlon):
+        dlat = np.asarray(dlat, dtype=float)
+        dlon = self._wrap(np.asarray(dlon, dtype=float))
+        return ((dlat >= self.lat_range[0]) & (dlat <= self.latitudes[-1]) &
+                (dlon >= self.lon_range[0]) & (dlon <= self.longitudes[-1]))
+
+    def _wrap(self, dlon):
+        # move the longitudes into the 360 degrees starting at the grid
+        return np.mod(dlon - self.lon_range[0], 360) + self.lon_range[0]
+
+    def components(self, dlat, dlon):
+        """Returns the interpolated Bx, By and Bz arrays, exact values outside of the grid"""
+        dlat, dlon = np.broadcast_arrays(np.asarray(dlat, dtype=float), np.asarray(dlon, dtype=float))
+        dlat = dlat.ravel()
+        dlon = self._wrap(dlon.ravel())
+
+        inside = self.contains(dlat, dlon)
+        bx = np.empty(dlat.shape)
+        by = np.empty(dlat.shape)
+        bz = np.empty(dlat.shape)
+
+        fi = (dlat[inside] - self.lat_range[0]) / self.resolution
+        fj = (dlon[inside] - self.lon_range[0]) / self.resolution
+        i = np.clip(np.floor(fi).astype(np.intp), 0, self._lat_count - 2)
+        j = np.clip(np.floor(fj).astype(np.intp), 0, self._lon_count - 2)
+        t = fi - i
+        u = fj - j
+        for out, grid in ((bx, self.Bx), (by, self.By), (bz, self.Bz)):
+            out[inside] = ((1 - t) * ((1 - u) * grid[i, j] + u * grid[i, j + 1]) +
+                           t * ((1 - u) * grid[i + 1, j] + u * grid[i + 1, j + 1]))
+
+        outside = np.flatnonzero(~inside)
+        if len(outside):
+            if not self.exact_fallback:
+                raise ValueError('Coordinates outside of the magnetic grid')
+            field = self.model.fields(dlat[outside], dlon[outside], self.altitude, self.date, self.unit)
+            bx[outside], by[outside], bz[outside] = field.Bx, field.By, field.Bz
+        return bx, by, bz
+
+    def _point(self, dlat, dlon):
+        """Bx, By and Bz of a single point, without the overhead of the array path"""
+        lat0, lon0 = self.lat_range[0], self.lon_range[0]
+        dlon = (dlon - lon0) % 360 + lon0
+        if not (lat0 <= dlat <= self._lat_last and lon0 <= dlon <= self._lon_last):
+            if not self.exact_fallback:
+                raise ValueError('Coordinates outside of the magnetic grid')
+            field = self.model.field(dlat, dlon, self.altitude, self.date, self.unit)
+            return field.Bx, field.By, field.Bz
+
+        fi = (dlat - lat0) / self.resolution
+        fj = (dlon - lon0) / self.resolution
+        i = min(int(fi), self._lat_count - 2)
+        j = min(int(fj), self._lon_count - 2)
+        t = fi - i
+        u = fj - j
+        return tuple((1 - t) * ((1 - u) * grid.item(i, j) + u * grid.item(i, j + 1)) +
+                     t * ((1 - u) * grid.item(i + 1, j) + u * grid.item(i + 1, j + 1))
+                     for grid in (self.Bx, self.By, self.Bz))
+
+    def declination(self, dlat, dlon):
+        """Declination in degrees, a number for numbers and an array for arrays"""
+        if isinstance(dlat, Real) and isinstance(dlon, Real):
+            bx, by, _ = self._point(dlat, dlon)
+            return degrees(atan2(by, bx))
+        bx, by, _ = self.components(dlat, dlon)
+        return self._shaped(np.degrees(np.arctan2(by, bx)), dlat, dlon)
+
+    def inclination(self, dlat, dlon):
+        """Inclination in degrees, a number for numbers and an array for arrays"""
+        if isinstance(dlat, Real) and isinstance(dlon, Real):
+            bx, by, bz = self._point(dlat, dlon)
+            return degrees(atan2(bz, hypot(bx, by)))
+        bx, by, bz = self.components(dlat, dlon)
+        return self._shaped(np.degrees(np.arctan2(bz, np.hypot(bx, by))), dlat, dlon)
+
+    @staticmethod
+    def _shaped(values, dlat, dlon):
+        shape = np.broadcast_shapes(np.shape(dlat), np.shape(dlon))
+        if shape == ():
+            return float(values[0])
+        return values.reshape(shape)
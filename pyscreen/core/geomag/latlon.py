@@ -2,6 +2,8 @@ from __future__ import division
 
 from math import radians, degrees, asin, sin, cos, sqrt
 
+import numpy as np
+
 
 def normalise_plus_minus_range(value, norm_range):
     """Normalise a value to within a positive and negative range
@@ -27,6 +29,32 @@ def normalise_plus_minus_range(value, norm_range):
         return value
 
 
+def normalise_plus_minus_range_array(value, norm_range):
+    """normalise_plus_minus_range for arrays"""
+    valid_range = {'lat': 90, 'lon': 180}[norm_range]
+    value = np.asarray(value, dtype=float)
+    if value.size == 0 or np.abs(value).max() <= valid_range:
+        # values in the range are kept as they are
+        return value
+    positive = value > 0
+    value = np.mod(value, np.where(positive, 1, -1) * valid_range * 2)
+    positive = value > 0
+    return np.where(np.abs(value) > valid_range, np.mod(value, np.where(positive, -1, 1) * valid_range), value)
+
+
+def convert_spherical_array(latitude_rad, altitude):
+    """LatLon.convert_spherical for arrays, returns the spherical latitudes and radii"""
+    equator_radius = 6378137
+    flattening = 1 / 298.257223563
+    eccentricity_squared = (flattening * (2 - flattening))
+    sin_latitude = np.sin(latitude_rad)
+    prime_vertical = equator_radius / np.sqrt(1 - eccentricity_squared * sin_latitude**2)
+    p = (prime_vertical + altitude) * np.cos(latitude_rad)
+    z = (prime_vertical * (1 - eccentricity_squared) + altitude) * sin_latitude
+    r = np.sqrt(p**2 + z**2)
+    return np.arcsin(z / r), r
+
+
 class LatLon(object):
     """Implements a latitude Longitude class with conversion to spherical co-ords"""
 
@@ -4,6 +4,8 @@ from math import sin, cos, sqrt, factorial
 import functools
 import operator
 
+import numpy as np
+
 
 def _gen_2d_array(size_x, size_y, default=None):
     return [[default] * size_x for _ in range(size_y)]
@@ -63,7 +65,6 @@ def recursion_constants(max_n):
     return tuplize_array(k)
 
 
-@functools.lru_cache(maxsize=None)
 def associated_polynomials(cos_theta, sin_theta, max_n, max_m, k=None):
     """Specific legendre legrende_polynomials for application in geomagnetic calculation
 
@@ -171,7 +172,124 @@ def _calc_scalar_potential(coeff, cos_theta, sin_n, cos_n, legendre_poly, legend
     return B_r, B_theta, B_phi
 
 
-@functools.lru_cache(maxsize=None)
 def _altitude_ratios(ref_radius, altitude_radius, n):
     a_over_r = ref_radius / altitude_radius
     return tuple(a_over_r**(i + 2) for i in range(n))
+
+
+def gauss_arrays(coeff, max_n):
+    """Splits the coefficient table into g and h arrays indexed [m, n]
+
+    Terms that are not part of the expansion (n = 0 or m > n) are zero.
+    """
+    table = np.array(coeff, dtype=float)[:max_n, :max_n]
+    m = np.arange(max_n)[:, None]
+    n = np.arange(max_n)[None, :]
+    valid = (n >= 1) & (m <= n)
+    g = np.where(valid, table, 0.0)
+    # h of order m is stored at [n][m - 1]
+    h = np.zeros((max_n, max_n))
+    h[1:, :] = table.T[:max_n - 1, :]
+    h = np.where(valid & (m >= 1), h, 0.0)
+    return g, h
+
+
+@functools.lru_cache(maxsize=8)
+def legendre_coefficients(max_n, k=None):
+    """Coefficients of the associated polynomials as polynomials in sin(theta)
+
+    Runs the recursion of associated_polynomials on polynomials instead of values.
+    poly[m][n] is cos^m times the polynomial C[m, n] and its derivative is
+    cos^e times D[m, n], with e = m - 1 and e = 1 for m = 0. The powers of
+    sin(theta) are on the last axis.
+    """
+    if k is None:
+        k = recursion_constants(max_n)
+    degree = max_n + 2
+    C = np.zeros((max_n, max_n, degree))
+    D = np.zeros((max_n, max_n, degree))
+
+    def times_sin(c):
+        return np.concatenate(([0.0], c[:-1]))
+
+    def times_cos_squared(c):
+        return c - times_sin(times_sin(c))
+
+    C[0, 0, 0] = 1
+    for n in range(1, max_n):
+        C[n, n] = C[n - 1, n - 1]
+        D[n, n] = D[n - 1, n - 1] + times_sin(C[n - 1, n - 1])
+        if n == 1:
+            D[n, n] = times_cos_squared(D[0, 0]) + times_sin(C[0, 0])
+        for m in range(n):
+            C[m, n] = times_sin(C[m, n - 1]) - k[m][n] * C[m, n - 2]
+            cos_poly = C[m, n - 1] if m == 0 else times_cos_squared(C[m, n - 1])
+            D[m, n] = times_sin(D[m, n - 1]) - cos_poly - k[m][n] * D[m, n - 2]
+    # the recursion reads [m][n - 2] before it is written, those terms are zero
+    return C, D
+
+
+def associated_polynomials_array(cos_theta, sin_theta, max_n, k=None):
+    """associated_polynomials for arrays of points
+
+    Returns the polynomials and their derivatives as arrays of shape
+    (max_n, max_n) + shape of the input, indexed [m, n].
+    """
+    C, D = legendre_coefficients(max_n, k)
+    cos_theta = np.asarray(cos_theta, dtype=float)
+    sin_theta = np.asarray(sin_theta, dtype=float)
+    shape = cos_theta.shape
+    sin_theta = sin_theta.reshape(1, -1)
+    cos_theta = cos_theta.reshape(1, -1)
+
+    degree = C.shape[-1]
+    sin_powers = np.ones((degree, sin_theta.shape[1]))
+    sin_powers[1:] = sin_theta
+    np.cumprod(sin_powers, axis=0, out=sin_powers)
+    cos_powers = np.ones((max_n, cos_theta.shape[1]))
+    cos_powers[1:] = cos_theta
+    np.cumprod(cos_powers, axis=0, out=cos_powers)
+    cos_exponent = np.maximum(np.arange(max_n) - 1, 0)
+    cos_exponent[0] = 1
+
+    poly = (C.reshape(-1, degree) @ sin_powers).reshape(max_n, max_n, -1)
+    poly *= cos_powers[:, None]
+    derivative = (D.reshape(-1, degree) @ sin_powers).reshape(max_n, max_n, -1)
+    derivative *= cos_powers[cos_exponent][:, None]
+    return poly.reshape((max_n, max_n) + shape), derivative.reshape((max_n, max_n) + shape)
+
+
+def scalar_potential_array(gauss, phi, theta, max_n, radial_alt, ref_radius=6371200, k=None):
+    """scalar_potential for arrays of points
+
+    gauss is the (g, h) pair of gauss_arrays. Returns the B_r, B_theta and B_phi arrays.
+    """
+    g, h = gauss
+    phi = np.asarray(phi, dtype=float)
+    theta = np.asarray(theta, dtype=float)
+    shape = phi.shape
+    phi = phi.reshape(1, -1)
+    theta = theta.reshape(1, -1)
+    cos_theta = np.cos(theta[0])
+    legendre_poly, legendre_poly_derivative = associated_polynomials_array(cos_theta, np.sin(theta[0]), max_n, k)
+
+    orders = np.arange(max_n)[:, None]
+    a_over_r_pow = (ref_radius / np.asarray(radial_alt, dtype=float).reshape(1, -1)) ** (orders + 2)
+    # every [m, n] term is scaled by (a / r)^(n + 2) and by cos(m phi) or sin(m phi)
+    cos_m = np.cos(orders * phi)[:, None]
+    sin_m = np.sin(orders * phi)[:, None]
+    size = max_n * max_n
+    poly = legendre_poly * a_over_r_pow
+    poly_cos = (poly * cos_m).reshape(size, -1)
+    poly_sin = (poly * sin_m).reshape(size, -1)
+    poly = legendre_poly_derivative * a_over_r_pow
+    derivative_cos = (poly * cos_m).reshape(size, -1)
+    derivative_sin = (poly * sin_m).reshape(size, -1)
+
+    degree = (orders.T + 1)
+    B_r = ((degree * g).ravel() @ poly_cos) + ((degree * h).ravel() @ poly_sin)
+    B_theta = -(g.ravel() @ derivative_cos) - (h.ravel() @ derivative_sin)
+    B_phi = -((orders * h).ravel() @ poly_cos) + ((orders * g).ravel() @ poly_sin)
+
+    B_phi = B_phi / np.where(cos_theta == 0, 1.0, cos_theta)
+    return B_r.reshape(shape), B_theta.reshape(shape), B_phi.reshape(shape)
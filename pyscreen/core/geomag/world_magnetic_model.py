@@ -1,11 +1,17 @@
 from __future__ import division
 
-from math import degrees, asin, sin, cos, atan2, sqrt
 import os
 from datetime import date
+from threading import Lock
+from typing import NamedTuple
 
-from .scalar_potential import scalar_potential, schmidt_quasi_normalisation, recursion_constants
-from .latlon import LatLon
+import numpy as np
+
+from .scalar_potential import gauss_arrays, scalar_potential_array, schmidt_quasi_normalisation, recursion_constants
+from .latlon import convert_spherical_array, normalise_plus_minus_range_array
+
+# Points evaluated at once by WorldMagneticModel.fields, bounds the size of the Legendre arrays
+BATCH_SIZE = 512
 
 
 def _gen_square_array(size_x, default=None):
@@ -33,20 +39,22 @@ def _convert_to_km(value, unit):
         raise KeyError('Unknown unit: {unit}')
     return value_in_km
 
+def _today():
+    return date.today()
+
 DEFAULT_PATH = os.path.join(os.path.dirname(__file__), 'model_data/WMM.COF')
 
 
 class MagneticModelData(object):
     """ Class to hold the data and calculations from the file."""
-    _last_calculated_datetime = None
     max_order = degree_of_expansion = 12
     array_size = max_order + 1
-    coeff = {}
-    coefficient = _gen_square_array(array_size, 0.0)
-    coefficient_dot = _gen_square_array(array_size, 0.0)
-    time_adjusted_coefficients_cache = _gen_square_array(array_size, 0.0)
     
     def __init__(self, file):
+        # per instance, the arrays are written while loading
+        self.coefficient = _gen_square_array(self.array_size, 0.0)
+        self.coefficient_dot = _gen_square_array(self.array_size, 0.0)
+        self._time_adjusted = (None, None, None)
         with open(file) as world_magnetic_model_file:
             for line in world_magnetic_model_file:
                 linevals = line.strip().split()
@@ -84,22 +92,44 @@ class MagneticModelData(object):
         """Time adjust the Gauss Coefficients
         
             There is a very basic cache happening here where if the time delta 
-            hasn't changed then the previous calculation is returned
+            hasn't changed then the previous calculation is returned. The cached
+            arrays are replaced, never changed, so other threads can keep using them.
         """
-        current_delta_time = _calculate_decimal_year(time) - self.epoch
-        if self._last_calculated_datetime != current_delta_time:
-            self._update_time_coefficients(current_delta_time)
-            self._last_calculated_datetime = current_delta_time
-        return self.time_adjusted_coefficients_cache
+        return self._time_adjusted_entry(time)[0]
+
+    def time_adjust_gauss_arrays(self, time):
+        """The time adjusted coefficients as the (g, h) arrays of gauss_arrays"""
+        return self._time_adjusted_entry(time)[1]
 
-    def _update_time_coefficients(self, delta_time):
+    def _time_adjusted_entry(self, time):
+        current_delta_time = _calculate_decimal_year(time) - self.epoch
+        last_delta_time, coefficients, arrays = self._time_adjusted
+        if last_delta_time != current_delta_time:
+            coefficients = self._time_adjusted_coefficients(current_delta_time)
+            arrays = gauss_arrays(coefficients, self.array_size)
+            self._time_adjusted = (current_delta_time, coefficients, arrays)
+        return coefficients, arrays
+
+    def _time_adjusted_coefficients(self, delta_time):
+        coefficients = _gen_square_array(self.array_size, 0.0)
         for n in range(1, self.max_order + 1):
             for m in range(0, n + 1):
-                self.time_adjusted_coefficients_cache[m][n] = (self.coefficient[m][n] +
-                                                               delta_time * self.coefficient_dot[m][n])
+                coefficients[m][n] = self.coefficient[m][n] + delta_time * self.coefficient_dot[m][n]
                 if m != 0:
-                    self.time_adjusted_coefficients_cache[n][m - 1] = (self.coefficient[n][m - 1] +
-                                                                       delta_time * self.coefficient_dot[n][m - 1])
+                    coefficients[n][m - 1] = self.coefficient[n][m - 1] + delta_time * self.coefficient_dot[n][m - 1]
+        return coefficients
+
+
+class MagneticField(NamedTuple):
+    """ Result of one evaluation of the model, intensities in nT and angles in degrees """
+    Bx: float
+    By: float
+    Bz: float
+    Bh: float
+    total_intensity: float
+    declination: float
+    inclination: float
+    grid_variation: float
 
 
 class WorldMagneticModel(object):
@@ -111,10 +141,17 @@ class WorldMagneticModel(object):
     >>> wmm = WorldMagneticModel()
     >>> wmm.calc_mag_field(80,0).declination
 
+    Loading the model parses the coefficient file, use WorldMagneticModel.shared()
+    for the instance of the process. field() does not change the model and can be
+    called from any thread, calc_mag_field stores its result on the model.
+
     """
     
     radius_earth = 6371200
 
+    _shared = None
+    _shared_lock = Lock()
+
     _northerly_intensity = None
     _easterly_intensity = None
     _vertical_intensity = None
@@ -141,6 +178,17 @@ class WorldMagneticModel(object):
         """
         self.data = MagneticModelData(world_magnetic_model_filename)
         self.k = recursion_constants(self.data.array_size)
+        self.grid = None
+        self._lock = Lock()
+
+    @classmethod
+    def shared(cls):
+        """The model loaded from the default coefficient file, shared by the whole process"""
+        if cls._shared is None:
+            with cls._shared_lock:
+                if cls._shared is None:
+                    cls._shared = cls()
+        return cls._shared
         
     @property
     def grid_variation(self):
@@ -174,8 +222,84 @@ class WorldMagneticModel(object):
     def Bz(self):
         return self._vertical_intensity
 
-    def calc_mag_field(self, dlat, dlon, altitude=0, date=date.today(), unit='ft'):
-        """calc_mag_field(self, dlat, dlon, altitude=0, date=date.today(), unit='ft')
+    def field(self, dlat, dlon, altitude=0, date=None, unit='ft'):
+        """field(self, dlat, dlon, altitude=0, date=None, unit='ft')
+
+        Evaluates the model for a latitude and longitude in decimal degrees and
+        returns a MagneticField. The parameters are the ones of calc_mag_field.
+
+        """
+        return MagneticField(*(value.item() for value in self.fields(dlat, dlon, altitude, date, unit)))
+
+    def fields(self, dlat, dlon, altitude=0, date=None, unit='ft'):
+        """fields(self, dlat, dlon, altitude=0, date=None, unit='ft')
+
+        Evaluates the model for arrays of latitudes, longitudes and altitudes at once
+        and returns a MagneticField of arrays in the broadcast shape of the input.
+        The points are evaluated in batches of BATCH_SIZE.
+
+        """
+        if date is None:
+            date = _today()
+        dlat, dlon, altitude = np.broadcast_arrays(
+            np.asarray(dlat, dtype=float), np.asarray(dlon, dtype=float), np.asarray(altitude, dtype=float))
+        shape = dlat.shape
+        altitude_in_km = _convert_to_km(altitude.ravel(), unit)
+
+        if np.any((altitude_in_km < -1) | (altitude_in_km > 850)):
+            raise ValueError('World Magnetic Model is not valid outside the rage -1 to 850km')
+
+        gauss = self.data.time_adjust_gauss_arrays(date)
+        latitude = normalise_plus_minus_range_array(dlat.ravel(), 'lat')
+        longitude = normalise_plus_minus_range_array(dlon.ravel(), 'lon')
+
+        values = np.empty((8, latitude.size))
+        for start in range(0, latitude.size, BATCH_SIZE):
+            batch = slice(start, start + BATCH_SIZE)
+            values[:, batch] = self._evaluate(gauss, latitude[batch], longitude[batch], altitude_in_km[batch])
+        return MagneticField(*(row.reshape(shape) for row in values))
+
+    def _evaluate(self, gauss, latitude, longitude, altitude_in_km):
+        latitude_rad = np.radians(latitude)
+        spherical_latitude, radial = convert_spherical_array(latitude_rad, altitude_in_km * 1000)
+
+        b_radius, b_theta, b_phi = scalar_potential_array(gauss,
+                                                          np.radians(longitude),
+                                                          spherical_latitude,
+                                                          self.data.array_size,
+                                                          radial,
+                                                          k=self.k)
+        # Matching the method in the document
+        b_radius = -b_radius
+        b_theta = -b_theta
+        # /*
+        # ROTATE MAGNETIC VECTOR COMPONENTS FROM SPHERICAL TO
+        # GEODETIC COORDINATES
+        # */
+        delta_latitude_radians = spherical_latitude - latitude_rad
+        sin_delta_latitude = np.sin(delta_latitude_radians)
+        cos_delta_latitude = np.cos(delta_latitude_radians)
+
+        northerly_intensity = b_theta * cos_delta_latitude - b_radius * sin_delta_latitude
+        easterly_intensity = b_phi
+        vertical_intensity = b_theta * sin_delta_latitude + b_radius * cos_delta_latitude
+        horizontal_intensity = np.hypot(northerly_intensity, easterly_intensity)
+        declination = np.degrees(np.arctan2(easterly_intensity, northerly_intensity))
+
+        # grid variation, the declination relative to grid north near the poles
+        grid_variation = declination - np.where(latitude > 55, longitude, 0) + np.where(latitude < -55, longitude, 0)
+        return (
+            northerly_intensity,
+            easterly_intensity,
+            vertical_intensity,
+            horizontal_intensity,
+            np.hypot(horizontal_intensity, vertical_intensity),
+            declination,
+            np.degrees(np.arctan2(vertical_intensity, horizontal_intensity)),
+            np.mod(grid_variation, 360))
+
+    def calc_mag_field(self, dlat, dlon, altitude=0, date=None, unit='ft'):
+        """calc_mag_field(self, dlat, dlon, altitude=0, date=None, unit='ft')
 
         Calculates the magnetic field for a given latitude and longitude in decimal degrees.
 
@@ -193,58 +317,50 @@ class WorldMagneticModel(object):
                Unit for altitude
 
         """
-        altitude_in_km = _convert_to_km(altitude, unit)
-
-        if not -1 <= altitude_in_km <= 850:
-            raise ValueError('World Magnetic Model is not valid outside the rage -1 to 850km')
-
-        lat_lon = LatLon(dlat, dlon)
-        spherical_latitude, _, radial = lat_lon.convert_spherical(altitude_in_km * 1000)
-
-        b_radius, b_theta, b_phi = scalar_potential(self.data.time_adjust_gauss(date),
-                                                    lat_lon.lon_rad,
-                                                    spherical_latitude,
-                                                    self.data.array_size, 
-                                                    self.data.array_size,
-                                                    radial, 
-                                                    k=self.k)
-        # Matching the method in the document
-        b_radius = -b_radius
-        b_theta = -b_theta
-        # /*
-        # ROTATE MAGNETIC VECTOR COMPONENTS FROM SPHERICAL TO
-        # GEODETIC COORDINATES
-        # */
-        delta_latitude_radians = spherical_latitude - lat_lon.lat_rad
-        sin_delta_latitude = sin(delta_latitude_radians)
-        cos_delta_latitude = cos(delta_latitude_radians)
-
-        self._northerly_intensity = b_theta * cos_delta_latitude - b_radius * sin_delta_latitude
-        self._easterly_intensity = b_phi
-        self._vertical_intensity = b_theta * sin_delta_latitude + b_radius * cos_delta_latitude
-        self._horizontal_intensity = sqrt(self._northerly_intensity ** 2 + self._easterly_intensity**2)
-        self._total_intensity = sqrt(self._horizontal_intensity**2 + self._vertical_intensity**2)
-        self._declination = degrees(atan2(self._easterly_intensity, self._northerly_intensity))
-        self._inclination = degrees(atan2(self._vertical_intensity, self._horizontal_intensity))
-        self._grid_variation = self._calculate_grid_variation(lat_lon)
+        field = self.field(dlat, dlon, altitude, date, unit)
+        with self._lock:
+            self._northerly_intensity = field.Bx
+            self._easterly_intensity = field.By
+            self._vertical_intensity = field.Bz
+            self._horizontal_intensity = field.Bh
+            self._total_intensity = field.total_intensity
+            self._declination = field.declination
+            self._inclination = field.inclination
+            self._grid_variation = field.grid_variation
         return self
 
-    def _calculate_grid_variation(self, lat_lon):
-        """Calculate the magnetic grid variation
+    def use_grid(self, lat_range=(-90, 90), lon_range=(-180, 180), resolution=0.25, date=None, altitude=0, unit='ft',
+                 exact_fallback=True):
+        """Precomputes the field over an area, declination_at and inclination_at interpolate it
 
-        Compute magnetic grid variation if the current
-        geodetic position is in the arctic or antarctic
-        (i.e. glat > +55 degrees or glat < -55 degrees)
-        Otherwise, set magnetic grid variation to 0
+        Points outside of the area are evaluated exactly if exact_fallback is set.
+        Returns the MagneticGrid, use_grid(None) goes back to exact evaluation.
         """
-        cur_lat = lat_lon.lat
-        grid_variation = self._declination
-        if cur_lat > 55:
-            grid_variation -= lat_lon.lon
-        elif cur_lat < -55:
-            grid_variation += lat_lon.lon
-        grid_variation %= 360
-        return grid_variation
+        from .grid import MagneticGrid
+        if lat_range is None:
+            self.grid = None
+            return None
+        self.grid = MagneticGrid(self, lat_range, lon_range, resolution, date, altitude, unit, exact_fallback)
+        return self.grid
+
+    def declination_at(self, dlat, dlon):
+        """Declination in degrees, from the grid if one is in use, for numbers or arrays"""
+        grid = self.grid
+        if grid is not None:
+            return grid.declination(dlat, dlon)
+        return self._exact(dlat, dlon, 'declination')
+
+    def inclination_at(self, dlat, dlon):
+        """Inclination in degrees, from the grid if one is in use, for numbers or arrays"""
+        grid = self.grid
+        if grid is not None:
+            return grid.inclination(dlat, dlon)
+        return self._exact(dlat, dlon, 'inclination')
+
+    def _exact(self, dlat, dlon, name):
+        if isinstance(dlat, (int, float)) and isinstance(dlon, (int, float)):
+            return getattr(self.field(dlat, dlon), name)
+        return getattr(self.fields(dlat, dlon), name)
 
     def mag_heading(self, hdg):
         """Calculates the magnetic heading from a true heading.
@@ -0,0 +1,163 @@
+from itertools import count
+from math import cos, radians, sin
+from typing import NamedTuple
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+from .scale import Scale
+
+# Generations are unique across all maps, a cached position only needs to compare them
+_generations = count(1)
+
+
+def _center(center) -> tuple[float,float]:
+    if isinstance(center, tuple):
+        return float(center[0]), float(center[1])
+    return float(center.latitude), float(center.longitude)
+
+
+class ProjectionContext(NamedTuple):
+    """ Immutable snapshot of the view of a map: center, scale and size
+
+        Map.projection hands out a new context with a new generation whenever the view
+        changed, so positions computed for a context stay valid as long as the
+        generation they were computed for is the current one.
+    """
+    latitude: float
+    longitude: float
+    scale: float
+    width: int
+    height: int
+    generation: int
+
+    @classmethod
+    def create(cls, center, scale: Scale|float, size: tuple[int,int]) -> "ProjectionContext":
+        """ Snapshot of a view with a new generation, center is a Coordinate or a (latitude, longitude) tuple """
+        return cls(*_center(center), float(scale), int(size[0]), int(size[1]), next(_generations))
+
+    @property
+    def view(self) -> tuple[float,float,float,int,int]:
+        """ The snapshot without the generation, equal for equal views """
+        return self[:5]
+
+    @property
+    def center(self) -> tuple[float,float]:
+        return self.latitude, self.longitude
+
+    @property
+    def size(self) -> tuple[int,int]:
+        return self.width, self.height
+
+    def toVector2(self, latitude: float, longitude: float) -> tuple[float,float,bool]:
+        """ Screen position of one coordinate and whether it is on the visible side of the globe """
+        dlat = radians(latitude - self.latitude)
+        dlon = radians(longitude - self.longitude)
+        cos_lat = cos(dlat)
+        return (cos_lat * sin(dlon) * self.scale + self.width // 2,
+                -sin(dlat) * self.scale + self.height // 2,
+                cos_lat * cos(dlon) >= 0)
+
+    def project(self, latitude: ArrayLike, longitude: ArrayLike):
+        return project(latitude, longitude, self.center, self.scale, self.size)
+
+    def unproject(self, x: ArrayLike, y: ArrayLike):
+        return unproject(x, y, self.center, self.scale, self.size)
+
+
+class ProjectedPoints:
+    """ Screen positions of a fixed set of coordinates, cached against a projection generation
+
+        An entity keeps one of these for its points. positions() only projects them again,
+        all at once, when it is called with a context of another generation.
+    """
+
+    def __init__(self, latitude: ArrayLike = (), longitude: ArrayLike = ()):
+        self.latitude = np.array(latitude, dtype=np.float64, ndmin=1)
+        self.longitude = np.array(longitude, dtype=np.float64, ndmin=1)
+        self._projected: tuple|None = None
+
+    @classmethod
+    def fromCoordinates(cls, coordinates):
+        latitude, longitude = [], []
+        for coordinate in coordinates:
+            latitude.append(coordinate.latitude)
+            longitude.append(coordinate.longitude)
+        return cls(latitude, longitude)
+
+    def __len__(self):
+        return len(self.latitude)
+
+    @property
+    def generation(self) -> int|None:
+        """ Generation of the cached positions, None if there are none """
+        projected = self._projected
+        return None if projected is None else projected[0]
+
+    def positions(self, context: ProjectionContext) -> tuple[NDArray[np.float64], NDArray[np.float64], NDArray[np.bool_]]:
+        """ x, y and visible arrays as returned by project, the arrays are shared and must not be modified """
+        projected = self._projected
+        if projected is None or projected[0] != context.generation:
+            # one tuple, so a concurrent reader never pairs positions with the wrong generation
+            projected = self._projected = (context.generation, *context.project(self.latitude, self.longitude))
+        return projected[1:]
+
+    def invalidate(self):
+        """ Call after changing latitude or longitude in place """
+        self._projected = None
+
+
+def project(latitude: ArrayLike, longitude: ArrayLike, center, scale: Scale|float, size: tuple[int,int]
+            ) -> tuple[NDArray[np.float64], NDArray[np.float64], NDArray[np.bool_]]:
+    """ Screen positions of many coordinates at once
+
+        The vectorized Coordinate.toVector2IfVisible: returns the x and y arrays and a
+        mask of the points on the visible side of the globe. x and y are also filled in
+        for the hidden points, as toVector2 would return them. center is a Coordinate or
+        a (latitude, longitude) tuple, size the (width, height) of the map.
+    """
+    center_lat, center_lon = _center(center)
+    scale = float(scale)
+    width, height = size
+
+    dlat = np.radians(np.asarray(latitude, dtype=np.float64) - center_lat)
+    dlon = np.radians(np.asarray(longitude, dtype=np.float64) - center_lon)
+
+    cos_lat = np.cos(dlat)
+    visible = cos_lat * np.cos(dlon) >= 0
+
+    x = np.sin(dlon)
+    x *= cos_lat
+    x *= scale
+    x += width // 2
+
+    y = np.sin(dlat, out=dlat)
+    y *= -scale
+    y += height // 2
+    return x, y, visible
+
+
+def unproject(x: ArrayLike, y: ArrayLike, center, scale: Scale|float, size: tuple[int,int]
+              ) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+    """ Coordinates of many screen positions at once, the vectorized Coordinate.fromVector2
+
+        Positions outside of the globe are moved onto its edge. The longitudes are not
+        wrapped into [-180, 180].
+    """
+    center_lat, center_lon = _center(center)
+    scale = float(scale)
+    width, height = size
+
+    px = (np.asarray(x, dtype=np.float64) - width // 2) / scale
+    py = (np.asarray(y, dtype=np.float64) - height // 2) / scale
+
+    length = np.hypot(px, py)
+    outside = length > 1
+    if outside.any():
+        px[outside] /= length[outside]
+        py[outside] /= length[outside]
+    pz = np.sqrt(np.maximum(1 - px**2 - py**2, 0))
+
+    latitude = np.degrees(np.arcsin(-py)) + center_lat
+    longitude = np.degrees(np.arctan2(px, pz)) + center_lon
+    return latitude, longitude
@@ -1,6 +1,6 @@
-from functools import lru_cache
 from libc.math cimport sqrt, atan2, sin, cos, tan
 from pyscreen.core.angle import Angle, PI
+from pyscreen.core.cache import cached
 from typing import SupportsFloat, SupportsInt, overload
 
 cdef class Vector2:
@@ -50,7 +50,7 @@ cdef class Vector2:
         """Rotate 90 degrees right"""
         return Vector2(self.y, -self.x)
 
-    @lru_cache(maxsize=1_000_000)
+    @cached(enabled=False)
     def angleBetween(self, other):
         """Get the angle between two vectors counterclockwise"""
         dp = self.dotProduct(other)
@@ -78,33 +78,27 @@ cdef class Vector2:
     def __ne__(self, other):
         return self.x != other[0] or self.y != other[1]
 
-    @lru_cache(maxsize=1_000_000)
     def __add__(self, other):
         return Vector2(self.x + other[0], self.y + other[1])
 
     __radd__ = __add__
 
-    @lru_cache(maxsize=1_000_000)
     def __sub__(self, other):
         return Vector2(self.x - other[0], self.y - other[1])
 
-    @lru_cache(maxsize=1_000_000)
     def __rsub__(self, other):
         return Vector2(other[0] - self.x, other[1] - self.y)
 
-    @lru_cache(maxsize=1_000_000)
     def __truediv__(self, other):
         if isinstance(other, (int,float,SupportsFloat,SupportsInt)):
             return Vector2(self.x / other, self.y / other)
         return Vector2(self.x / other[0], self.y / other[1])
 
-    @lru_cache(maxsize=1_000_000)
     def __rtruediv__(self, other):
         if isinstance(other, (int,float,SupportsFloat,SupportsInt)):
             return Vector2(other / self.x, other / self.y)
         return Vector2(other[0] / self.x, other[1] / self.y)
 
-    @lru_cache(maxsize=1_000_000)
     def __mul__(self, other):
         if isinstance(other, (int,float,SupportsFloat,SupportsInt)):
             return Vector2(self.x * other, self.y * other)
@@ -115,18 +109,18 @@ cdef class Vector2:
     def __len__(self):
         return int(self.length())
 
-    @lru_cache(maxsize=1_000_000)
+    @cached(enabled=False)
     def length(self):
         return sqrt(self.x**2 + self.y**2)
 
     def __hash__(self) -> int:
         return self.__hash
 
-    @lru_cache(maxsize=1_000_000)
+    @cached(enabled=False)
     def dotProduct(self, other):
         return self.x * other[0] + self.y * other[1]
 
-    @lru_cache(maxsize=1_000_000)
+    @cached(enabled=False)
     def crossProduct(self, other):
         return self.x * other[1] - self.y * other[0]
 
@@ -202,27 +196,22 @@ cdef class Vector3:
     def __ne__(self, other):
         return self.x != other[0] or self.y != other[1] or self.z != other[2]
 
-    @lru_cache(maxsize=1_000_000)
     def __add__(self, other):
         return Vector3(self.x + other[0], self.y + other[1], self.z + other[2])
 
     __radd__ = __add__
 
-    @lru_cache(maxsize=1_000_000)
     def __sub__(self, other):
         return Vector3(self.x - other[0], self.y - other[1], self.z - other[2])
 
-    @lru_cache(maxsize=1_000_000)
     def __rsub__(self, other):
         return Vector3(other[0] - self.x, other[1] - self.y, other[2] - self.z)
 
-    @lru_cache(maxsize=1_000_000)
     def __mul__(self, other):
         return Vector3(self.x * other, self.y * other, self.z * other)
 
     __rmul__ = __mul__
 
-    @lru_cache(maxsize=1_000_000)
     def __truediv__(self, other):
         return Vector3(self.x / other, self.y / other, self.z / other)
 
@@ -232,7 +221,7 @@ cdef class Vector3:
     def __len__(self):
         return int(self.length())
 
-    @lru_cache(maxsize=1_000_000)
+    @cached(enabled=False)
     def length(self):
         return sqrt(self.x**2 + sqrt(self.y**2 + self.z**2))
 
@@ -242,19 +231,19 @@ cdef class Vector3:
     def __str__(self) -> str:
         return f"Vector3({self.x},{self.y},{self.z})"
 
-    @lru_cache(maxsize=1_000_000)
+    @cached(enabled=False)
     def dotProduct(self, other) -> float:
         return self.x * other[0] + self.y * other[1] + self.z * other[2]
 
-    @lru_cache(maxsize=1_000_000)
+    @cached(enabled=False)
     def crossProduct(self, other):
         return Vector3(self.y * other[2] - self.z * other[1], self.z * other[0] - self.x * other[2], self.x * other[1] - self.y * other[0])
     
-    @lru_cache(maxsize=1_000_000)
+    @cached(enabled=False)
     def magnitude(self):
         return sqrt(self.x ** 2 + self.y ** 2 + self.z ** 2)
 
-    @lru_cache(maxsize=1_000_000)
+    @cached(enabled=False)
     def normalize(self):
         mag = self.magnitude()
         return Vector3(self.x / mag, self.y / mag, self.z / mag)
@@ -334,7 +323,7 @@ cdef class IntVector2:
         """Rotate 90 degrees right"""
         return Vector2(self.y, -self.x)
 
-    @lru_cache(maxsize=1_000_000)
+    @cached(enabled=False)
     def angleBetween(self, other):
         """Get the angle between two vectors counterclockwise"""
         dp = self.dotProduct(other)
@@ -362,33 +351,27 @@ cdef class IntVector2:
     def __ne__(self, other):
         return self.x != other[0] or self.y != other[1]
 
-    @lru_cache(maxsize=1_000_000)
     def __add__(self, other):
         return Vector2(self.x + other[0], self.y + other[1])
 
     __radd__ = __add__
 
-    @lru_cache(maxsize=1_000_000)
     def __sub__(self, other):
         return Vector2(self.x - other[0], self.y - other[1])
 
-    @lru_cache(maxsize=1_000_000)
     def __rsub__(self, other):
         return Vector2(other[0] - self.x, other[1] - self.y)
 
-    @lru_cache(maxsize=1_000_000)
     def __truediv__(self, other):
         if isinstance(other, (int,float,SupportsFloat,SupportsInt)):
             return Vector2(self.x / other, self.y / other)
         return Vector2(self.x / other[0], self.y / other[1])
 
-    @lru_cache(maxsize=1_000_000)
     def __rtruediv__(self, other):
         if isinstance(other, (int,float,SupportsFloat,SupportsInt)):
             return Vector2(other / self.x, other / self.y)
         return Vector2(other[0] / self.x, other[1] / self.y)
 
-    @lru_cache(maxsize=1_000_000)
     def __mul__(self, other):
         if isinstance(other, (int,float,SupportsFloat,SupportsInt)):
             return Vector2(self.x * other, self.y * other)
@@ -399,18 +382,18 @@ cdef class IntVector2:
     def __len__(self):
         return int(self.length())
 
-    @lru_cache(maxsize=1_000_000)
+    @cached(enabled=False)
     def length(self):
         return sqrt(self.x**2 + self.y**2)
 
     def __hash__(self) -> int:
         return self.__hash
 
-    @lru_cache(maxsize=1_000_000)
+    @cached(enabled=False)
     def dotProduct(self, other):
         return self.x * other[0] + self.y * other[1]
 
-    @lru_cache(maxsize=1_000_000)
+    @cached(enabled=False)
     def crossProduct(self, other):
         return self.x * other[1] - self.y * other[0]
 
@@ -487,27 +470,22 @@ cdef class IntVector3:
     def __ne__(self, other):
         return self.x != other[0] or self.y != other[1] or self.z != other[2]
 
-    @lru_cache(maxsize=1_000_000)
     def __add__(self, other):
         return Vector3(self.x + other[0], self.y + other[1], self.z + other[2])
 
     __radd__ = __add__
 
-    @lru_cache(maxsize=1_000_000)
     def __sub__(self, other):
         return Vector3(self.x - other[0], self.y - other[1], self.z - other[2])
 
-    @lru_cache(maxsize=1_000_000)
     def __rsub__(self, other):
         return Vector3(other[0] - self.x, other[1] - self.y, other[2] - self.z)
 
-    @lru_cache(maxsize=1_000_000)
     def __mul__(self, other):
         return Vector3(self.x * other, self.y * other, self.z * other)
 
     __rmul__ = __mul__
 
-    @lru_cache(maxsize=1_000_000)
     def __truediv__(self, other):
         return Vector3(self.x / other, self.y / other, self.z / other)
 
@@ -517,7 +495,7 @@ cdef class IntVector3:
     def __len__(self):
         return int(self.length())
 
-    @lru_cache(maxsize=1_000_000)
+    @cached(enabled=False)
     def length(self):
         return sqrt(self.x**2 + sqrt(self.y**2 + self.z**2))
 
@@ -527,19 +505,19 @@ cdef class IntVector3:
     def __str__(self) -> str:
         return f"Vector3({self.x},{self.y},{self.z})"
 
-    @lru_cache(maxsize=1_000_000)
+    @cached(enabled=False)
     def dotProduct(self, other) -> float:
         return self.x * other[0] + self.y * other[1] + self.z * other[2]
 
-    @lru_cache(maxsize=1_000_000)
+    @cached(enabled=False)
     def crossProduct(self, other):
         return Vector3(self.y * other[2] - self.z * other[1], self.z * other[0] - self.x * other[2], self.x * other[1] - self.y * other[0])
     
-    @lru_cache(maxsize=1_000_000)
+    @cached(enabled=False)
     def magnitude(self):
         return sqrt(self.x ** 2 + self.y ** 2 + self.z ** 2)
 
-    @lru_cache(maxsize=1_000_000)
+    @cached(enabled=False)
     def normalize(self):
         mag = self.magnitude()
         return Vector3(self.x / mag, self.y / mag, self.z / mag)
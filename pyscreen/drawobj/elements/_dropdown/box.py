@@ -7,6 +7,7 @@ from pyscreen.eventHandler import EventHandler
 from pyscreen.hitbox import Hitbox
 from pyscreen.drawobj.elements._util.padding import get_innerheight, get_innerwidth, get_outerheight, get_outerwidth, get_padding
 
+from pyscreen.drawobj.util.textcache import text_cache
 from ..base import ElementWithHitbox
 
 
@@ -127,7 +128,7 @@ class DropDownBox(ElementWithHitbox):
 
         # Text
 
-        text_surface = self.font.render(show_value, True, self.color, self.background)
+        text_surface = text_cache.render(self.font, show_value, True, self.color, self.background)
         frame_surface = Surface(
             (self.width, self.height), SRCALPHA, 32
         )
@@ -189,6 +190,5 @@ class DropDownBox(ElementWithHitbox):
         if self.hitbox is None or self.hitbox.hasFocus:
             show_value += " "
 
-        text_surface = self.font.render(show_value, False, (0,0,0))
-        x,y = text_surface.get_size()
+        x,y = text_cache.size(self.font, show_value)
         return x
\ No newline at end of file
@@ -6,6 +6,7 @@ from pyscreen.core.vector import Vector2
 from pyscreen.drawobj.elements._util.padding import get_padding
 from pyscreen.hitbox import Hitbox
 from pyscreen.eventHandler import EventHandler
+from pyscreen.drawobj.util.textcache import text_cache
 from ..button import Button, ElementWithHitbox
 
 class DropDownOption(Button):
@@ -39,7 +40,7 @@ class DropDownOption(Button):
     def render(self, surface):
         show_value = self.value
 
-        text_surface = self.font.render(show_value, True, self.color, self.background)
+        text_surface = text_cache.render(self.font, show_value, True, self.color, self.background)
         frame_surface = Surface(
             (self.width, self.height), SRCALPHA, 32
         )
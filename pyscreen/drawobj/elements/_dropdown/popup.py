@@ -1,17 +1,23 @@
 import numpy as np
-from pygame import Surface, SRCALPHA
+from pygame import Rect, Surface, SRCALPHA
 from pyscreen.core.vector import Vector2
 from pyscreen.hitbox import Hitbox
 from pyscreen.eventHandler import EventHandler
 from pyscreen.screen import Screen
 from pygame.font import Font
 
+from pyscreen.drawobj.util.textcache import text_cache
+from .._scrollbar.base import SCROLL_STEPS
 from ..base import Element
 from .option import DropDownOption
 
 from pyscreen.logging import getLogger
 logger = getLogger()
 
+# Rows kept ready above and below the visible ones
+OVERSCAN = 2
+OPTION_PADDING = (2,8,2,8)
+
 class DropDownPopup(Element):
     # Uses custom hitbox logic => no ElementWithHitbox
     def __init__(self, screen: Screen, eventHandler: EventHandler, font: Font, options: list|dict|None, background, color, border_color, selected_index = None):
@@ -34,6 +40,10 @@ class DropDownPopup(Element):
 
         self.max_width_cache = None
 
+        self._entries_cache: list[tuple]|None = None
+        self._on_select = None
+
+        # row widgets, recycled for the rows in view while scrolling
         self.buttons: list[DropDownOption] = []
         self.listener = []
 
@@ -74,6 +84,8 @@ class DropDownPopup(Element):
     @options.setter
     def options(self, value):
         self.max_width_cache = None
+        self._entries_cache = None
+        self.scroll_height = 0
         self._options = value
 
         # Check if selected index is still valid
@@ -86,23 +98,54 @@ class DropDownPopup(Element):
 
     @property
     def onSelect(self):
-        pass
+        return self._on_select
 
     @onSelect.setter
     def onSelect(self, value):
+        self._on_select = value
         for button in self.buttons:
             button.addEventListener("mouseClick", value, override=True)
 
+    def _entries(self) -> list[tuple]:
+        """ (key, value) of every option """
+        if self._entries_cache is None:
+            if isinstance(self.options, dict):
+                self._entries_cache = list(self.options.items())
+            elif isinstance(self.options, set):
+                self._entries_cache = [(option, option) for option in self.options]
+            else:
+                self._entries_cache = list(enumerate(self.options))
+        return self._entries_cache
+
     def max_width(self):
         if self.max_width_cache is None:
             if not self.options:
                 self.max_width_cache = 0
-            elif isinstance(self.options, dict):
-                self.max_width_cache = max(DropDownOption(key,option,self.eventHandler,self.font).width for key, option in self.options.items()) + 30
             else:
-                self.max_width_cache = max(DropDownOption(0,option,self.eventHandler,self.font).width for option in self.options) + 30
+                padding = OPTION_PADDING[1] + OPTION_PADDING[3]
+                self.max_width_cache = max(text_cache.size(self.font, str(value))[0] for _, value in self._entries()) + padding + 30
         return self.max_width_cache
 
+    @property
+    def row_height(self) -> int:
+        """ Distance between two rows, their borders overlap by one pixel """
+        return self.font.get_height() + OPTION_PADDING[0] + OPTION_PADDING[2] - 1
+
+    @property
+    def content_height(self) -> int:
+        return len(self._entries()) * self.row_height + 1
+
+    @property
+    def view_height(self) -> int:
+        if self.location is None:
+            return 0
+        return max(min(self.content_height, self.screen.get_size()[1] - int(self.location[1])), 0)
+
+    def get_rect(self) -> Rect:
+        if not self._visible or self.location is None:
+            return Rect(0, 0, 0, 0)
+        return Rect(tuple(self.location.asInts()), (self.width, self.view_height))
+
     def open(self, location: Vector2, width: int):
         self.location = location
         self.width = width
@@ -133,29 +176,42 @@ class DropDownPopup(Element):
         self.surface = Surface(tuple(self.location.asInts()),SRCALPHA,32)
         if self.hitbox is None:
             self.hitbox = Hitbox(self.eventHandler, self.location, space)
-            # Scroll events
+            self.hitbox.addEventListener("scrollUp", self.scroll_up)
+            self.hitbox.addEventListener("scrollDown", self.scroll_down)
         else:
             self.hitbox.hitbox_location = self.location
             self.hitbox.hitbox_size = space
 
-        if isinstance(self.options, dict):
-            for key, option in self.options.items():
-                option = DropDownOption(key,option,self.eventHandler,self.font,
-                    background=self.background, color=self.color,
-                    border_color=self.border_color, width=self.width)
-                self.buttons.append(option)
-        elif isinstance(self.options, set):
-            for option in self.options:
-                option = DropDownOption(option,option,self.eventHandler,self.font,
-                    background=self.background, color=self.color,
-                    border_color=self.border_color, width=self.width)
-                self.buttons.append(option)
-        else:
-            for key, option in enumerate(self.options):
-                option = DropDownOption(key,option,self.eventHandler,self.font,
-                    background=self.background, color=self.color,
-                    border_color=self.border_color, width=self.width)
-                self.buttons.append(option)
+        self.scroll_height = max(0, min(self.scroll_height, self.content_height - self.view_height))
+
+        # only the rows that fit on screen get a widget
+        rows = min(len(self._entries()), -(-self.view_height // self.row_height) + 1 + 2 * OVERSCAN)
+        while len(self.buttons) < rows:
+            self.buttons.append(self._create_button())
+        while len(self.buttons) > rows:
+            self.buttons.pop().destruct()
+
+    def _create_button(self) -> DropDownOption:
+        button = DropDownOption(None, "", self.eventHandler, self.font,
+            background=self.background, color=self.color,
+            border_color=self.border_color, width=self.width, padding=OPTION_PADDING)
+        if self._on_select is not None:
+            button.addEventListener("mouseClick", self._on_select, override=True)
+        return button
+
+    def scroll_up(self, e):
+        self.scroll_height = max(self.scroll_height - SCROLL_STEPS * getattr(e, "steps", 1), 0)
+
+    def scroll_down(self, e):
+        max_scroll = max(self.content_height - self.view_height, 0)
+        self.scroll_height = min(self.scroll_height + SCROLL_STEPS * getattr(e, "steps", 1), max_scroll)
+
+    def visible_rows(self) -> range:
+        """ Indices of the options inside the popup """
+        pitch = self.row_height
+        first = self.scroll_height // pitch
+        last = -(-(self.scroll_height + self.view_height) // pitch)
+        return range(first, min(last, len(self._entries())))
 
         
     def render(self, surface):
@@ -170,15 +226,28 @@ class DropDownPopup(Element):
                 self.close()
                 return                
 
-            position = self.location + self.offset
-            h = 0
-
-            for button in self.buttons:
-                button.location = self.location + (0,h)
-                h += button.height - 1
+            entries = self._entries()
+            pitch = self.row_height
+            visible = self.visible_rows()
+            first = max(visible.start - OVERSCAN, 0)
+
+            clip = surface.get_clip()
+            surface.set_clip(self.get_rect().clip(clip))
+
+            # rows are assigned round robin by index, so a row keeps its widget while it stays in range
+            for i, button in enumerate(self.buttons):
+                n = len(self.buttons)
+                index = first + (i - first) % n
+                if index >= len(entries):
+                    button.hitbox.enabled = False
+                    continue
+                key, value = entries[index]
+                if button.key != key or button.value != value:
+                    button.key, button.value = key, value
+                button.location = self.location + (0, index * pitch - self.scroll_height)
                 button.width = self.width
-                button.render(surface)
-            
-            
+                button.hitbox.enabled = index in visible
+                if button.hitbox.enabled:
+                    button.render(surface)
 
-            
\ No newline at end of file
+            surface.set_clip(clip)
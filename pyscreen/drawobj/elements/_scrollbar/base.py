@@ -38,22 +38,24 @@ class ScrollProxyBase(Element):
 
 
     def scroll_up(self, e):
+        distance = SCROLL_STEPS * getattr(e, "steps", 1)
         if self.eventHandler.shift_active:
-            self.scroll_offset.x = self.scroll_offset.x - SCROLL_STEPS
+            self.scroll_offset.x = self.scroll_offset.x - distance
             if self.scroll_offset.x < 0:
                 self.scroll_offset.x = 0
         else:
-            self.scroll_offset.y = self.scroll_offset.y - SCROLL_STEPS
+            self.scroll_offset.y = self.scroll_offset.y - distance
             if self.scroll_offset.y < 0:
                 self.scroll_offset.y = 0
 
     def scroll_down(self, e):
+        distance = SCROLL_STEPS * getattr(e, "steps", 1)
         if self.eventHandler.shift_active:
-            self.scroll_offset.x = self.scroll_offset.x + SCROLL_STEPS
+            self.scroll_offset.x = self.scroll_offset.x + distance
             if self.scroll_offset.x > self.scroll_maxoffset.x:
                 self.scroll_offset.x = self.scroll_maxoffset.x
         else:
-            self.scroll_offset.y = self.scroll_offset.y + SCROLL_STEPS
+            self.scroll_offset.y = self.scroll_offset.y + distance
             if self.scroll_offset.y > self.scroll_maxoffset.y:
                 self.scroll_offset.y = self.scroll_maxoffset.y
 
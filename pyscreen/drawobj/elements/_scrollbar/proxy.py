@@ -1,9 +1,12 @@
+from typing import Callable
+
 from .base import ScrollProxyBase
-from pygame import Surface
+from pygame import Rect, Surface
 from pyscreen.hitbox import Hitbox
 from pyscreen.eventHandler import EventHandler
 from pyscreen.core.vector import Vector2
 import pyscreen.drawobj.draw as draw
+from pyscreen.drawobj.util.surfacepool import surface_pool
 
 SCROLLFLOATER_MINSIZE = 10
 
@@ -17,10 +20,39 @@ class ScrollProxy(ScrollProxyBase):
         self.secondary_color = secondary_color
         self.floater_color = floater_color
         self.floater_dragging_color = floater_dragging_color = floater_color if floater_dragging_color is None else floater_dragging_color
+        self._proxy_surface: Surface|None = None
+
+        # retained viewport of render_view(retain=True)
+        self._view_surface: Surface|None = None
+        self._view_offset: tuple[int,int]|None = None
+        self._damage: list[Rect]|None = []
+        self.painted_area = 0
+
+    def invalidate(self, rect=None):
+        """ Marks a rect of the content, or all of it, for repainting by the retained viewport """
+        if rect is None:
+            self._damage = None
+        elif self._damage is not None:
+            self._damage.append(Rect(rect))
+
+    def destruct(self):
+        surface_pool.release(self._view_surface)
+        surface_pool.release(self._proxy_surface)
+        self._view_surface = None
+        self._proxy_surface = None
+        super().destruct()
 
 
     def render(self, surface: Surface, hitbox_offset: Vector2):
-        x, y = surface.get_size()
+        return self.render_view(surface.get_size(), lambda view, offset: view.blit(surface, (-offset[0], -offset[1])), hitbox_offset)
+
+    def render_view(self, size: tuple[int,int], paint: Callable[[Surface, tuple[int,int]], None], hitbox_offset: Vector2, retain: bool = False):
+        """ Like render, but for content that is not drawn in full.
+            paint(view, offset) draws the content scrolled by offset into the clip area of the view.
+
+            With retain the view is kept between frames: scrolling shifts it and only the
+            exposed strips and the rects passed to invalidate are painted again. """
+        x, y = size
 
         show_scroll_bar_x = False
         show_scroll_bar_y = False
@@ -51,19 +83,24 @@ class ScrollProxy(ScrollProxyBase):
             surf_height = min( req_y , self.max_height)
 
         # Create Surface
-        proxy_surface = Surface((surf_width, surf_height))
+        proxy_surface = self._proxy_surface = surface_pool.reuse(self._proxy_surface, (surf_width, surf_height), 0)
         self._set_hitbox(proxy_surface, hitbox_offset)
         if self.background is not None:
             proxy_surface.fill(self.background)
         
         # Calculate available space
-        avail_x = surf_width - 10 if self.design in ("Default") and show_scroll_bar_x else surf_width
-        avail_y = surf_height - 10 if self.design in ("Default") and show_scroll_bar_y else surf_height
+        # the vertical bar takes space on the right, the horizontal one at the bottom
+        avail_x = surf_width - 10 if self.design in ("Default") and show_scroll_bar_y else surf_width
+        avail_y = surf_height - 10 if self.design in ("Default") and show_scroll_bar_x else surf_height
 
         # Blit Surfaces
-        scl_x, scl_y = (-self.scroll_offset).asInts()
-        surface.scroll(scl_x, scl_y)
-        proxy_surface.blit(surface, (0,0))
+        if retain:
+            proxy_surface.blit(self._retained_view((avail_x, avail_y), paint), (0,0))
+        else:
+            proxy_surface.set_clip((0, 0, avail_x, avail_y))
+            paint(proxy_surface, self.scroll_offset.asInts())
+            proxy_surface.set_clip(None)
+            self.painted_area = avail_x * avail_y
 
         # Draw Scrollbar
         if self.design == "Default":
@@ -75,6 +112,50 @@ class ScrollProxy(ScrollProxyBase):
         return proxy_surface
         
 
+    def _retained_view(self, size: tuple[int,int], paint) -> Surface:
+        offset = ox, oy = tuple(self.scroll_offset.asInts())
+        w, h = size
+        view = self._view_surface
+
+        rects = None
+        if view is not None and view.get_size() == size and self._damage is not None and self._view_offset is not None:
+            dx = ox - self._view_offset[0]
+            dy = oy - self._view_offset[1]
+            if abs(dx) < w and abs(dy) < h:
+                rects = []
+                if dx or dy:
+                    view.scroll(-dx, -dy)
+                    # strips moved into the view
+                    if dy > 0:
+                        rects.append(Rect(0, h - dy, w, dy))
+                    elif dy < 0:
+                        rects.append(Rect(0, 0, w, -dy))
+                    if dx > 0:
+                        rects.append(Rect(w - dx, 0, dx, h))
+                    elif dx < 0:
+                        rects.append(Rect(0, 0, -dx, h))
+                bounds = Rect(0, 0, w, h)
+                for rect in self._damage:
+                    rect = rect.move(-ox, -oy).clip(bounds)
+                    if rect.width and rect.height:
+                        rects.append(rect)
+
+        if rects is None:
+            view = self._view_surface = surface_pool.reuse(view, size)
+            rects = [Rect(0, 0, w, h)]
+
+        self.painted_area = 0
+        for rect in rects:
+            view.set_clip(rect)
+            view.fill((0,0,0,0))
+            paint(view, offset)
+            self.painted_area += rect.width * rect.height
+        view.set_clip(None)
+
+        self._view_offset = offset
+        self._damage = []
+        return view
+
     def _draw_default(self, surface: Surface, show_scroll_bar_x: bool, show_scroll_bar_y: bool):
         surf_x, surf_y = surface.get_size()
 
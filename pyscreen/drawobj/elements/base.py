@@ -8,10 +8,23 @@ from pyscreen.hitbox import Hitbox
 from pyscreen.core.entity import StaticEntity
 from pyscreen.drawobj.elements._util.padding import get_innerheight, get_innerwidth, get_outerheight, get_outerwidth, PaddingInterface
 from pyscreen.drawobj.elements._util.margin import MarginInterface
-from pygame import Surface
+from pygame import Surface, SRCALPHA
+from pyscreen.drawobj.util.surfacepool import surface_pool
 from abc import abstractmethod
 
 class Element(StaticEntity):
+    # Containers cache the measured size of their content (see _measure). The cache
+    # is dropped for the element and all its ancestors whenever an element is marked
+    # as changed, so the measure pass only recurses into subtrees that changed.
+    _cache_layout = False
+    _layout_parent: "Element|None" = None
+    _layout_cache: dict|None = None
+    # size a container gave the element for its last render and the measurements under it
+    _constraint: tuple|None = None
+    _constraint_cache: dict|None = None
+    _changed_state = True
+    _frame_surface: Surface|None = None
+
     def __init__(self, eventHandler: EventHandler|None = None, padding: tuple[int,int,int,int]|None = None, margin: tuple[int,int,int,int]|None = None, width: int|None = None, height:int|None = None):
         self.eventHandler = eventHandler
         
@@ -49,6 +62,58 @@ class Element(StaticEntity):
     def render(self, surface: Surface|None):
         raise NotImplementedError
 
+    def _frame(self, size, flags: int = SRCALPHA, depth: int = 32) -> Surface:
+        """ Returns the cleared backing surface of the element, it is kept as long as size does not change """
+        self._frame_surface = surface_pool.reuse(self._frame_surface, size, flags, depth)
+        return self._frame_surface
+
+    def _release_frame(self):
+        surface_pool.release(self._frame_surface)
+        self._frame_surface = None
+
+    @property
+    def _changed(self):
+        return self._changed_state
+
+    @_changed.setter
+    def _changed(self, value):
+        self._changed_state = value
+        if value:
+            self.invalidateLayout()
+
+    def invalidateLayout(self):
+        """ Drops the cached measurements of this element and its ancestors """
+        node = self
+        while node is not None:
+            if node._layout_cache:
+                node._layout_cache.clear()
+            if node._constraint_cache:
+                node._constraint_cache.clear()
+            node = node._layout_parent
+
+    def _adopt(self, child):
+        """ Registers self as layout parent of child, so changes of child invalidate self """
+        child._layout_parent = self
+
+    def _measure(self, key, calc):
+        cache = self._layout_cache
+        if cache is None:
+            cache = self._layout_cache = {}
+        value = cache.get(key)
+        if value is None:
+            value = cache[key] = calc()
+        return value
+
+    def _measure_innerwidth(self):
+        if not self._cache_layout:
+            return self._calc_innerwidth()
+        return self._measure("innerwidth", self._calc_innerwidth)
+
+    def _measure_innerheight(self):
+        if not self._cache_layout:
+            return self._calc_innerheight()
+        return self._measure("innerheight", self._calc_innerheight)
+
     @property
     def changed(self):
         return self._changed
@@ -81,7 +146,7 @@ class Element(StaticEntity):
         if not self.visible:
             return 0
         if self._width is None:
-            return self._calc_innerwidth()
+            return self._measure_innerwidth()
         return get_innerwidth(self._width, self.padding)
 
     @property
@@ -93,13 +158,16 @@ class Element(StaticEntity):
         if not self.visible:
             return 0
         if self._width is None:
-            return get_outerwidth(self._calc_innerwidth(), self.padding)
+            return get_outerwidth(self._measure_innerwidth(), self.padding)
         return self._width
 
     @width.setter
     def width(self, value):
+        if value == self._width:
+            return
         if value is None:
             self._width = None
+            self.invalidateLayout()
             return
         if value < 0:
             raise ValueError("height cannot be negative")
@@ -111,7 +179,7 @@ class Element(StaticEntity):
         if not self.visible:
             return 0
         if self._height is None:
-            return self._calc_innerheight()
+            return self._measure_innerheight()
         return get_innerheight(self._height, self.padding)
 
     @property
@@ -123,13 +191,16 @@ class Element(StaticEntity):
         if not self.visible:
             return 0
         if self._height is None:
-            return get_outerheight(self._calc_innerheight(), self.padding)
+            return get_outerheight(self._measure_innerheight(), self.padding)
         return self._height
 
     @height.setter
     def height(self, value):
+        if value == self._height:
+            return
         if value is None:
             self._height = None
+            self.invalidateLayout()
             return
         if value < 0:
             raise ValueError("height cannot be negative")
@@ -152,6 +223,41 @@ class Element(StaticEntity):
             return tuple(self.offset.asInts())
         return self.offset
     
+    @contextmanager
+    def constrainedTo(self, width: int|None = None, height: int|None = None):
+        """ Gives the element a size for one render by its container
+
+            Unlike setting width and height inside resetAfter, this neither marks the
+            element changed nor drops the measurements of its ancestors, which are
+            being laid out already. The element only lays out again if the size differs
+            from the one of its last constrained render.
+        """
+        saved = (self._width, self._height)
+        size = (saved[0] if width is None else width, saved[1] if height is None else height)
+        if size == saved:
+            if self._constraint is not None:
+                # back to its own size after it was constrained
+                self._constraint = None
+                self._constraint_cache = None
+                self._changed_state = True
+            yield self
+            return
+
+        if size != self._constraint:
+            self._constraint = size
+            self._constraint_cache = None
+            self._changed_state = True
+
+        cache = self._layout_cache
+        self._layout_cache = self._constraint_cache
+        self._width, self._height = size
+        try:
+            yield self
+        finally:
+            self._constraint_cache = self._layout_cache
+            self._layout_cache = cache
+            self._width, self._height = saved
+
     @contextmanager
     def resetAfter(self):
         try:
@@ -159,8 +265,10 @@ class Element(StaticEntity):
             width = self._width
             yield self
         finally:
-            self._height = height
-            self._width = width
+            if self._height != height or self._width != width:
+                self._height = height
+                self._width = width
+                self.invalidateLayout()
 
 
 class ElementWithHitbox(Element):
@@ -193,6 +301,7 @@ class ElementWithHitbox(Element):
         if self.hitbox is not None:
             self.hitbox.destruct()
         self.hitbox = None
+        self._release_frame()
 
     async def releaseFocus(self):
         await self.hitbox.releaseFocus()
@@ -200,6 +309,11 @@ class ElementWithHitbox(Element):
     def setOffset(self, offset):
         self.hitbox.hitbox_location = offset
 
+    def get_position(self) -> tuple[int,int]:
+        if hasattr(self, "location"):
+            return tuple(Vector2(self.location).asInts())
+        return super().get_position()
+
     def printHitbox(self, surface, color=(255,0,0)):
         if self.hitbox is None:
             return
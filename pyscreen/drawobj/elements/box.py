@@ -1,7 +1,10 @@
+from time import perf_counter
+
 from pygame import SRCALPHA, Surface, Rect
 
 from pyscreen.core.vector import Vector2, IntVector2
 from pyscreen.drawobj.util.background import BackgroundImage
+from pyscreen.drawobj.util.surfacepool import surface_pool
 
 from .base import Element
 
@@ -14,6 +17,7 @@ BOX_MIN_HEIGHT = 10
 
 class Box(Element):
     """ Like a HTML Div """
+    _cache_layout = True
 
     def __init__(self, objects: list|None = None, location: Vector2|tuple = (0,0), margin: Vector2|tuple = (0,0,0,0), padding: tuple = (0,0,0,0), gap: int = 1,
         alignment: str = "stretch", background: None|tuple|BackgroundImage = None, height: int|None = None, width: int|None = None
@@ -34,25 +38,39 @@ class Box(Element):
         self.margin_selfcontrol = True
 
         self._objects: list = list(objects) if objects is not None else []
+        for obj in self._objects:
+            self._adopt(obj)
+        # layout of the last build: measured size, position and rendered size per child index
         self._obj_sizes: dict[int,tuple[int,int]] = {}
         self._obj_surf_pos: dict[int,tuple[int,int]] = {}
+        self._obj_surf_sizes: dict[int,tuple[int,int]] = {}
+        self._obj_flex: set[int] = set()
+        self._obj_refs: list = []
         self._surface = None
+        self.render_stats = {}
 
     def destruct(self):
         self.clear()
+        surface_pool.release(self._surface)
         self._surface = None
 
     def clear(self):
         for obj in self._objects:
             obj.destruct()
         self._objects = []
+        self._changed = True
 
     def contains(self, objects: list):
         self._objects: list[Element] = objects
+        for obj in objects:
+            self._adopt(obj)
+        self._changed = True
 
     def append(self, *obj: Element):
         for o in obj:
+            self._adopt(o)
             self.objects.append(o)
+        self._changed = True
 
     @property
     def objects(self):
@@ -61,20 +79,32 @@ class Box(Element):
     @objects.setter
     def objects(self, value):
         self._objects = value
+        for obj in value:
+            self._adopt(obj)
         self._changed = True
 
+    def _measure_innerwidth(self):
+        # objects may be appended to the list directly, the child count guards the cache
+        return self._measure(("innerwidth", len(self._objects)), self._calc_innerwidth)
+
+    def _measure_innerheight(self):
+        return self._measure(("innerheight", len(self._objects)), self._calc_innerheight)
+
     @property
     def width(self):
         if not self._visible:
             return 0
         if self._width is not None:
             return self._width
-        return self._calc_innerwidth() + self.padding.left + self.padding.right
+        return self._measure_innerwidth() + self.padding.left + self.padding.right
 
     @width.setter
     def width(self, value):
+        if value == self._width:
+            return
         if value is None:
             self._width = None
+            self.invalidateLayout()
             return
         if value < 0:
             raise ValueError("height cannot be negative")
@@ -87,11 +117,12 @@ class Box(Element):
             return 0
         if self._width is not None:
             return max(self._width - self.padding.left - self.padding.right, 0)
-        return self._calc_innerwidth()
+        return self._measure_innerwidth()
     
     def _calc_innerwidth(self):
         iw = 0
         for obj in self._objects:
+            self._adopt(obj)
             if not obj.visible:
                 continue
             iw = max(iw, obj.width + obj.margin.left + obj.margin.right)
@@ -103,12 +134,15 @@ class Box(Element):
             return 0
         if self._height is not None:
             return self._height
-        return self._calc_innerheight() + self.padding.top + self.padding.bottom
+        return self._measure_innerheight() + self.padding.top + self.padding.bottom
 
     @height.setter
     def height(self, value):
+        if value == self._height:
+            return
         if value is None:
             self._height = None
+            self.invalidateLayout()
             return
         if value < 0:
             raise ValueError("height cannot be negative")
@@ -121,13 +155,14 @@ class Box(Element):
             return 0
         if self._height is not None:
             return max(self._height - self.padding.top - self.padding.bottom, 0)
-        return self._calc_innerheight()
+        return self._measure_innerheight()
 
     def _calc_innerheight(self):
         h = 0
         first = True
         margin_bottom = 0
         for obj in self._objects:
+            self._adopt(obj)
             if not obj.visible:
                 continue
             if first:
@@ -155,31 +190,52 @@ class Box(Element):
         y = self.location[1] + self.margin.top
         return IntVector2(x,y)
 
+    def get_position(self) -> tuple[int,int]:
+        return tuple(self.position)
+
+    def _constrained_size(self) -> tuple[int,int]:
+        """ Size of the next render, a container gives the box the size of its last constraint """
+        constraint = self._constraint
+        if constraint is None:
+            return self.width, self.height
+        width, height = constraint
+        return (self.width if width is None else width, self.height if height is None else height)
+
     @property
     def changed(self):
         if self._surface is None or self._changed:
             return True
-        if self._last_height != self.height or self._last_width != self.width:
+        if (self._last_width, self._last_height) != self._constrained_size():
             return True
-        if len(self._objects) != len(self._obj_sizes):
+        if len(self._objects) != len(self._obj_refs):
             return True
-        return self._changed or any([o.changed for o in self._objects])
+        return any(o.changed for o in self._objects)
 
     def _needs_rebuild(self):
         if self._surface is None or self._changed:
             return True
-        if self._last_height != self.height or self._last_width != self.width:
+        if (self._last_width, self._last_height) != self._constrained_size():
             return True
-        if len(self._objects) != len(self._obj_sizes):
+        if len(self._objects) != len(self._obj_refs):
             return True
-        return any([ self._obj_sizes[i] != (o.width, o.height) for i, o in enumerate(self._objects)])
+        for i, o in enumerate(self._objects):
+            if o is not self._obj_refs[i]:
+                return True
+            if not o.changed:
+                continue
+            # shown, hidden or resized children move their siblings
+            size = self._obj_sizes.get(i)
+            if size is None:
+                if o.visible:
+                    return True
+            elif not o.visible or size != (o.width, o.height):
+                return True
+        return False
 
     def render(self, surface: Surface|None = None):
         if self.changed:
-            if self._needs_rebuild():
+            if self._needs_rebuild() or not self._update():
                 self._build()
-            else:
-                self._update()
 
             self._last_height = self.height
             self._last_width = self.width
@@ -191,19 +247,65 @@ class Box(Element):
         self._changed = False
         return self._surface
 
-    def _update(self):
+    def _render_child(self, obj: Element, innerwidth):
+        """ Renders a child with the size the alignment gives it """
+        width = None
+        if self._alignment == "stretch":
+            width = innerwidth
+        elif self._alignment == "center" and obj.width > innerwidth:
+            width = innerwidth
+
+        with obj.constrainedTo(width=width):
+            return obj.render()
+
+    def _child_constraint(self):
+        return self.innerwidth
+
+    def _update(self) -> bool:
+        """ Repaints the changed children in place, returns False if a full build is required """
+        self.render_stats = {}
+        constraint = self._child_constraint()
+
         for i, obj in enumerate(self._objects):
-            if obj.changed:
-                size = (obj.width, obj.height)
-                location = self._obj_surf_pos[i]
-                rect = Rect(location, size)
-
-                if self._background is not None:
-                    self._surface.fill(self._background, rect)
-                else:
-                    self._surface.fill((0,0,0,0), rect)
-                s = obj.render()
-                self._surface.blit(s, rect)
+            if not obj.visible or not obj.changed:
+                continue
+
+            start = perf_counter()
+            if i in self._obj_flex:
+                surf = obj.render()
+            else:
+                surf = self._render_child(obj, constraint)
+
+            rect = Rect(self._obj_surf_pos[i], self._obj_surf_sizes[i])
+            if surf is None or surf.get_size() != rect.size:
+                return False
+
+            if isinstance(self._background, BackgroundImage):
+                self._surface.blit(self._background.render_scaled((self.width, self.height)), rect, rect)
+            elif self._background is not None:
+                self._surface.fill(self._background, rect)
+            else:
+                self._surface.fill((0,0,0,0), rect)
+            self._surface.blit(surf, rect)
+
+            self.render_stats[f"{obj.__class__.__name__}[{i}]"] = {
+                "obj": obj,
+                "time": perf_counter() - start
+            }
+        return True
+
+    def _record(self, i: int, obj: Element, location: tuple[int,int], surf: Surface):
+        self._obj_sizes[i] = (obj.width, obj.height)
+        self._obj_surf_pos[i] = location
+        self._obj_surf_sizes[i] = surf.get_size()
+
+    def _reset_records(self, flex: set[int]):
+        self._obj_sizes = {}
+        self._obj_surf_pos = {}
+        self._obj_surf_sizes = {}
+        self._obj_flex = flex
+        self._obj_refs = list(self._objects)
+        self.render_stats = {}
 
     def _build(self):
         h = self.padding.top
@@ -220,6 +322,9 @@ class Box(Element):
 
         iw = 0
 
+        # the content is measured once, children are arranged against that size
+        innerwidth = self._child_constraint()
+
         for i, obj in enumerate(self._objects):
             if not obj.visible:
                 continue
@@ -228,23 +333,15 @@ class Box(Element):
                     flex_objs[i] = obj
                     continue
 
-            with obj.resetAfter():
-                # change width if needed
-                if self._alignment == "stretch":
-                    obj.width = self.innerwidth
-                elif self._alignment == "center":
-                    if obj.width > self.innerwidth:
-                        obj.width = self.innerwidth
-
-                # render object
-                surf = obj.render()
-                iw = max(iw, obj.width)
+            surf = self._render_child(obj, innerwidth)
+            iw = max(iw, obj.width)
 
             sub_surfaces[i] = SubSurface(obj, surf)
 
             h += obj.height + self._gap
 
-        self._surface = Surface((self.width, self.height), SRCALPHA, 32)
+        self._surface = surface_pool.reuse(self._surface, (self.width, self.height))
+        self._reset_records(set(flex_objs))
 
         if self._background is not None:
             loc = (0,0)
@@ -304,6 +401,7 @@ class Box(Element):
             
             self._objects[i].setOffset(absLocation)
             self._surface.blit(surf, relLocation)
+            self._record(i, sObj, relLocation, surf)
 
             r_h += s_height + self._gap + y_margin_offset
                 
@@ -327,9 +425,23 @@ class HorizontalBox(Box):
             raise ValueError("invalid alignment: '%s'" % alignment)
         self._alignment = alignment
 
+    def _render_child(self, obj: Element, innerheight):
+        height = None
+        if self._alignment == "stretch":
+            height = innerheight
+        elif self._alignment == "center" and obj.height > innerheight:
+            height = innerheight
+
+        with obj.constrainedTo(height=height):
+            return obj.render()
+
+    def _child_constraint(self):
+        return self.innerheight
+
     def _calc_innerheight(self):
         ih = 0
         for obj in self._objects:
+            self._adopt(obj)
             if not obj.visible:
                 continue
             ih = max(ih, obj.height + obj.margin.top + obj.margin.bottom)
@@ -340,6 +452,7 @@ class HorizontalBox(Box):
         first = True
         margin_right = 0
         for obj in self._objects:
+            self._adopt(obj)
             if not obj.visible:
                 continue
             if first:
@@ -366,6 +479,9 @@ class HorizontalBox(Box):
 
         ih = 0
 
+        # the content is measured once, children are arranged against that size
+        innerheight = self._child_constraint()
+
         for i, obj in enumerate(self._objects):
             if not obj.visible:
                 continue
@@ -374,22 +490,15 @@ class HorizontalBox(Box):
                     flex_objs[i] = obj
                     continue
 
-            with obj.resetAfter():
-                if self._alignment == "stretch":
-                    obj.height = self.innerwidth
-                elif self._alignment == "center":
-                    if obj.height > self.innerheight:
-                        obj.height = self.innerheight
-
-                # render object
-                surf = obj.render()
-                ih = max(ih, obj.height)
+            surf = self._render_child(obj, innerheight)
+            ih = max(ih, obj.height)
 
             sub_surfaces[i] = SubSurface(obj, surf)
 
             w += obj.width + self._gap
 
-        self._surface = Surface((self.width, self.height), SRCALPHA, 32)
+        self._surface = surface_pool.reuse(self._surface, (self.width, self.height))
+        self._reset_records(set(flex_objs))
 
         if self._background is not None:
             loc = (0,0)
@@ -449,5 +558,6 @@ class HorizontalBox(Box):
             
             self._objects[i].setOffset(absLocation)
             self._surface.blit(surf, relLocation)
+            self._record(i, sObj, relLocation, surf)
 
             r_w += s_width + self._gap + x_margin_offset
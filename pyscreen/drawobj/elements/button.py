@@ -6,6 +6,7 @@ from pyscreen.core.vector import Vector2
 from pyscreen.eventHandler import EventHandler
 from pyscreen.hitbox import Hitbox
 
+from pyscreen.drawobj.util.textcache import text_cache
 from .base import ElementWithHitbox
 
 
@@ -74,10 +75,8 @@ class Button(ElementWithHitbox):
             
         show_value = self._value
 
-        text_surface = self.font.render(show_value, True, self._color, self._background)
-        frame_surface = Surface(
-            (self.width, self.height), SRCALPHA, 32
-        )
+        text_surface = text_cache.render(self.font, show_value, True, self._color, self._background)
+        frame_surface = self._frame((self.width, self.height))
 
         if self._background is not None:
             frame_surface.fill(self._background)
@@ -118,6 +117,5 @@ class Button(ElementWithHitbox):
         if self.hitbox is None or self.hitbox.hasFocus:
             show_value += " "
 
-        text_surface = self.font.render(show_value, False, (0,0,0))
-        x,y = text_surface.get_size()
+        x,y = text_cache.size(self.font, show_value)
         return x
\ No newline at end of file
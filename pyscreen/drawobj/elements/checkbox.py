@@ -6,6 +6,7 @@ from pyscreen.core.vector import Vector2
 from pyscreen.eventHandler import EventHandler
 from pyscreen.hitbox import Hitbox
 
+from pyscreen.drawobj.util.textcache import text_cache
 from .base import ElementWithHitbox
 
 
@@ -134,7 +135,7 @@ class Checkbox(ElementWithHitbox):
         # Show text
         show_value = self._value
 
-        text_surface = self._font.render(show_value, True, self._color, self._background)
+        text_surface = text_cache.render(self._font, show_value, True, self._color, self._background)
         frame_surface = Surface(
             (self.width, self.height), SRCALPHA, 32
         )
@@ -215,6 +216,5 @@ class Checkbox(ElementWithHitbox):
         if self.hitbox is None or self.hitbox.hasFocus:
             show_value += " "
 
-        text_surface = self._font.render(show_value, False, (0,0,0))
-        x,y = text_surface.get_size()
+        x,y = text_cache.size(self._font, show_value)
         return x
\ No newline at end of file
@@ -43,6 +43,8 @@ class Flexbox(Box):
         self.absolute_offset = Vector2(0,0)
 
         self._objects: list = list(objects) if objects is not None else []
+        for obj in self._objects:
+            self._adopt(obj)
         self._obj_sizes: dict[int,tuple[int,int]] = {}
         self._obj_surf_pos: dict[int,tuple[int,int]] = {}
         self._surface = Surface((self.width, self.height), SRCALPHA, 32)
@@ -73,8 +75,11 @@ class Flexbox(Box):
     
     @height.setter
     def height(self, value):
+        if value == self._height:
+            return
         if value is None:
             self._height = None
+            self.invalidateLayout()
             return
         if value < 0:
             raise ValueError("height cannot be negative")
@@ -91,7 +96,7 @@ class Flexbox(Box):
         if self._sizeProvider is not None:
             return max(self.height - self.padding.top - self.padding.bottom, 0)
         
-        return max(self._calc_innerheight(), 0) 
+        return max(self._measure_innerheight(), 0) 
     
     @property
     def width(self):
@@ -107,8 +112,11 @@ class Flexbox(Box):
     
     @width.setter
     def width(self, value):
+        if value == self._width:
+            return
         if value is None:
             self._width = None
+            self.invalidateLayout()
             return
         if value < 0:
             raise ValueError("height cannot be negative")
@@ -125,7 +133,7 @@ class Flexbox(Box):
         if self._sizeProvider is not None:
             return max(self.width - self.padding.left - self.padding.right, 0)
         
-        return max(self._calc_innerwidth(), 0)
+        return max(self._measure_innerwidth(), 0)
         
 
 class HorizontalFlexbox(HorizontalBox):
@@ -154,6 +162,8 @@ class HorizontalFlexbox(HorizontalBox):
         self.absolute_offset = Vector2(0,0)
 
         self._objects: list = list(objects) if objects is not None else []
+        for obj in self._objects:
+            self._adopt(obj)
         self._obj_sizes: dict[int,tuple[int,int]] = {}
         self._obj_surf_pos: dict[int,tuple[int,int]] = {}
         self._surface = Surface((self.width, self.height), SRCALPHA, 32)
@@ -172,8 +182,11 @@ class HorizontalFlexbox(HorizontalBox):
     
     @height.setter
     def height(self, value):
+        if value == self._height:
+            return
         if value is None:
             self._height = None
+            self.invalidateLayout()
             return
         if value < 0:
             raise ValueError("height cannot be negative")
@@ -190,7 +203,7 @@ class HorizontalFlexbox(HorizontalBox):
         if self._sizeProvider is not None:
             return max(self.height - self.padding.top - self.padding.bottom, 0)
         
-        return max(self._calc_innerheight(), 0) 
+        return max(self._measure_innerheight(), 0) 
     
     @property
     def width(self):
@@ -206,8 +219,11 @@ class HorizontalFlexbox(HorizontalBox):
     
     @width.setter
     def width(self, value):
+        if value == self._width:
+            return
         if value is None:
             self._width = None
+            self.invalidateLayout()
             return
         if value < 0:
             raise ValueError("height cannot be negative")
@@ -225,6 +241,6 @@ class HorizontalFlexbox(HorizontalBox):
             return max(self._sizeProvider.width - self.padding.left - self.padding.right \
                 - self.margin.left - self.margin.right, 0)
         
-        return max(self._calc_innerwidth(), 0)
+        return max(self._measure_innerwidth(), 0)
         
 
@@ -7,6 +7,7 @@ from pyscreen.core.vector import Vector2
 from pyscreen.drawobj.elements.base import Element
 from pyscreen.drawobj.elements.flexbox import Flexbox
 from pyscreen.drawobj.elements.box import Box
+from pyscreen.drawobj.util.surfacepool import surface_pool
 
 
 class GridCell(Box):
@@ -20,6 +21,8 @@ class GridCell(Box):
 
 
 class Grid(Element):
+    _cache_layout = True
+
     def __init__(self, position = None, padding = (0,0,0,0), margin = (0,0,0,0), width: int = None, height: int = None, *,columns = 1, rows = 1, rowTemplate = None, colTemplate = None):
         super().__init__(padding=padding, margin=margin, width=width, height=height)
         
@@ -48,6 +51,7 @@ class Grid(Element):
 
     def destruct(self):
         self.clear()
+        surface_pool.release(self._surface)
         self._surface = None
 
     def clear(self):
@@ -71,6 +75,8 @@ class Grid(Element):
            self._cellSets[(col, row)].add(cell) 
         else:
             self._cellSets[(col, row)] = {cell}
+        self._adopt(cell)
+        self._changed = True
 
     def removeCell(self, cell: GridCell, col: int, row: int):
         if col < 0 or col >= self._columns:
@@ -80,6 +86,7 @@ class Grid(Element):
 
         if (col, row) in self._cellSets:
             self._cellSets[(col, row)].remove(cell)
+        self._changed = True
 
     def getCell(self, col: int, row: int) -> list[GridCell]|None:
         if col < 0 or col >= self._columns:
@@ -213,6 +220,8 @@ class Grid(Element):
 
                 else:
                     raise ValueError("Invalid row template")
+
+        self.invalidateLayout()
                 
     
     def _calculateColFlexSpace(self) -> int:
@@ -281,7 +290,7 @@ class Grid(Element):
     
 
     def render(self, surface: Surface | None = None):
-        self._surface = Surface((self.width, self.height), pygame.SRCALPHA, 32)
+        self._surface = surface_pool.reuse(self._surface, (self.width, self.height))
 
         colWidths = self._calculateColWidth()
         rowHeights = self._calculateRowHeight()
@@ -303,9 +312,7 @@ class Grid(Element):
 
         cell.setOffset(self.absolute_offset + (x, y))
 
-        with cell.resetAfter():
-            cell.width = cellWidth
-            cell.height = cellHeight
+        with cell.constrainedTo(cellWidth, cellHeight):
             self._surface.blit(cell.render(), (x, y))
 
 
@@ -319,6 +326,7 @@ class Grid(Element):
         multirow_cells: list[tuple[int,GridCell]] = []
         for (row,col), cellSet in self._cellSets.items():
             for cell in cellSet:
+                self._adopt(cell)
                 if cell.rowSize > 1:
                     multirow_cells.append((row, cell))
                 else:
@@ -349,6 +357,7 @@ class Grid(Element):
         multicolumn_cells: list[tuple[int,GridCell]] = []
         for (row,col), cellSet in self._cellSets.items():
             for cell in cellSet:
+                self._adopt(cell)
                 if cell.colSize > 1:
                     multicolumn_cells.append((col, cell))
                 else:
@@ -4,6 +4,7 @@ from pygame.font import Font
 from pyscreen.core.vector import Vector2
 from pyscreen.hitbox import Hitbox
 from pyscreen.eventHandler import EventHandler
+from pyscreen.drawobj.util.textcache import text_cache
 from .base import ElementWithHitbox
 
 class Label(ElementWithHitbox):
@@ -71,10 +72,8 @@ class Label(ElementWithHitbox):
         
         show_value = str(self._value)
 
-        text_surface = self._font.render(show_value, True, self._color, self._background)
-        frame_surface = Surface(
-            (self.width, self.height), SRCALPHA, 32
-        )
+        text_surface = text_cache.render(self._font, show_value, True, self._color, self._background)
+        frame_surface = self._frame((self.width, self.height))
 
         if self._background is not None:
             frame_surface.fill(self._background)
@@ -116,8 +115,7 @@ class Label(ElementWithHitbox):
         if self.hitbox is None or self.hitbox.hasFocus:
             show_value += " "
 
-        text_surface = self._font.render(show_value, False, (0,0,0))
-        x,y = text_surface.get_size()
+        x,y = text_cache.size(self._font, show_value)
         return x
     
     def printHitbox(self, surface, color=(0,255,0)):
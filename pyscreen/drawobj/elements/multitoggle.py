@@ -1,10 +1,9 @@
-import inspect
 from typing import Any
 from pygame import Surface, SRCALPHA
 import pyscreen.drawobj.draw as draw
 from pygame.font import Font
 from pyscreen.core.vector import Vector2
-from pyscreen.eventHandler import EventHandler
+from pyscreen.eventHandler import EventHandler, EventListener
 from .base import Element
 from .button import Button
 from pyscreen.drawobj.elements._util.padding import get_outerheight, get_outerwidth, get_padding
@@ -33,7 +32,7 @@ class Multitoggle(Element):
         self.absolute_offset = Vector2(0,0)
         self._text_align = text_align
         self._buttons: dict[Any,MultitoggleButton] = {}
-        self._onChange = []
+        self._onChange: list[EventListener] = []
         self._lock = RLock()
 
         self.construct()
@@ -134,17 +133,9 @@ class Multitoggle(Element):
         self.selected_index = btn.key
         e.value = btn.key
         for f in self._onChange:
-            params = inspect.signature(f).parameters
-            if inspect.iscoroutinefunction(f):
-                if len(params) == 1:
-                    await f(e)
-                else:
-                    await f()
-            else:
-                if len(params) == 1:
-                    f(e)
-                else:
-                    f()
+            r = f(e)
+            if f.is_async:
+                await r
 
     def destruct(self):
         for btn in self._buttons.values():
@@ -197,7 +188,7 @@ class Multitoggle(Element):
 
     def addEventListener(self, type, f):
         if type == "change":
-            self._onChange.append(f)
+            self._onChange.append(EventListener(f, type))
         else:
             raise ValueError("Invalid event type for Multitoggle")
 
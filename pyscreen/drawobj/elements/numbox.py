@@ -40,6 +40,10 @@ class Numbox(Textbox):
     def _show_value(self) -> str:
         return self._str_value
 
+    @property
+    def _show_cursor(self) -> int:
+        return len(self._str_value)
+
     @value.setter
     def value(self, value: int|float):
         self._changed = True
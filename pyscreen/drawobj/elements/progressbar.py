@@ -75,9 +75,7 @@ class Progressbar(ElementWithHitbox):
         if self.width <= 0 or self.height <= 0:
             return
 
-        frame_surface = Surface(
-            (self.width, self.height), SRCALPHA, 32
-        )
+        frame_surface = self._frame((self.width, self.height))
 
         fx,fy = frame_surface.get_size()
         left_x = self.padding.left
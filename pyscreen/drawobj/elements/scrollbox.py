@@ -0,0 +1,186 @@
+from bisect import bisect_left, bisect_right
+
+from pygame import Rect, Surface
+
+from pyscreen.core.vector import Vector2
+from pyscreen.eventHandler import EventHandler
+from pyscreen.drawobj.util.background import BackgroundImage
+
+from .base import Element
+from .box import Box
+from ._scrollbar.proxy import ScrollProxy
+
+# Width of the vertical scrollbar drawn over the content
+SCROLLBAR_WIDTH = 10
+
+
+class ScrollBox(Box):
+    """ Vertical box with a fixed height that scrolls its children
+
+        Only the extents of the children are measured. Children are rendered when they
+        intersect the viewport, the viewport is retained and scrolling repaints only the
+        strip that moved into view.
+    """
+
+    def __init__(self, eventHandler: EventHandler, objects: list|None = None, location: Vector2|tuple = (0,0), margin: Vector2|tuple = (0,0,0,0),
+        padding: tuple = (0,0,0,0), gap: int = 1, alignment: str = "stretch", background: None|tuple|BackgroundImage = None,
+        height: int = 200, width: int|None = None
+    ):
+        super().__init__(objects, location, margin, padding, gap, alignment, background, height, width)
+        self.eventHandler = eventHandler
+        self.scrollProxy = ScrollProxy(eventHandler, max_height=height)
+        self._extents_last = None
+        self._in_view: set[int] = set()
+        self._last_scroll = (0,0)
+
+    def destruct(self):
+        # the rendered surface belongs to the scroll proxy
+        self._surface = None
+        super().destruct()
+        if self.scrollProxy.hitbox is not None:
+            self.scrollProxy.destruct()
+
+    @property
+    def changed(self):
+        if self._surface is None or self._changed or self._moved(self._extents()):
+            return True
+        if (self._last_width, self._last_height) != self._constrained_size():
+            return True
+        if self._last_scroll != tuple(self.scrollProxy.scroll_offset.asInts()):
+            return True
+        entries = self._extents()[1]
+        return any(entries[i][2].changed for i in self._in_view if i < len(entries))
+
+    def _calc_extents(self) -> tuple[list[int], list[tuple[int,int,Element]], int]:
+        """ Returns the tops, the (top, height, child) entries and the height of the content """
+        tops = []
+        entries = []
+        y = self.padding.top
+        first = True
+        margin_bottom = 0
+        for obj in self._objects:
+            self._adopt(obj)
+            if not obj.visible:
+                continue
+            if first:
+                first = False
+            else:
+                y += self._gap
+            y += max(margin_bottom, obj.margin.top)
+            tops.append(y)
+            entries.append((y, obj.height, obj))
+            y += obj.height
+            margin_bottom = obj.margin.bottom
+        return tops, entries, y + margin_bottom + self.padding.bottom
+
+    def _moved(self, extents) -> bool:
+        """ True if the children were moved or resized since the last render """
+        # stretched children invalidate the measurements when rendered, so compare the values
+        return self._extents_last is None or extents[1] != self._extents_last[1]
+
+    def _extents(self):
+        return self._measure(("extents", len(self._objects)), self._calc_extents)
+
+    @property
+    def content_height(self) -> int:
+        return self._extents()[2]
+
+    def _child_constraint(self):
+        if self.content_height > self.height:
+            return max(self.innerwidth - SCROLLBAR_WIDTH, 0)
+        return self.innerwidth
+
+    def _visible_range(self, extents) -> range:
+        tops, entries, _ = extents
+        top = int(self.scrollProxy.scroll_offset.y)
+        bottom = top + self.height
+        first = max(bisect_right(tops, top) - 1, 0)
+        last = bisect_left(tops, bottom)
+        while first < last and entries[first][0] + entries[first][1] <= top:
+            first += 1
+        return range(first, last)
+
+    def _child_x(self, obj: Element, surf: Surface, constraint: int) -> int:
+        x = self.padding.left + obj.margin.left
+        if self._alignment == "center" and surf.get_width() < constraint:
+            x += round(constraint / 2 - surf.get_width() / 2)
+        elif self._alignment == "right":
+            x += constraint - surf.get_width()
+        return x
+
+    def _origin(self) -> Vector2:
+        origin = Vector2(self.absolute_offset)
+        if self.margin_selfcontrol:
+            origin += (self.margin.left, self.margin.top)
+        return origin
+
+    def render(self, surface: Surface|None = None):
+        if not self.visible:
+            return
+
+        extents = self._extents()
+        tops, entries, content_height = extents
+        self.scrollProxy.max_height = self.height
+
+        if self._changed or self._moved(extents):
+            self.scrollProxy.invalidate()
+        self._extents_last = extents
+
+        # clamp in case the content shrank
+        offset = self.scrollProxy.scroll_offset
+        offset.y = max(0, min(offset.y, max(content_height - self.height, 0)))
+
+        in_view = self._visible_range(extents)
+        origin = self._origin()
+        for i in in_view:
+            y, h, obj = entries[i]
+            if obj.changed:
+                self.scrollProxy.invalidate((0, y, self.width, h))
+            obj.setOffset(origin + (self.padding.left + obj.margin.left, y - int(offset.y)))
+            if getattr(obj, "hitbox", None) is not None:
+                obj.hitbox.enabled = True
+        # children that left the view must not catch events at their old position
+        for i in self._in_view.difference(in_view):
+            if i < len(entries) and getattr(entries[i][2], "hitbox", None) is not None:
+                entries[i][2].hitbox.enabled = False
+        self._in_view = set(in_view)
+
+        self._surface = self.scrollProxy.render_view((self.width, content_height), self._paint, origin, retain=True)
+        self._last_height = self.height
+        self._last_width = self.width
+        self._last_scroll = tuple(offset.asInts())
+        self._changed = False
+
+        if surface is not None:
+            surface.blit(self._surface, tuple(self.position))
+        return self._surface
+
+    def _paint(self, view: Surface, offset: tuple[int,int]):
+        """ Renders the children intersecting the clip area of view """
+        ox, oy = offset
+        clip = view.get_clip()
+
+        if isinstance(self._background, BackgroundImage):
+            view.blit(self._background.render_scaled((self.width, self.height)), clip, clip)
+        elif self._background is not None:
+            view.fill(self._background)
+
+        tops, entries, _ = self._extents()
+        top = oy + clip.top
+        bottom = oy + clip.bottom
+        constraint = self._child_constraint()
+
+        i = max(bisect_right(tops, top) - 1, 0)
+        while i < len(entries) and entries[i][0] < bottom:
+            y, h, obj = entries[i]
+            if y + h > top:
+                surf = self._render_child(obj, constraint)
+                if surf is not None:
+                    view.blit(surf, (self._child_x(obj, surf, constraint) - ox, y - oy))
+            i += 1
+
+    def printHitbox(self, surface: Surface):
+        entries = self._extents()[1]
+        for i in self._in_view:
+            if i < len(entries) and hasattr(entries[i][2], "printHitbox"):
+                entries[i][2].printHitbox(surface)
@@ -1,7 +1,6 @@
-import copy
 from time import time
 
-from pygame import K_BACKSPACE, K_RETURN, SRCALPHA, Surface
+from pygame import K_BACKSPACE, K_DELETE, K_DOWN, K_END, K_HOME, K_LEFT, K_RETURN, K_RIGHT, K_UP, SRCALPHA, Surface
 from pygame.font import Font
 
 import pyscreen.drawobj.draw as draw
@@ -10,6 +9,9 @@ from pyscreen.eventHandler import EventHandler
 from pyscreen.hitbox import Hitbox
 from pyscreen.drawobj.elements._util.padding import get_innerheight, get_innerwidth, get_outerheight, get_outerwidth, get_padding
 
+from pyscreen.drawobj.util.textbuffer import TextBuffer
+from pyscreen.drawobj.util.textcache import text_cache
+from pyscreen.drawobj.util.textlayout import TextLayout
 from .base import ElementWithHitbox
 from ._scrollbar.proxy import ScrollProxy
 
@@ -25,8 +27,9 @@ class Textarea(ElementWithHitbox):
         self._background = background
         self._color = color
         self._border = border_color
-        self._value = value
-        self.max_length = max_length
+        self._buffer = TextBuffer(value, max_length)
+        self._layout = TextLayout(font)
+        self._follow_caret = False
 
         if not readonly:
             self.hitbox.addEventListener("mouseClick", self.focus)
@@ -35,11 +38,29 @@ class Textarea(ElementWithHitbox):
 
     @property
     def value(self):
-        return self._value
+        return self._buffer.text
 
     @value.setter
     def value(self, value):
-        self._value = value
+        self._buffer.text = value
+        self._changed = True
+
+    @property
+    def buffer(self) -> TextBuffer:
+        return self._buffer
+
+    @property
+    def max_length(self):
+        return self._buffer.max_length
+
+    @max_length.setter
+    def max_length(self, value):
+        self._buffer.max_length = value
+
+    def insert(self, text: str):
+        """ Inserts text at the cursor, replacing the selection """
+        self._buffer.insert(text)
+        self._follow_caret = True
         self._changed = True
 
     @property
@@ -84,21 +105,38 @@ class Textarea(ElementWithHitbox):
 
     async def _onKeydown(self, event):
         self._changed = True
+        self._follow_caret = True
+        buffer = self._buffer
+        select = self.eventHandler.shift_active
         if event.key == K_BACKSPACE:
-            self._value = self._value[:-1]
+            buffer.backspace()
+        elif event.key == K_DELETE:
+            buffer.delete()
+        elif event.key == K_LEFT:
+            buffer.move_cursor(-1, select)
+        elif event.key == K_RIGHT:
+            buffer.move_cursor(1, select)
+        elif event.key == K_UP:
+            buffer.move_line(-1, select)
+        elif event.key == K_DOWN:
+            buffer.move_line(1, select)
+        elif event.key == K_HOME:
+            line, column = buffer.line_of(buffer.cursor)
+            buffer.move_cursor(-column, select)
+        elif event.key == K_END:
+            line, _ = buffer.line_of(buffer.cursor)
+            buffer.move_cursor(buffer.line_end(line) - buffer.cursor, select)
         elif event.key == K_RETURN:
             if self.eventHandler.shift_active:
                 await self.hitbox.releaseFocus()
             else:
-                self._value = self._value + "\n"
-        elif self.max_length is None or len(self._value) < self.max_length:
-            self._value = self._value + event.unicode
-
-        self.scrollProxy.scroll_offset = copy.deepcopy(self.scrollProxy.scroll_maxoffset)
+                buffer.insert("\n")
+        elif event.unicode:
+            buffer.insert(event.unicode)
 
     async def focus(self, e):
         if not self.hitbox.hasFocus:
-            await self.hitbox.focus(lambda: self._value)
+            await self.hitbox.focus(lambda: self.value)
             self.__override_event = self.hitbox.outer.addEventListener("keyDown", self._onKeydown, override=True)
             def leave(e):
                 self.hitbox.removeEventListener(self.__override_event)
@@ -114,69 +152,75 @@ class Textarea(ElementWithHitbox):
         if not self.visible:
             return
 
-        show_value = self._value
-        if self.hitbox.hasFocus:
-            if int(time()*2) & 1:
-                show_value += "|"
-            else:
-                show_value += " "
-
+        layout = self._layout
+        layout.font = self._font
+        layout.width = self.width - self.padding.left - self.padding.right
+        layout.sync(self._buffer)
 
-        mwidth = self.width - self.padding.left - self.padding.right
-        text_surface = draw.text(show_value, self._font, self._color, self._background, mwidth)
-        tx,ty = text_surface.get_size()
+        fx = layout.content_width + self.padding.left + self.padding.right
+        fy = layout.height + self.padding.top + self.padding.bottom
 
-        fx = tx + self.padding.left + self.padding.right
-        fy = ty + self.padding.top + self.padding.bottom
-
-        frame_surface = Surface(
-            (fx, fy), SRCALPHA, 32
-        )
+        if self._height is not None:
+            if self._follow_caret:
+                self._scroll_to_caret(fy)
+            self.hitbox.hitbox_size = Vector2(fx,self._height)
+            s = self.scrollProxy.render_view((fx, fy), self._paint, self.hitbox.hitbox_location)
+        else:
+            self.hitbox.hitbox_size = Vector2(fx,fy)
+            s = self._frame((fx, fy))
+            self._paint(s, (0,0))
+
+        if surface is not None:
+            surface.blit(s, tuple(self.location))
+
+        self._follow_caret = False
+        self._changed = False
+        return s
+
+    def _caret(self) -> tuple[int,int]:
+        return self._layout.caret(*self._buffer.line_of(self._buffer.cursor))
+
+    def _scroll_to_caret(self, content_height: int):
+        """ Scrolls the viewport so the line of the cursor is visible """
+        _, y = self._caret()
+        y += self.padding.top
+        offset = self.scrollProxy.scroll_offset
+        view = self._height
+        if y < offset.y:
+            offset.y = y
+        elif y + self._layout.line_height > offset.y + view:
+            offset.y = y + self._layout.line_height - view
+        offset.y = max(0, min(offset.y, max(content_height - view, 0)))
+
+    def _paint(self, surface: Surface, offset: tuple[int,int]):
+        """ Draws the part of the frame scrolled by offset that is visible in surface """
+        ox, oy = offset
+        fx = self._layout.content_width + self.padding.left + self.padding.right
+        fy = self._layout.height + self.padding.top + self.padding.bottom
 
         if self._background is not None:
-            frame_surface.fill(self._background)
+            surface.fill(self._background, (-ox, -oy, fx, fy))
 
         if self._border is not None:
-            sx, sy = frame_surface.get_size()
-            draw.rectangle(frame_surface,self._border,(0,0),(sx,sy),1)
-
-        
-        
-        dx,dy = (self.padding.left,self.padding.top)
-
-        if tx+self.padding.left+self.padding.right > fx:
-            dx = fx - (tx+self.padding.left+self.padding.right) + self.padding.left
-        if ty+self.padding.top+self.padding.bottom > fy:
-            dy = fy - (ty+self.padding.top+self.padding.bottom) + self.padding.top
+            draw.rectangle(surface,self._border,(-ox,-oy),(fx-ox,fy-oy),1)
 
-        frame_surface.blit(text_surface, (dx,dy))
+        top = oy - self.padding.top
+        self._layout.render(surface, self._color, self._background, True,
+                            (self.padding.left - ox, 0), top, surface.get_height())
 
-        if self._height is not None:
-            self.hitbox.hitbox_size = Vector2(fx,self._height)
-            s = self.scrollProxy.render(frame_surface, self.hitbox.hitbox_location)
-            if surface is not None:
-                surface.blit(s, tuple(self.location))
-            
-            self._changed = False
-            return s
-
-        else:
-            self.hitbox.hitbox_size = Vector2(fx,fy)
-            if surface is not None:
-                surface.blit(frame_surface, tuple(self.location))
-            
-            self._changed = False
-            return frame_surface
+        if self.hitbox.hasFocus and int(time()*2) & 1:
+            x, y = self._caret()
+            surface.fill(self._color, (self.padding.left - ox + x, y - top, 1, self._layout.line_height))
 
 
     def _calc_innerheight(self):
-        char_height = self._font.get_height()
-        return char_height * len(self._value.splitlines())
+        self._layout.sync(self._buffer)
+        return self._layout.height
 
     def _calc_innerwidth(self):
-        show_value = self._value
+        self._layout.font = self._font
+        self._layout.sync(self._buffer)
+        width = self._layout.natural_width
         if self.hitbox is None or self.hitbox.hasFocus:
-            show_value += " "
-
-        x,y = self._font.size(show_value)
-        return x
\ No newline at end of file
+            width += text_cache.size(self._font, " ")[0]
+        return width
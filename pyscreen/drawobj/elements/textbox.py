@@ -1,12 +1,14 @@
 from time import time
 
-from pygame import K_BACKSPACE, K_RETURN, SRCALPHA, Surface
+from pygame import K_BACKSPACE, K_DELETE, K_END, K_HOME, K_LEFT, K_RETURN, K_RIGHT, SRCALPHA, Surface
 from pygame.font import Font
 
 import pyscreen.drawobj.draw as draw
 from pyscreen.core.vector import Vector2
 from pyscreen.eventHandler import EventHandler
 
+from pyscreen.drawobj.util.textbuffer import TextBuffer
+from pyscreen.drawobj.util.textcache import text_cache
 from .base import ElementWithHitbox
 
 
@@ -20,8 +22,7 @@ class Textbox(ElementWithHitbox):
         self._background = background
         self._color = color
         self._border = border_color
-        self._value = value
-        self.max_length = max_length
+        self._buffer = TextBuffer(value, max_length)
         self._placeholder = placeholder
 
         self.hitbox.addEventListener("mouseDown", self.focus)
@@ -30,15 +31,29 @@ class Textbox(ElementWithHitbox):
 
     @property
     def value(self):
-        return self._value
+        return self._buffer.text
 
     @value.setter
     def value(self, value):
         self._changed = True
-        if self.max_length is not None:
-            value = value[:self.max_length]
-        else:
-            self._value = value
+        self._buffer.text = value
+
+    @property
+    def buffer(self) -> TextBuffer:
+        return self._buffer
+
+    @property
+    def max_length(self):
+        return self._buffer.max_length
+
+    @max_length.setter
+    def max_length(self, value):
+        self._buffer.max_length = value
+
+    def insert(self, text: str):
+        """ Inserts text at the cursor, replacing the selection """
+        self._buffer.insert(text)
+        self._changed = True
 
     @property
     def background(self):
@@ -86,12 +101,25 @@ class Textbox(ElementWithHitbox):
         self._changed = True
 
     async def _onKeydown(self, event):
+        self._changed = True
+        buffer = self._buffer
+        select = self.eventHandler.shift_active
         if event.key == K_BACKSPACE:
-            self.value = self.value[:-1]
+            buffer.backspace()
+        elif event.key == K_DELETE:
+            buffer.delete()
+        elif event.key == K_LEFT:
+            buffer.move_cursor(-1, select)
+        elif event.key == K_RIGHT:
+            buffer.move_cursor(1, select)
+        elif event.key == K_HOME:
+            buffer.move_cursor(-buffer.cursor, select)
+        elif event.key == K_END:
+            buffer.move_cursor(len(buffer) - buffer.cursor, select)
         elif event.key == K_RETURN:
             await self.hitbox.releaseFocus()
-        elif self.max_length is None or len(self.value) < self.max_length:
-            self.value = self.value + event.unicode
+        elif event.unicode:
+            buffer.insert(event.unicode)
 
     async def focus(self, e):
         if not self.hitbox.hasFocus:
@@ -106,25 +134,22 @@ class Textbox(ElementWithHitbox):
     def _show_value(self) -> str:
         return str(self.value)
 
+    @property
+    def _show_cursor(self) -> int:
+        """ Position of the cursor in _show_value """
+        return self._buffer.cursor
+
 
     def render(self, surface: Surface|None = None):
         if not self.visible:
             return
 
         show_value = self._show_value
-        if self.hitbox.hasFocus:
-            if int(time()*2) & 1:
-                show_value += "|"
-            else:
-                show_value += " "
-        elif show_value == "":
+        if not self.hitbox.hasFocus and show_value == "":
             show_value = self._placeholder
 
-
-        text_surface = draw.text(show_value, self._font, self._color, self._background)
-        frame_surface = Surface(
-            (self.width, self.height), SRCALPHA, 32
-        )
+        text_surface = text_cache.render(self._font, show_value, True, self._color, self._background)
+        frame_surface = self._frame((self.width, self.height))
 
         if self._background is not None:
             frame_surface.fill(self._background)
@@ -137,12 +162,19 @@ class Textbox(ElementWithHitbox):
         fx,fy = frame_surface.get_size()
         dx,dy = (self.padding.left,self.padding.top)
 
-        if tx+self.padding.left+self.padding.right > fx:
-            dx = fx - (tx+self.padding.left+self.padding.right) + self.padding.left
+        caret_x = None
+        if self.hitbox.hasFocus:
+            caret_x = text_cache.size(self._font, show_value[:self._show_cursor])[0]
+            # keep the cursor inside the frame
+            if dx + caret_x + 1 > fx - self.padding.right:
+                dx = fx - self.padding.right - caret_x - 1
         if ty+self.padding.top+self.padding.bottom > fy:
             dy = fy - (ty+self.padding.top+self.padding.bottom) + self.padding.top
 
         frame_surface.blit(text_surface, (dx,dy))
+        if caret_x is not None and int(time()*2) & 1:
+            frame_surface.fill(self._color, (dx + caret_x, dy, 1, self._font.get_height()))
+
         if surface is not None:
             surface.blit(frame_surface, tuple(self.location))
 
@@ -158,6 +190,5 @@ class Textbox(ElementWithHitbox):
         if self.hitbox is None or self.hitbox.hasFocus:
             show_value += " "
 
-        text_surface = self._font.render(show_value, False, (0,0,0))
-        x,y = text_surface.get_size()
+        x,y = text_cache.size(self._font, show_value)
         return x
\ No newline at end of file
@@ -1,3 +1,4 @@
+from math import asin, atan2, cos, degrees, floor, hypot, radians, sin, sqrt
 from threading import RLock
 from timeit import timeit
 from typing import Iterable
@@ -7,6 +8,7 @@ from pygame.font import Font
 
 from pyscreen.core.coordinate import Coordinate
 from pyscreen.core.entity import DynamicEntity
+from pyscreen.core.projection import ProjectionContext
 from pyscreen.core.scale import Scale
 from pyscreen.core.vector import Vector2
 from pyscreen.hitbox import Hitbox
@@ -14,9 +16,28 @@ from pyscreen.screen import Screen
 
 from .elements._util.margin import MarginInterface
 from pyscreen.drawobj.base.renderable import Renderable
+from pyscreen.drawobj.util.tilecache import DEFAULT_TILE_SIZE, TileCache
 from pyscreen.settings import MAX_LATITUDE
 
+# Pixels the cached tiles may be off before they are projected around the new center
+MAX_TILE_DISTORTION = 1.5
+
+
+def _project(latitude: float, longitude: float, center_lat: float, center_lon: float) -> tuple[float,float,float]:
+    """ Unit sphere position of a coordinate in the projection around center, as in Coordinate.toVector2 """
+    dlat = radians(latitude - center_lat)
+    dlon = radians(longitude - center_lon)
+    return cos(dlat) * sin(dlon), -sin(dlat), cos(dlat) * cos(dlon)
+
+
+def _unproject(x: float, y: float, center_lat: float, center_lon: float) -> tuple[float,float]:
+    """ Inverse of _project for a point on the visible hemisphere """
+    z = sqrt(max(1 - x**2 - y**2, 0))
+    return degrees(asin(-y)) + center_lat, degrees(atan2(x, z)) + center_lon
+
 class Map(Renderable, MarginInterface):
+    _projection: ProjectionContext|None = None
+
     def __init__(self, screen: Screen, center: Coordinate = Coordinate(0, 0), scale: Scale = Scale(10000), margin=(0,0,0,0), eventHandler=None, moveable=True):
         MarginInterface.__init__(self, screen, margin)
 
@@ -24,6 +45,7 @@ class Map(Renderable, MarginInterface):
 
         self._scale = Scale(scale)
         self._entities = {0:[]}
+        self._static_entities = {}
         self.center = center
         self.lock = RLock()
         self.hash_lock = RLock()
@@ -63,6 +85,15 @@ class Map(Renderable, MarginInterface):
         
         self.surface = pygame.Surface(self.get_size())
 
+        self.tile_size = DEFAULT_TILE_SIZE
+        self.tile_cache = TileCache()
+        self._anchor: tuple[float,float]|None = None
+        self._anchor_scale = None
+        self._static_raster: pygame.Surface|None = None
+        self._static_layer = None
+        self._static_origin = (0,0)
+        self._static_holes: set[tuple[int,int]] = set()
+
         with self.hash_lock:
             self.__hash_cache = None
 
@@ -92,6 +123,7 @@ class Map(Renderable, MarginInterface):
     def render(self, surface):
         self.surface.fill(self.backgroundColor)
 
+        self.render_static()
         self.render_entities()
 
         if self._screen.show_debug:
@@ -105,6 +137,10 @@ class Map(Renderable, MarginInterface):
             scale_print = self.default_font.render(f"Mouse Coordinates: Latitude: {mouse_coord.latitude}, Longitude: {mouse_coord.longitude}", True, (220,220,255))
             self.surface.blit(scale_print,(0,30))
 
+            if self._static_entities:
+                tile_print = self.default_font.render(str(self.tile_cache), True, (220,220,255))
+                self.surface.blit(tile_print,(0,45))
+
         surface.blit(self.surface, (self.left,self.top))
 
         self._hitbox.hitbox_location = Vector2(self.left,self.top)
@@ -127,6 +163,167 @@ class Map(Renderable, MarginInterface):
                 render_layer(entities)
                 
 
+    def _tile_origin(self) -> tuple[int,int]:
+        """ Position of the center in the projection of the tiles, moving the anchor if the tiles got too distorted """
+        scale = float(self.scale)
+        center_lat, center_lon = self.center.latitude, self.center.longitude
+        if self._anchor is None or self._anchor_scale != scale:
+            self._anchor = (center_lat, center_lon)
+            self._anchor_scale = scale
+            return 0, 0
+
+        x, y, _ = _project(center_lat, center_lon, *self._anchor)
+        origin = (round(x * scale), round(y * scale))
+
+        # compare where points at the edge of the view end up in the tiles and on the screen
+        half_w, half_h = self.width // 2, self.height // 2
+        for dx, dy in ((-half_w, -half_h), (half_w, -half_h), (-half_w, half_h), (half_w, half_h), (half_w, 0), (0, half_h)):
+            px, py = dx / scale, dy / scale
+            length = hypot(px, py)
+            if length > 0.9:
+                px, py = px * 0.9 / length, py * 0.9 / length
+            qx, qy, _ = _project(*_unproject(px, py, center_lat, center_lon), *self._anchor)
+            if hypot(qx * scale - origin[0] - px * scale, qy * scale - origin[1] - py * scale) > MAX_TILE_DISTORTION:
+                self._anchor = (center_lat, center_lon)
+                return 0, 0
+        return origin
+
+    def _visible_tiles(self, origin: tuple[int,int]) -> list[tuple[int,int]]:
+        """ Indices of the tiles covering the view, the ones in the middle first """
+        size = self.tile_size
+        left = origin[0] - self.width // 2
+        top = origin[1] - self.height // 2
+        tiles = [(tx, ty)
+            for ty in range(floor(top / size), floor((top + self.height - 1) / size) + 1)
+            for tx in range(floor(left / size), floor((left + self.width - 1) / size) + 1)]
+        middle = ((left + self.width / 2) / size - 0.5, (top + self.height / 2) / size - 0.5)
+        tiles.sort(key=lambda t: (t[0] - middle[0])**2 + (t[1] - middle[1])**2)
+        return tiles
+
+    def render_static(self):
+        """ Composites the cached tiles of the static layers, missing tiles are built in the background
+
+            While the map is dragged the raster of the last frame is scrolled by the
+            pan and only the strips that moved into view are composited again.
+        """
+        if not self._static_entities:
+            return
+
+        last_layer = self._static_layer
+        origin = self._tile_origin()
+        scale = self._anchor_scale
+        layer = (scale, self._anchor, self.backgroundColor, self.tile_size)
+        size = self.tile_size
+
+        raster = self._static_raster
+        if raster is None or raster.get_size() != self.surface.get_size():
+            raster = self._static_raster = pygame.Surface(self.surface.get_size())
+            last_layer = None
+
+        strips = None
+        if self.mapDragged and last_layer is not None:
+            if last_layer == layer:
+                strips = self._scroll_static(self._static_origin[0] - origin[0], self._static_origin[1] - origin[1])
+            elif last_layer[0] == scale and last_layer[2:] == layer[2:]:
+                # the anchor moved, keep showing the old tiles until the new ones are ready
+                x, y, _ = _project(self.center.latitude, self.center.longitude, *last_layer[1])
+                strips = self._scroll_static(self._static_origin[0] - round(x * scale), self._static_origin[1] - round(y * scale))
+                if strips is not None:
+                    self._static_holes = set(self._visible_tiles(origin))
+        if strips is None:
+            raster.fill(self.backgroundColor)
+            strips = [raster.get_rect()]
+            self._static_holes = set()
+
+        left = self.width // 2 - origin[0]
+        top = self.height // 2 - origin[1]
+        with self.lock:
+            entities = tuple(entity for layer in self._static_entities.values() for entity in layer)
+
+        holes = self._static_holes
+        visible = self._visible_tiles(origin)
+        keys = []
+        for index in visible:
+            tx, ty = index
+            key = (*layer, tx, ty)
+            keys.append(key)
+            rect = pygame.Rect(left + tx * size, top + ty * size, size, size)
+            exposed = [rect.clip(strip) for strip in strips if rect.colliderect(strip)]
+            if not exposed and index not in holes:
+                continue
+
+            build = lambda key=key: self._build_tile(entities, *key)
+            tile = self.tile_cache.get(key, build)
+            if tile is None:
+                holes.add(index)
+            elif index in holes:
+                raster.blit(tile, rect)
+                holes.discard(index)
+            else:
+                for area in exposed:
+                    raster.blit(tile, area, area.move(-rect.x, -rect.y))
+        holes.intersection_update(visible)
+        self.tile_cache.cancel_except(keys)
+
+        self._static_layer = layer
+        self._static_origin = origin
+        self.surface.blit(raster, (0,0))
+
+    def _scroll_static(self, dx: int, dy: int) -> list[pygame.Rect]|None:
+        """ Moves the static raster by (dx, dy) and returns the strips that moved into view """
+        raster = self._static_raster
+        width, height = raster.get_size()
+        if abs(dx) >= width or abs(dy) >= height:
+            return None
+
+        raster.scroll(dx, dy)
+        strips = []
+        if dx > 0:
+            strips.append(pygame.Rect(0, 0, dx, height))
+        elif dx < 0:
+            strips.append(pygame.Rect(width + dx, 0, -dx, height))
+        if dy > 0:
+            strips.append(pygame.Rect(0, 0, width, dy))
+        elif dy < 0:
+            strips.append(pygame.Rect(0, height + dy, width, -dy))
+        for strip in strips:
+            raster.fill(self.backgroundColor, strip)
+        return strips
+
+    def _build_tile(self, entities: tuple, scale: float, anchor: tuple[float,float], background, size: int, tx: int, ty: int) -> pygame.Surface:
+        tile = pygame.Surface((size, size))
+        tile.fill(background)
+        view = _TileView(self, Coordinate(*anchor), Scale(scale), tile, (tx * size, ty * size))
+        for entity in entities:
+            entity.render(view)
+        return tile
+
+    def add_static_entity(self, *entities: DynamicEntity, z_index: int = 0):
+        """ Adds entities that only change with the projection
+
+            They are rendered into cached tiles by a worker thread, below the
+            entities added with add_entity. Call invalidate_static when their data changes.
+        """
+        with self.lock:
+            if z_index < 0:
+                raise Exception("Z-Index must be positive")
+            self._static_entities.setdefault(z_index, []).extend(entities)
+            self._static_entities = dict(sorted(self._static_entities.items()))
+        self.invalidate_static()
+
+    def remove_static_entity(self, *entities: DynamicEntity):
+        with self.lock:
+            for layer in self._static_entities.values():
+                for entity in entities:
+                    if entity in layer:
+                        layer.remove(entity)
+        self.invalidate_static()
+
+    def invalidate_static(self):
+        """ Drops the tiles of the static layers """
+        self._static_layer = None
+        self.tile_cache.clear()
+
     def add_entity(self, *entities: DynamicEntity, z_index: int = 0):
         with self.lock:
             if z_index < 0:
@@ -139,6 +336,24 @@ class Map(Renderable, MarginInterface):
             for entity in entities:
                 self._entities[z_index].append(entity)
 
+    @property
+    def projection(self) -> ProjectionContext:
+        """ Snapshot of the current view, a new generation whenever center, scale or size changed """
+        center = self.center
+        view = (float(center.latitude), float(center.longitude), float(self._scale), self.width, self.height)
+        context = self._projection
+        if context is None or context.view != view:
+            context = self._projection = ProjectionContext.create(view[:2], view[2], view[3:])
+        return context
+
+    def project(self, latitude, longitude):
+        """ Screen positions of arrays of latitudes and longitudes, see pyscreen.core.projection.project """
+        return self.projection.project(latitude, longitude)
+
+    def unproject(self, x, y):
+        """ Latitudes and longitudes of arrays of screen positions """
+        return self.projection.unproject(x, y)
+
     def resize(self, size:tuple|None=None):
         if size is None:
             size = self.get_size()
@@ -153,6 +368,9 @@ class Map(Renderable, MarginInterface):
 
         return (width, height)
 
+    def get_rect(self) -> pygame.Rect:
+        return pygame.Rect((self.left, self.top), self.get_size())
+
     def scrollUp(self, e):
         if self.moveable:
             width, height = self.get_size()
@@ -162,7 +380,7 @@ class Map(Renderable, MarginInterface):
             deviation = (c_pos - e_pos) / 2
             dev_coord = self.__CoordinatefromVector2(deviation, scale=self.scale)
 
-            self._scale = Scale( self._scale * 1.2 )
+            self._scale = Scale( self._scale * 1.2 ** getattr(e, "steps", 1) )
 
             self.center.longitude -= dev_coord.longitude
             self.center.latitude -= dev_coord.latitude
@@ -173,7 +391,7 @@ class Map(Renderable, MarginInterface):
 
     def scrollDown(self, e):
         if self.moveable:
-            self._scale = Scale( self._scale / 1.2 )
+            self._scale = Scale( self._scale / 1.2 ** getattr(e, "steps", 1) )
             with self.hash_lock:
                 self.__hash_cache = None
 
@@ -227,4 +445,38 @@ class Map(Renderable, MarginInterface):
         if center is None:
             center = Coordinate(0,0)
 
-        return Coordinate.fromVector2(vector, scale, center)
\ No newline at end of file
+        return Coordinate.fromVector2(vector, scale, center)
+
+
+class _TileView(Map):
+    """ Stands in for the map while a static layer is rendered into one tile
+
+        The tile at (x, y) of the projection around center sees the center at
+        (-x, -y), width and height are chosen so toVector2 lands there.
+    """
+
+    def __init__(self, gamemap: Map, center: Coordinate, scale: Scale, surface: pygame.Surface, position: tuple[int,int]):
+        self._scale = scale
+        self.center = center
+        self.surface = surface
+        self._position = position
+        self._screen = gamemap.screen
+        self.default_font = gamemap.default_font
+        self.backgroundColor = gamemap.backgroundColor
+
+    @property
+    def width(self):
+        return -2 * self._position[0]
+
+    @property
+    def height(self):
+        return -2 * self._position[1]
+
+    def get_size(self):
+        return self.surface.get_size()
+
+    def get_rect(self) -> pygame.Rect:
+        return self.surface.get_rect()
+
+    def __hash__(self) -> int:
+        return hash((self._scale, self.center, self._position))
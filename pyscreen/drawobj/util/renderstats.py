@@ -1,15 +1,18 @@
-def blit_text(surface, text, pos, font):
-    lines = text.splitlines() 
-    space = font.size(' ')[0]
-    max_width, max_height = surface.get_size()
+def text_lines(text, pos, font):
+    """ Surfaces and positions of the lines of text as blit_text draws them """
+    lines = []
     x, y = pos
-    for line in lines:
+    for line in text.splitlines():
         line_surface = font.render(line, 1, (255,255,255), (0,0,0))
         _, line_height = line_surface.get_size()
-        y += line_height  
-        surface.blit(line_surface, (x, y))
+        y += line_height
+        lines.append((line_surface, (x, y)))
+    return lines
 
-def render_stats(surface, pos, font, obj, tabs = 0):
+def blit_text(surface, text, pos, font):
+    surface.blits(text_lines(text, pos, font))
+
+def stats_text(obj, tabs = 0):
     text = ""
     for name, data in obj.render_stats.items():
         line = "    "*tabs
@@ -19,8 +22,12 @@ def render_stats(surface, pos, font, obj, tabs = 0):
             line += f"{name}: {data['time'].microseconds}us"
         text += line + "\n"
         if hasattr(data["obj"], "render_stats"):
-            text += render_stats(surface, pos, font, data["obj"], tabs+1 )
+            text += stats_text(data["obj"], tabs+1)
+    return text
+
+def render_stats(surface, pos, font, obj, tabs = 0):
+    text = stats_text(obj, tabs)
     if tabs == 0:
         blit_text(surface, text, pos, font)
     else:
-        return text
\ No newline at end of file
+        return text
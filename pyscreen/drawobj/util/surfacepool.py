@@ -0,0 +1,148 @@
+from collections import OrderedDict
+from threading import Lock
+
+from pygame import Surface, SRCALPHA
+
+# Upper bounds for the surfaces kept in the pool while nobody uses them
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_MAX_SURFACES = 256
+
+
+def _key(size, flags: int, depth: int) -> tuple:
+    return (int(size[0]), int(size[1]), flags & SRCALPHA, depth)
+
+
+def _nbytes(surface: Surface) -> int:
+    w, h = surface.get_size()
+    return w * h * surface.get_bytesize()
+
+
+class PoolStats:
+    """ Hit/miss statistics of a SurfacePool """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.hits = 0
+        self.misses = 0
+        self.reuses = 0
+        self.evictions = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        if total == 0:
+            return 0.0
+        return self.hits / total
+
+    def as_dict(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "reuses": self.reuses,
+            "evictions": self.evictions,
+            "hit_rate": self.hit_rate,
+        }
+
+
+class SurfacePool:
+    """ Free surfaces keyed by (width, height, flags, depth)
+
+        Surfaces handed back with `release` are kept for the next `acquire` of the same
+        key. Only free surfaces count against the caps, the least recently released ones
+        are evicted first.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, max_surfaces: int = DEFAULT_MAX_SURFACES):
+        if max_bytes < 0 or max_surfaces < 0:
+            raise ValueError("pool limits cannot be negative")
+        self.max_bytes = max_bytes
+        self.max_surfaces = max_surfaces
+        self.stats = PoolStats()
+        self._lock = Lock()
+        self._free: dict[tuple, list[Surface]] = {}
+        self._lru: OrderedDict[int, tuple[tuple, Surface]] = OrderedDict()
+        self._bytes = 0
+
+    def __len__(self):
+        return len(self._lru)
+
+    @property
+    def nbytes(self) -> int:
+        """ Memory held by the free surfaces """
+        return self._bytes
+
+    def acquire(self, size, flags: int = SRCALPHA, depth: int = 32) -> Surface:
+        """ Returns a cleared surface of the given size """
+        key = _key(size, flags, depth)
+        with self._lock:
+            free = self._free.get(key)
+            if free:
+                surface = free.pop()
+                if not free:
+                    del self._free[key]
+                del self._lru[id(surface)]
+                self._bytes -= _nbytes(surface)
+                self.stats.hits += 1
+            else:
+                surface = None
+                self.stats.misses += 1
+
+        if surface is None:
+            return Surface(key[:2], key[2], depth)
+        surface.fill((0,0,0,0))
+        return surface
+
+    def release(self, surface: Surface|None):
+        """ Hands a surface back to the pool, it must not be used afterwards """
+        if surface is None:
+            return
+        key = _key(surface.get_size(), surface.get_flags(), surface.get_bitsize())
+        nbytes = _nbytes(surface)
+        if nbytes > self.max_bytes or self.max_surfaces == 0:
+            return
+
+        with self._lock:
+            if id(surface) in self._lru:
+                return
+            self._free.setdefault(key, []).append(surface)
+            self._lru[id(surface)] = (key, surface)
+            self._bytes += nbytes
+
+            while self._bytes > self.max_bytes or len(self._lru) > self.max_surfaces:
+                self._evict()
+
+    def _evict(self):
+        _, (key, surface) = self._lru.popitem(last=False)
+        free = self._free[key]
+        free.remove(surface)
+        if not free:
+            del self._free[key]
+        self._bytes -= _nbytes(surface)
+        self.stats.evictions += 1
+
+    def reuse(self, surface: Surface|None, size, flags: int = SRCALPHA, depth: int = 32) -> Surface:
+        """ Clears and returns surface if it already has the requested size and format,
+            otherwise releases it and acquires a matching one """
+        if surface is not None:
+            if _key(surface.get_size(), surface.get_flags(), surface.get_bitsize()) == _key(size, flags, depth):
+                surface.fill((0,0,0,0))
+                self.stats.reuses += 1
+                return surface
+            self.release(surface)
+        return self.acquire(size, flags, depth)
+
+    def clear(self):
+        with self._lock:
+            self._free.clear()
+            self._lru.clear()
+            self._bytes = 0
+
+    def __str__(self):
+        return (f"surfaces: {self.stats.hits} hits, {self.stats.misses} misses, {self.stats.reuses} reused "
+                f"({self.stats.hit_rate*100:.0f}%), pooled {len(self)} / {self._bytes / 1024 / 1024:.1f}MB, "
+                f"evicted {self.stats.evictions}")
+
+
+surface_pool = SurfacePool()
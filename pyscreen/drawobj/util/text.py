@@ -1,6 +1,8 @@
 from pygame import Surface
 from pygame.font import Font
 
+from .textcache import text_cache
+
 class _line:
     def __init__(self, line: str):
         self.line: str = line
@@ -10,16 +12,20 @@ class _line:
 
     def render(self, font: Font, color: tuple, background: tuple|None = None, antialias:bool = True, width: int|None = None, surface_flags:int = 0):
         if width is None:
-            return font.render(self.line, antialias, color, background)
+            return text_cache.render(font, self.line, antialias, color, background)
+
+        key = (font, self.line, tuple(color), background and tuple(background), antialias, width, surface_flags)
+        return text_cache.get(key, lambda: self._wrap(font, color, background, antialias, width, surface_flags))
 
+    def _wrap(self, font: Font, color: tuple, background: tuple|None, antialias:bool, width: int, surface_flags:int):
         surfaces = []
         x = 0
         y = 0
         h = 0
-        gap = font.size(' ')[0]
+        gap = text_cache.size(font, ' ')[0]
 
         for word in self.words():
-            s = font.render(word, antialias, color, background)
+            s = text_cache.render(font, word, antialias, color, background)
             size_x, size_y = s.get_size()
 
             if x + size_x > width:
@@ -44,6 +50,12 @@ class _line:
 
 
 def text(text: str, font: Font, color: tuple, background: tuple|None=None, width=None, antialias:bool = True, surface_flags:int=0, nl_gap:int=0):
+    """ Renders text, wrapped at width if given. The result is cached and must not be drawn on """
+    key = (font, text, tuple(color), background and tuple(background), antialias, width, surface_flags, nl_gap)
+    return text_cache.get(key, lambda: _text(text, font, color, background, width, antialias, surface_flags, nl_gap))
+
+
+def _text(text: str, font: Font, color: tuple, background: tuple|None, width, antialias:bool, surface_flags:int, nl_gap:int):
     lines = [_line(l) for l in text.splitlines()] 
 
     surfaces = []
@@ -66,4 +78,4 @@ def text(text: str, font: Font, color: tuple, background: tuple|None=None, width
     for s in surfaces:
         surf.blit(s['surface'], (s['x'], s['y']))
     
-    return surf
\ No newline at end of file
+    return surf
@@ -0,0 +1,359 @@
+from collections import deque
+
+# Maximum number of characters stored in one leaf of the rope
+LEAF_SIZE = 512
+# Number of edits a TextBuffer remembers for TextLayout.sync
+EDIT_LOG_SIZE = 64
+
+
+class _Leaf:
+    __slots__ = ("text", "length", "newlines", "height")
+
+    def __init__(self, text: str):
+        self.text = text
+        self.length = len(text)
+        self.newlines = text.count("\n")
+        self.height = 0
+
+
+class _Node:
+    __slots__ = ("left", "right", "length", "newlines", "height")
+
+    def __init__(self, left, right):
+        self.left = left
+        self.right = right
+        self.length = left.length + right.length
+        self.newlines = left.newlines + right.newlines
+        self.height = max(left.height, right.height) + 1
+
+
+def _rotate_right(node: _Node) -> _Node:
+    left = node.left
+    return _Node(left.left, _Node(left.right, node.right))
+
+
+def _rotate_left(node: _Node) -> _Node:
+    right = node.right
+    return _Node(_Node(node.left, right.left), right.right)
+
+
+def _balance(node: _Node) -> _Node:
+    diff = node.left.height - node.right.height
+    if diff > 1:
+        if node.left.left.height < node.left.right.height:
+            node = _Node(_rotate_left(node.left), node.right)
+        return _rotate_right(node)
+    if diff < -1:
+        if node.right.right.height < node.right.left.height:
+            node = _Node(node.left, _rotate_right(node.right))
+        return _rotate_left(node)
+    return node
+
+
+def _join(a, b):
+    """ Concatenates two ropes, keeping the result balanced """
+    if a is None or a.length == 0:
+        return b
+    if b is None or b.length == 0:
+        return a
+    if a.height == 0 and b.height == 0 and a.length + b.length <= LEAF_SIZE:
+        return _Leaf(a.text + b.text)
+    # small pieces are pushed down to the neighbouring leaf so typing does not fragment the rope
+    if a.height > b.height + 1 or (b.height == 0 and a.height > 0):
+        return _balance(_Node(a.left, _join(a.right, b)))
+    if b.height > a.height + 1 or (a.height == 0 and b.height > 0):
+        return _balance(_Node(_join(a, b.left), b.right))
+    return _Node(a, b)
+
+
+def _split(node, i: int):
+    """ Splits a rope into the first i characters and the rest """
+    if node is None:
+        return None, None
+    if i <= 0:
+        return None, node
+    if i >= node.length:
+        return node, None
+    if node.height == 0:
+        return _Leaf(node.text[:i]), _Leaf(node.text[i:])
+    if i <= node.left.length:
+        l, r = _split(node.left, i)
+        return l, _join(r, node.right)
+    l, r = _split(node.right, i - node.left.length)
+    return _join(node.left, l), r
+
+
+def _build(text: str):
+    leaves = [_Leaf(text[i:i+LEAF_SIZE]) for i in range(0, len(text), LEAF_SIZE)]
+    if not leaves:
+        return None
+    while len(leaves) > 1:
+        paired = [_Node(leaves[i], leaves[i+1]) for i in range(0, len(leaves) - 1, 2)]
+        if len(leaves) & 1:
+            paired.append(leaves[-1])
+        leaves = paired
+    return leaves[0]
+
+
+def _collect(node, start: int, end: int, out: list[str]):
+    if node is None or start >= end:
+        return
+    if node.height == 0:
+        out.append(node.text[start:end])
+        return
+    ll = node.left.length
+    if start < ll:
+        _collect(node.left, start, min(end, ll), out)
+    if end > ll:
+        _collect(node.right, max(start - ll, 0), end - ll, out)
+
+
+def _line_start(node, line: int) -> int:
+    """ Offset of the character after the line-th newline """
+    offset = 0
+    while node.height != 0:
+        if line <= node.left.newlines:
+            node = node.left
+        else:
+            line -= node.left.newlines
+            offset += node.left.length
+            node = node.right
+    i = -1
+    for _ in range(line):
+        i = node.text.index("\n", i + 1)
+    return offset + i + 1
+
+
+def _newlines_before(node, pos: int) -> int:
+    count = 0
+    while node is not None and node.height != 0:
+        if pos <= node.left.length:
+            node = node.left
+        else:
+            pos -= node.left.length
+            count += node.left.newlines
+            node = node.right
+    if node is not None:
+        count += node.text.count("\n", 0, pos)
+    return count
+
+
+class TextBuffer:
+    """ Editable text stored in a balanced rope
+
+        Inserts, deletes and line lookups walk the tree and take O(log n) instead of
+        copying the whole text. The buffer holds a cursor and an optional selection,
+        edits at the cursor replace the selection.
+    """
+
+    def __init__(self, text: str = "", max_length: int|None = None):
+        self.max_length = max_length
+        self._root = None
+        self._cursor = 0
+        self._anchor: int|None = None
+        self._text: str|None = None
+        self.version = 0
+        self._edits: deque[tuple[int, int, int, int]] = deque(maxlen=EDIT_LOG_SIZE)
+        self.text = text
+
+    def __len__(self):
+        return 0 if self._root is None else self._root.length
+
+    def __str__(self):
+        return self.text
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            self._text = self[0:len(self)]
+        return self._text
+
+    @text.setter
+    def text(self, value: str):
+        if self.max_length is not None:
+            value = value[:self.max_length]
+        old_lines = self.line_count
+        self._root = _build(value)
+        self._text = value
+        self._cursor = len(value)
+        self._anchor = None
+        self._record(0, old_lines, self.line_count)
+
+    def __getitem__(self, key: slice|int) -> str:
+        n = len(self)
+        if isinstance(key, int):
+            if key < 0:
+                key += n
+            if not 0 <= key < n:
+                raise IndexError("buffer index out of range")
+            key = slice(key, key + 1)
+        start, end, step = key.indices(n)
+        if step != 1:
+            raise ValueError("slices of a buffer cannot have a step")
+        if start == 0 and end == n and self._text is not None:
+            return self._text
+        out = []
+        _collect(self._root, start, end, out)
+        return "".join(out)
+
+    def _record(self, line: int, removed: int, inserted: int):
+        self.version += 1
+        self._edits.append((self.version, line, removed, inserted))
+
+    def changes_since(self, version: int) -> list[tuple[int,int,int]]|None:
+        """ Returns the (line, removed lines, inserted lines) edits after version,
+            None if they are no longer known """
+        if version == self.version:
+            return []
+        if not self._edits or self._edits[0][0] > version + 1:
+            return None
+        return [edit[1:] for edit in self._edits if edit[0] > version]
+
+    # Lines
+
+    @property
+    def line_count(self) -> int:
+        return 1 if self._root is None else self._root.newlines + 1
+
+    def line_start(self, line: int) -> int:
+        if line <= 0 or self._root is None:
+            return 0
+        if line >= self.line_count:
+            return len(self)
+        return _line_start(self._root, line)
+
+    def line_end(self, line: int) -> int:
+        """ Offset of the newline ending line, or the end of the text """
+        if line + 1 >= self.line_count:
+            return len(self)
+        return self.line_start(line + 1) - 1
+
+    def line(self, line: int) -> str:
+        return self[self.line_start(line):self.line_end(line)]
+
+    def lines(self, start: int = 0, end: int|None = None) -> list[str]:
+        if end is None:
+            end = self.line_count
+        if start >= end:
+            return []
+        return self[self.line_start(start):self.line_end(end - 1)].split("\n")
+
+    def line_of(self, pos: int) -> tuple[int,int]:
+        """ Returns the line and column of pos """
+        pos = max(0, min(pos, len(self)))
+        line = _newlines_before(self._root, pos)
+        return line, pos - self.line_start(line)
+
+    def position(self, line: int, column: int) -> int:
+        """ Offset of column in line, clamped to the line """
+        start = self.line_start(line)
+        return start + max(0, min(column, self.line_end(line) - start))
+
+    # Editing
+
+    def insert_at(self, pos: int, text: str) -> int:
+        """ Inserts text at pos and returns the number of inserted characters """
+        if self.max_length is not None:
+            text = text[:max(self.max_length - len(self), 0)]
+        if not text:
+            return 0
+        pos = max(0, min(pos, len(self)))
+        line = _newlines_before(self._root, pos)
+        l, r = _split(self._root, pos)
+        self._root = _join(_join(l, _build(text)), r)
+        self._text = None
+        self._record(line, 1, text.count("\n") + 1)
+        return len(text)
+
+    def delete_range(self, start: int, end: int) -> str:
+        """ Removes and returns the text between start and end """
+        start = max(0, start)
+        end = min(end, len(self))
+        if start >= end:
+            return ""
+        l, r = _split(self._root, end)
+        l, removed = _split(l, start)
+        self._root = _join(l, r)
+        self._text = None
+        text = self._text_of(removed)
+        self._record(_newlines_before(self._root, start), text.count("\n") + 1, 1)
+        return text
+
+    @staticmethod
+    def _text_of(node) -> str:
+        out = []
+        if node is not None:
+            _collect(node, 0, node.length, out)
+        return "".join(out)
+
+    # Cursor and selection
+
+    @property
+    def cursor(self) -> int:
+        return self._cursor
+
+    @cursor.setter
+    def cursor(self, value: int):
+        self._cursor = max(0, min(value, len(self)))
+        self._anchor = None
+
+    @property
+    def selection(self) -> tuple[int,int]|None:
+        """ (start, end) of the selection or None """
+        if self._anchor is None or self._anchor == self._cursor:
+            return None
+        return min(self._anchor, self._cursor), max(self._anchor, self._cursor)
+
+    def select(self, start: int, end: int):
+        """ Selects [start, end), the cursor is placed at end """
+        n = len(self)
+        self._anchor = max(0, min(start, n))
+        self._cursor = max(0, min(end, n))
+
+    def clear_selection(self):
+        self._anchor = None
+
+    @property
+    def selected_text(self) -> str:
+        selection = self.selection
+        if selection is None:
+            return ""
+        return self[selection[0]:selection[1]]
+
+    def move_cursor(self, delta: int, select: bool = False):
+        if select and self._anchor is None:
+            self._anchor = self._cursor
+        elif not select:
+            self._anchor = None
+        self._cursor = max(0, min(self._cursor + delta, len(self)))
+
+    def move_line(self, delta: int, select: bool = False):
+        """ Moves the cursor delta lines up or down, keeping its column if possible """
+        line, column = self.line_of(self._cursor)
+        line = max(0, min(line + delta, self.line_count - 1))
+        self.move_cursor(self.position(line, column) - self._cursor, select)
+
+    def delete_selection(self) -> bool:
+        selection = self.selection
+        if selection is None:
+            return False
+        self.delete_range(*selection)
+        self._cursor = selection[0]
+        self._anchor = None
+        return True
+
+    def insert(self, text: str):
+        """ Inserts text at the cursor, replacing the selection """
+        self.delete_selection()
+        self._cursor += self.insert_at(self._cursor, text)
+
+    def backspace(self):
+        """ Deletes the selection or the character before the cursor """
+        if not self.delete_selection() and self._cursor > 0:
+            self.delete_range(self._cursor - 1, self._cursor)
+            self._cursor -= 1
+
+    def delete(self):
+        """ Deletes the selection or the character after the cursor """
+        if not self.delete_selection():
+            self.delete_range(self._cursor, self._cursor + 1)
@@ -0,0 +1,136 @@
+from collections import OrderedDict
+from threading import Lock
+from typing import Callable
+
+from pygame import Surface
+from pygame.font import Font
+
+# Limits of the rendered text runs kept by the default cache
+DEFAULT_MAX_ENTRIES = 2048
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+DEFAULT_MAX_MEASUREMENTS = 8192
+
+
+def _color(color):
+    if color is None:
+        return None
+    return tuple(color)
+
+
+def _nbytes(surface: Surface) -> int:
+    w, h = surface.get_size()
+    return w * h * surface.get_bytesize()
+
+
+class CacheStats:
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        if total == 0:
+            return 0.0
+        return self.hits / total
+
+    def as_dict(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hit_rate,
+        }
+
+
+class TextCache:
+    """ LRU cache of rendered text runs and text measurements
+
+        Surfaces returned by the cache are shared and must not be drawn on.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: int = DEFAULT_MAX_BYTES,
+                 max_measurements: int = DEFAULT_MAX_MEASUREMENTS):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_measurements = max_measurements
+        self.stats = CacheStats()
+        self.size_stats = CacheStats()
+        self._lock = Lock()
+        self._surfaces: OrderedDict[tuple, Surface] = OrderedDict()
+        self._sizes: OrderedDict[tuple, tuple[int,int]] = OrderedDict()
+        self._bytes = 0
+
+    def __len__(self):
+        return len(self._surfaces)
+
+    @property
+    def nbytes(self) -> int:
+        return self._bytes
+
+    def get(self, key: tuple, create: Callable[[], Surface]) -> Surface:
+        """ Returns the surface cached for key, create is called on a miss """
+        with self._lock:
+            surface = self._surfaces.get(key)
+            if surface is not None:
+                self._surfaces.move_to_end(key)
+                self.stats.hits += 1
+                return surface
+            self.stats.misses += 1
+
+        surface = create()
+
+        with self._lock:
+            if key not in self._surfaces:
+                self._surfaces[key] = surface
+                self._bytes += _nbytes(surface)
+                while self._surfaces and (len(self._surfaces) > self.max_entries or self._bytes > self.max_bytes):
+                    _, evicted = self._surfaces.popitem(last=False)
+                    self._bytes -= _nbytes(evicted)
+                    self.stats.evictions += 1
+        return surface
+
+    def render(self, font: Font, text: str, antialias: bool, color, background=None) -> Surface:
+        """ Cached font.render """
+        color = _color(color)
+        background = _color(background)
+        key = (font, text, color, background, antialias)
+        return self.get(key, lambda: font.render(text, antialias, color, background))
+
+    def size(self, font: Font, text: str) -> tuple[int,int]:
+        """ Cached font.size """
+        key = (font, text)
+        with self._lock:
+            size = self._sizes.get(key)
+            if size is not None:
+                self._sizes.move_to_end(key)
+                self.size_stats.hits += 1
+                return size
+            self.size_stats.misses += 1
+
+        size = font.size(text)
+
+        with self._lock:
+            self._sizes[key] = size
+            if len(self._sizes) > self.max_measurements:
+                self._sizes.popitem(last=False)
+                self.size_stats.evictions += 1
+        return size
+
+    def clear(self):
+        with self._lock:
+            self._surfaces.clear()
+            self._sizes.clear()
+            self._bytes = 0
+
+    def __str__(self):
+        return (f"text: {self.stats.hits} hits, {self.stats.misses} misses ({self.stats.hit_rate*100:.0f}%), "
+                f"{len(self)} runs / {self._bytes / 1024 / 1024:.1f}MB, "
+                f"size: {self.size_stats.hit_rate*100:.0f}% hits")
+
+
+text_cache = TextCache()
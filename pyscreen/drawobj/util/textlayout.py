@@ -0,0 +1,280 @@
+from bisect import bisect_right
+from itertools import accumulate
+
+from pygame import Surface
+from pygame.font import Font
+
+from .textbuffer import TextBuffer
+from .textcache import text_cache
+
+
+class _Paragraph:
+    __slots__ = ("text", "lines", "width", "natural_width")
+
+    def __init__(self, text: str):
+        self.text = text
+        self.lines: list[str]|None = None
+        self.width = 0
+        self.natural_width: int|None = None
+
+
+class LayoutStats:
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.layouts = 0
+        self.reused = 0
+        self.rendered_lines = 0
+
+    def as_dict(self) -> dict:
+        return {
+            "layouts": self.layouts,
+            "reused": self.reused,
+            "rendered_lines": self.rendered_lines,
+        }
+
+
+class TextLayout:
+    """ Word-wrapped line boxes of a text, kept per paragraph
+
+        Setting the text only lays out the paragraphs that changed, the common
+        leading and trailing paragraphs keep their line boxes. A TextBuffer can be
+        followed with sync, which replays its edits instead of comparing the text.
+        Rendering only draws the lines that intersect the requested area.
+    """
+
+    def __init__(self, font: Font, width: int|None = None, nl_gap: int = 0):
+        self._font = font
+        self._width = width
+        self.nl_gap = nl_gap
+        self.stats = LayoutStats()
+        self._text = ""
+        self._paragraphs: list[_Paragraph] = [_Paragraph("")]
+        self._tops: list[int]|None = None
+        self._buffer: TextBuffer|None = None
+        self._version = -1
+        self._natural_width: int|None = None
+
+    @property
+    def font(self) -> Font:
+        return self._font
+
+    @font.setter
+    def font(self, value: Font):
+        if value is not self._font:
+            self._font = value
+            self.invalidate()
+            for p in self._paragraphs:
+                p.natural_width = None
+            self._natural_width = None
+
+    @property
+    def width(self) -> int|None:
+        return self._width
+
+    @width.setter
+    def width(self, value: int|None):
+        if value != self._width:
+            self._width = value
+            self.invalidate()
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            self._text = "\n".join(p.text for p in self._paragraphs)
+        return self._text
+
+    @text.setter
+    def text(self, value: str):
+        if value is self._text or value == self._text:
+            return
+        self._text = value
+        self._buffer = None
+
+        old = self._paragraphs
+        new = value.split("\n")
+
+        # keep the unchanged paragraphs at the start and the end
+        n = min(len(old), len(new))
+        start = 0
+        while start < n and old[start].text == new[start]:
+            start += 1
+        end = 0
+        while end < n - start and old[-1-end].text == new[-1-end]:
+            end += 1
+
+        added = [_Paragraph(t) for t in new[start:len(new)-end]]
+        self._replaced(old[start:len(old)-end], added)
+        self._paragraphs = old[:start] + added + old[len(old)-end:]
+        self.stats.reused += start + end
+        self._tops = None
+
+    def sync(self, buffer: TextBuffer):
+        """ Follows the edits of buffer, only the edited lines are laid out again """
+        changes = buffer.changes_since(self._version) if buffer is self._buffer else None
+        self._buffer = buffer
+        self._version = buffer.version
+        self._text = None
+        self._tops = None
+        if changes is None:
+            self._paragraphs = [_Paragraph(line) for line in buffer.lines()]
+            self._natural_width = None
+            return
+        if not changes:
+            return
+        if len(changes) == 1 and changes[0][0] == 0 and changes[0][2] == buffer.line_count:
+            # the whole text was replaced, keep what did not change
+            self.text = buffer.text
+            self._buffer = buffer
+            return
+
+        # replay the edits with placeholders, then fill them from the current text
+        paragraphs = self._paragraphs
+        lo, hi = len(paragraphs), 0
+        removed_paragraphs = []
+        for line, removed, inserted in changes:
+            removed_paragraphs.extend(p for p in paragraphs[line:line+removed] if p is not None)
+            paragraphs[line:line+removed] = [None] * inserted
+            if hi > line:
+                hi = max(hi + inserted - removed, line + inserted)
+            else:
+                hi = line + inserted
+            lo = min(lo, line)
+
+        added = []
+        for i, text in enumerate(buffer.lines(lo, hi), lo):
+            if paragraphs[i] is None:
+                paragraphs[i] = _Paragraph(text)
+                added.append(paragraphs[i])
+            else:
+                self.stats.reused += 1
+        self._replaced(removed_paragraphs, added)
+
+    def _replaced(self, removed: list[_Paragraph], added: list[_Paragraph]):
+        """ Keeps natural_width current when paragraphs are replaced """
+        width = self._natural_width
+        if width is None:
+            return
+        if any(p.natural_width is None or p.natural_width >= width for p in removed):
+            # the widest paragraph may be gone, measure again when asked
+            self._natural_width = None
+            return
+        for p in added:
+            width = max(width, self._measure(p))
+        self._natural_width = width
+
+    def _measure(self, p: _Paragraph) -> int:
+        if p.natural_width is None:
+            p.natural_width = text_cache.size(self._font, p.text)[0]
+        return p.natural_width
+
+    @property
+    def natural_width(self) -> int:
+        """ Width of the widest paragraph without wrapping """
+        if self._natural_width is None:
+            self._natural_width = max(self._measure(p) for p in self._paragraphs)
+        return self._natural_width
+
+    def invalidate(self, index: int|None = None):
+        """ Drops the line boxes of one paragraph or of all paragraphs """
+        paragraphs = self._paragraphs if index is None else (self._paragraphs[index],)
+        for p in paragraphs:
+            p.lines = None
+        self._tops = None
+
+    @property
+    def line_height(self) -> int:
+        return self._font.get_height()
+
+    def _layout(self, p: _Paragraph) -> list[str]:
+        if p.lines is not None:
+            return p.lines
+
+        self.stats.layouts += 1
+        if self._width is None:
+            p.lines = [p.text]
+            p.width = text_cache.size(self._font, p.text)[0]
+            return p.lines
+
+        gap = text_cache.size(self._font, ' ')[0]
+        lines = []
+        line = []
+        x = 0
+        for word in p.text.split(' '):
+            w = text_cache.size(self._font, word)[0]
+            if line and x + w > self._width:
+                lines.append(' '.join(line))
+                line = []
+                x = 0
+            line.append(word)
+            x += w + gap
+        lines.append(' '.join(line))
+
+        p.lines = lines
+        p.width = self._width
+        return lines
+
+    def _paragraph_tops(self) -> list[int]:
+        if self._tops is None:
+            step = self.line_height
+            gap = self.nl_gap
+            heights = [len(self._layout(p)) * step + gap for p in self._paragraphs]
+            self._tops = [0, *accumulate(heights)]
+        return self._tops
+
+    def __len__(self):
+        """ Number of laid out lines """
+        return sum(len(self._layout(p)) for p in self._paragraphs)
+
+    @property
+    def height(self) -> int:
+        tops = self._paragraph_tops()
+        return max(tops[-1] - self.nl_gap, 0)
+
+    @property
+    def content_width(self) -> int:
+        if self._width is not None:
+            return self._width
+        self._paragraph_tops()
+        return max(p.width for p in self._paragraphs)
+
+    def caret(self, paragraph: int, column: int) -> tuple[int,int]:
+        """ Layout position of the character at column of paragraph """
+        tops = self._paragraph_tops()
+        paragraph = max(0, min(paragraph, len(self._paragraphs) - 1))
+        lines = self._paragraphs[paragraph].lines
+        y = tops[paragraph]
+        # wrapped lines are separated by the space they were split at
+        for line in lines[:-1]:
+            if column <= len(line):
+                break
+            column -= len(line) + 1
+            y += self.line_height
+        else:
+            line = lines[-1]
+        return text_cache.size(self._font, line[:column])[0], y
+
+    def lines_in(self, top: int, bottom: int):
+        """ Yields (y, line) of every line that intersects [top, bottom) """
+        tops = self._paragraph_tops()
+        step = self.line_height
+        i = max(bisect_right(tops, top) - 1, 0)
+        while i < len(self._paragraphs) and tops[i] < bottom:
+            y = tops[i]
+            for line in self._paragraphs[i].lines:
+                if y + step > top and y < bottom:
+                    yield y, line
+                y += step
+            i += 1
+
+    def render(self, surface: Surface, color, background=None, antialias: bool = True,
+               position: tuple[int,int] = (0,0), top: int = 0, height: int|None = None):
+        """ Draws the lines in [top, top+height) of the layout at position of surface """
+        if height is None:
+            height = surface.get_height() - position[1]
+        x, y = position
+        for line_y, line in self.lines_in(top, top + height):
+            if line:
+                surface.blit(text_cache.render(self._font, line, antialias, color, background), (x, y + line_y - top))
+            self.stats.rendered_lines += 1
@@ -0,0 +1,159 @@
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import Lock
+from typing import Callable, Iterable
+
+from pygame import Surface
+
+from pyscreen.logging import getLogger
+logger = getLogger()
+
+# Edge length of a tile in pixels
+DEFAULT_TILE_SIZE = 256
+# Memory the rasterised tiles may use
+DEFAULT_MAX_MB = 64
+
+
+def _nbytes(surface: Surface) -> int:
+    w, h = surface.get_size()
+    return w * h * surface.get_bytesize()
+
+
+class TileStats:
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.hits = 0
+        self.misses = 0
+        self.built = 0
+        self.cancelled = 0
+        self.evictions = 0
+        self.build_time = 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        if total == 0:
+            return 0.0
+        return self.hits / total
+
+    def as_dict(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "built": self.built,
+            "cancelled": self.cancelled,
+            "evictions": self.evictions,
+            "build_time": self.build_time,
+            "hit_rate": self.hit_rate,
+        }
+
+
+class TileCache:
+    """ LRU cache of rasterised tiles, missing tiles are built by a worker thread
+
+        get never blocks, a tile that is not ready yet is requested and shows up
+        in a later frame.
+    """
+
+    def __init__(self, max_mb: float = DEFAULT_MAX_MB, workers: int = 1):
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.stats = TileStats()
+        self._lock = Lock()
+        self._tiles: OrderedDict[tuple, Surface] = OrderedDict()
+        self._pending: dict[tuple, Future] = {}
+        self._bytes = 0
+        self._generation = 0
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pyscreen-tiles")
+
+    def __len__(self):
+        return len(self._tiles)
+
+    @property
+    def max_mb(self) -> float:
+        return self.max_bytes / 1024 / 1024
+
+    @max_mb.setter
+    def max_mb(self, value: float):
+        with self._lock:
+            self.max_bytes = int(value * 1024 * 1024)
+            self._evict()
+
+    @property
+    def nbytes(self) -> int:
+        return self._bytes
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def get(self, key: tuple, build: Callable[[], Surface]|None = None) -> Surface|None:
+        """ Returns the tile of key, if it is missing build is queued on the worker """
+        with self._lock:
+            tile = self._tiles.get(key)
+            if tile is not None:
+                self._tiles.move_to_end(key)
+                self.stats.hits += 1
+                return tile
+            self.stats.misses += 1
+            if build is None or key in self._pending:
+                return None
+            generation = self._generation
+            self._pending[key] = self._executor.submit(self._build, key, build, generation)
+        return None
+
+    def _build(self, key: tuple, build: Callable[[], Surface], generation: int):
+        try:
+            from time import perf_counter
+            start = perf_counter()
+            tile = build()
+            elapsed = perf_counter() - start
+        except Exception as e:
+            logger.exception(e)
+            tile = None
+            elapsed = 0.0
+
+        with self._lock:
+            self._pending.pop(key, None)
+            if tile is None or generation != self._generation:
+                return
+            self.stats.built += 1
+            self.stats.build_time += elapsed
+            self._tiles[key] = tile
+            self._bytes += _nbytes(tile)
+            self._evict()
+
+    def _evict(self):
+        while self._tiles and self._bytes > self.max_bytes:
+            _, tile = self._tiles.popitem(last=False)
+            self._bytes -= _nbytes(tile)
+            self.stats.evictions += 1
+
+    def cancel_except(self, keys: Iterable[tuple]):
+        """ Drops the queued builds of tiles that are no longer wanted """
+        keep = set(keys)
+        with self._lock:
+            for key, future in list(self._pending.items()):
+                if key not in keep and future.cancel():
+                    del self._pending[key]
+                    self.stats.cancelled += 1
+
+    def clear(self):
+        """ Drops all tiles, builds that are running are discarded when they finish """
+        with self._lock:
+            self._generation += 1
+            for future in self._pending.values():
+                future.cancel()
+            self._pending.clear()
+            self._tiles.clear()
+            self._bytes = 0
+
+    def shutdown(self):
+        self.clear()
+        self._executor.shutdown(wait=False)
+
+    def __str__(self):
+        return (f"tiles: {self.stats.hits} hits, {self.stats.misses} misses ({self.stats.hit_rate*100:.0f}%), "
+                f"{len(self)} cached / {self._bytes / 1024 / 1024:.1f}MB of {self.max_mb:.0f}MB, "
+                f"{self.pending} pending")
@@ -6,14 +6,16 @@ import threading
 
 
 from pyscreen.core.vector import Vector2
+from pyscreen.spatialindex import HitboxIndex
+from pyscreen.inputqueue import InputQueue
+from pyscreen.timers import TimerScheduler
 import inspect
 import asyncio
 import pygame
 from typing import Callable
 import datetime
-import copy
+from time import monotonic
 from concurrent.futures import ThreadPoolExecutor
-from copy import deepcopy
 
 from pyscreen.logging import getLogger
 logger = getLogger()
@@ -30,6 +32,34 @@ class EventListenerFuture:
         return id(self.func)
 
 
+def _accepts_event(func: Callable) -> bool:
+    try:
+        return len(inspect.signature(func).parameters) == 1
+    except (TypeError, ValueError):
+        # builtins without a signature
+        return True
+
+
+class EventListener:
+    """ Listener record. The calling convention of func is resolved once at registration """
+    __slots__ = ("func", "is_async", "pass_event", "callonce", "key", "key_mods", "futureWrapper")
+
+    def __init__(self, func: Callable, eventtype, once=False, key=None, key_mods:list|None=None):
+        self.func = func
+        self.is_async = inspect.iscoroutinefunction(func)
+        self.pass_event = _accepts_event(func)
+        self.callonce = once
+        self.key = key
+        self.key_mods = key_mods
+        self.futureWrapper = EventListenerFuture(self, eventtype)
+
+    def __call__(self, e):
+        """ Returns the coroutine for async listeners """
+        if self.pass_event:
+            return self.func(e)
+        return self.func()
+
+
 class FocusChange(Exception):...
 class FocusError(TypeError):...
 class TickEvent(object):
@@ -37,27 +67,39 @@ class TickEvent(object):
         self.tick = tick
 
 
-class IntervalEvent(object):
-    def __init__(self, func, interval):
-        self.func = func
-        self.interval = interval
-        self.last = datetime.datetime.now()
-
-    async def __call__(self):
-        if datetime.datetime.now() - self.last >= self.interval:
-            self.last = datetime.datetime.now()
-            if inspect.iscoroutinefunction(self.func):
-                await self.func()
-            else:
-                self.func()
-    
-    @property
-    def id(self):
-        return id(self)
-    
-    def __eq__(self, other):
-        return self.id == other.id
-    
+EVENT_TYPES = (
+    "close",
+    "resize",
+    "keyDown",
+    "keyUp",
+    "scrollDown",
+    "scrollUp",
+    "mouseDown",
+    "mouseUp",
+    "mouseMotion",
+    "mouseClick",
+    "mouseDoubleClick",
+    "fileDrop",
+    "textDrop",
+    "drag",
+    "drop",
+    "tick",
+)
+
+# Events that carry a cursor position and are routed to hitboxes through the hitbox index
+ROUTED_EVENTS = (
+    "mouseDown",
+    "mouseUp",
+    "mouseMotion",
+    "mouseClick",
+    "mouseDoubleClick",
+    "scrollDown",
+    "scrollUp",
+)
+
+
+# Rate of the tick event in Hz
+DEFAULT_TICK_RATE = 60
 
 
 class EventHandler(Thread):
@@ -67,46 +109,6 @@ class EventHandler(Thread):
     mousePosition = Vector2(0,0)
     _tick = 0
 
-    _intervalEvents = {}
-
-    _mouseMotionEvent = None
-    _events = Queue(100)
-    _eventListeners = {
-        "close": [],
-        "resize": [],
-        "keyDown": [],
-        "keyUp": [],
-        "scrollDown": [],
-        "scrollUp": [],
-        "mouseDown": [],
-        "mouseUp": [],
-        "mouseMotion": [],
-        "mouseClick": [],
-        "mouseDoubleClick": [],
-        "fileDrop": [],
-        "textDrop": [],
-        "drag": [],
-        "drop": [],
-        "tick": [],
-    }
-    _focusEventListeners = {
-        "close": [],
-        "resize": [],
-        "keyDown": [],
-        "keyUp": [],
-        "scrollDown": [],
-        "scrollUp": [],
-        "mouseDown": [],
-        "mouseUp": [],
-        "mouseMotion": [],
-        "mouseClick": [],
-        "mouseDoubleClick": [],
-        "fileDrop": [],
-        "textDrop": [],
-        "drag": [],
-        "drop": [],
-        "tick": [],
-    }
     _running = True
 
     lshift_active = False
@@ -130,8 +132,20 @@ class EventHandler(Thread):
     def tick(self):
         return self._tick
 
-    def __init__(self):
+    def __init__(self, tick_rate: float = DEFAULT_TICK_RATE):
+        # Listener tables are copy-on-write: every change replaces the list of the
+        # changed event type and bumps the version. The dispatch tables (tuples)
+        # are only rebuilt when the version differs from the one they were built at.
+        self._listenersLock = threading.Lock()
+        self._eventListeners: dict[str, list] = {eventtype: [] for eventtype in EVENT_TYPES}
+        self._focusEventListeners: dict[str, list] = {eventtype: [] for eventtype in EVENT_TYPES}
+        self._listenersVersion = 0
+        self._dispatchVersion = -1
         self.__update_event_listeners()
+        self.hitboxIndex = HitboxIndex()
+        self.inputQueue = InputQueue()
+        self.timers = TimerScheduler()
+        self._hoveredHitboxes: list = []
         self.skipped_mouse_motion_events = 0
         self.last_mouse_motion_event = None
         self.lock = AsyncRLock()
@@ -141,6 +155,10 @@ class EventHandler(Thread):
         super().__init__(name="EventHandler")
         self.tasks = Queue()
         self.running_tasks = set()
+        self._wakeupCallbacks: list[Callable] = []
+        self.aioloop: asyncio.AbstractEventLoop|None = None
+        self._loopWakeup: asyncio.Event|None = None
+        self.tickRate = tick_rate
         self.start()
 
     def __setattr__(self, name, value):
@@ -150,18 +168,66 @@ class EventHandler(Thread):
             super().__setattr__(name, value)
 
     def enqueueEvent(self, e):
-        self._events.put(e)
+        """ Never blocks, see InputQueue for the coalescing and drop policy """
+        self.inputQueue.put(e)
+        self._wakeup()
 
     def enqueueMouseMotionEvent(self, e):
-        self._mouseMotionEvent = e
+        self.enqueueEvent(e)
+
+    def addWakeupCallback(self, func: Callable):
+        """ func is called (from the enqueueing thread) whenever new input is enqueued """
+        self._wakeupCallbacks.append(func)
+
+    def removeWakeupCallback(self, func: Callable):
+        if func in self._wakeupCallbacks:
+            self._wakeupCallbacks.remove(func)
+
+    @property
+    def tickRate(self) -> float:
+        return self._tickRate
+
+    @tickRate.setter
+    def tickRate(self, value: float):
+        if value <= 0:
+            raise ValueError("tick rate must be positive")
+        self._tickRate = value
+        self._tickInterval = 1 / value
+        self._wakeLoop()
+
+    def _wakeLoop(self):
+        """ Thread-safe: wakes the event loop if it waits for input, tasks or timers """
+        loop = self.aioloop
+        wakeup = self._loopWakeup
+        if loop is None or wakeup is None or loop.is_closed():
+            return
+        if threading.get_ident() == self.threadid:
+            wakeup.set()
+        else:
+            try:
+                loop.call_soon_threadsafe(wakeup.set)
+            except RuntimeError:
+                # loop closed in between
+                pass
+
+    def _wakeup(self):
+        self._wakeLoop()
+        for func in self._wakeupCallbacks:
+            try:
+                func()
+            except Exception as e:
+                logger.exception(e)
 
-    def getEvent(self, check_mouse_motion=False):
-        if check_mouse_motion and self._mouseMotionEvent is not None:
-            event = self._mouseMotionEvent
-            self._mouseMotionEvent = None
-            return event
-        if not self._events.empty():
-            return self._events.get()
+    @property
+    def hasPendingEvents(self):
+        return not self.inputQueue.empty()
+
+    @property
+    def inputStats(self):
+        return self.inputQueue.stats
+
+    def getEvent(self):
+        return self.inputQueue.get()
 
     async def run_tasks(self):
         while not self.tasks.empty():
@@ -185,127 +251,153 @@ class EventHandler(Thread):
             self.running_tasks = unfinished
 
     def run(self):
-        self.aioloop = asyncio.new_event_loop()
+        loop = asyncio.new_event_loop()
         self.threadid = threading.get_ident()
-        asyncio.set_event_loop(self.aioloop)
-        asyncio.run(self.arun())
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(self.arun())
+        finally:
+            self.aioloop = None
+            loop.close()
+
+    def _nextTimeout(self, nextTick: float) -> float:
+        timeout = nextTick - monotonic()
+        timerTimeout = self.timers.timeout()
+        if timerTimeout is not None and timerTimeout < timeout:
+            timeout = timerTimeout
+        return max(timeout, 0)
 
     async def arun(self):
+        """ Sleeps until input, a queued task, a timer or the next tick is due """
+        self._loopWakeup = asyncio.Event()
+        self.aioloop = asyncio.get_running_loop()
+        nextTick = monotonic()
+
         while self._running:
-            event = self.getEvent(True)
+            if not self.hasPendingEvents and self.tasks.empty():
+                try:
+                    await asyncio.wait_for(self._loopWakeup.wait(), self._nextTimeout(nextTick))
+                except asyncio.TimeoutError:
+                    pass
+            self._loopWakeup.clear()
+
             with self.lock:
+                event = self.getEvent()
                 while event is not None:
                     try:
-                        self.__update_event_listeners()
-                        # if self.last_mouse_motion_event is not None:
-                        #     if event.type != pygame.MOUSEMOTION:
-                        #         await self._onMouseMotion(self.last_mouse_motion_event)
-                        #     else:
-                        #         self.skipped_mouse_motion_events += 1
-                        #         if self.skipped_mouse_motion_events > 5:
-                        #             await self._onMouseMotion(self.last_mouse_motion_event)
-
-                        if event.type == pygame.QUIT:
-                            await self._onClose(event)
+                        if not await self.handleEvent(event):
                             break
-
-                        
-                        elif event.type == pygame.WINDOWRESIZED:
-                            await self._onResize(event)
-
-                        elif event.type == pygame.MOUSEMOTION:
-                            self.mousePosition = Vector2(event.pos)
-                            await self._onMouseMotion(event)
-                            #self.last_mouse_motion_event = event
-                            
-
-                        elif event.type == pygame.MOUSEBUTTONDOWN:
-                            if event.button == pygame.BUTTON_WHEELUP:
-                                await self._onScrollUp(event)
-                            elif event.button == pygame.BUTTON_WHEELDOWN:
-                                await self._onScrollDown(event)
-                            elif event.button == pygame.BUTTON_LEFT:
-                                self._last_mouse_down_event = datetime.datetime.now()
-                            await self._onMouseDown(event)
-                        elif event.type == pygame.WINDOWRESIZED:
-                            await self._onResize(event)
-                        elif event.type == pygame.MOUSEBUTTONUP:
-                            if event.button == pygame.BUTTON_LEFT:
-                                if (datetime.datetime.now() - self._last_mouse_down_event).microseconds <= 250000:
-                                    if (datetime.datetime.now() - self._last_mouse_click_event).microseconds <= 250000:
-                                        if (event.pos[0] - self._last_mouse_click_event_pos[0])**2 + (event.pos[1] - self._last_mouse_click_event_pos[1])**2 <= 50:
-                                            # max 7 pixel distance between mouse down and mouse up -> (5*5) + (5*5) = 50 -> sqrt(50) = 7.07 (max distance)
-                                            await self._onMouseDoubleClick(event)
-                                            self._last_mouse_click_event = datetime.datetime(1970,1,1)
-                                        else:
-                                            await self._onMouseClick(event)
-                                            self._last_mouse_click_event = datetime.datetime.now()
-                                            self._last_mouse_click_event_pos = event.pos
-                                    else:
-                                        await self._onMouseClick(event)
-                                        self._last_mouse_click_event = datetime.datetime.now()
-                                        self._last_mouse_click_event_pos = event.pos
-                            await self._onMouseUp(event)
-
-                        elif event.type == pygame.KEYDOWN:
-                            if event.key == pygame.KMOD_LSHIFT:
-                                self.lshift_active = True
-                            elif event.key == pygame.KMOD_RSHIFT:
-                                self.rshift_active = True
-                            elif event.key == pygame.KMOD_LCTRL:
-                                self.lctrl_active = True
-                            elif event.key == pygame.KMOD_RCTRL:
-                                self.rctrl_active = True
-                            elif event.key == pygame.KMOD_LALT:
-                                self.lalt_active = True
-                            elif event.key == pygame.KMOD_RALT:
-                                self.ralt_active = True
-
-                            await self._onKeyDown(event)
-
-                        elif event.type == pygame.KEYUP:
-                            if event.key == pygame.KMOD_LSHIFT:
-                                self.lshift_active = False
-                            elif event.key == pygame.KMOD_RSHIFT:
-                                self.rshift_active = False
-                            elif event.key == pygame.KMOD_LCTRL:
-                                self.lctrl_active = False
-                            elif event.key == pygame.KMOD_RCTRL:
-                                self.rctrl_active = False
-                            elif event.key == pygame.KMOD_LALT:
-                                self.lalt_active = False
-                            elif event.key == pygame.KMOD_RALT:
-                                self.ralt_active = False
-
-                            await self._onKeyUp(event)
-
-                        elif event.type == pygame.DROPFILE:
-                            await self._onFileDrop(event)
-
-                        elif event.type == pygame.DROPTEXT:
-                            await self._onTextDrop(event)
-
-                        elif event.type == pygame.DROPBEGIN:
-                            await self._onDrag(event)
-
-                        elif event.type == pygame.DROPCOMPLETE:
-                            await self._onDrop(event)
-
-                    
                     except Exception as e:
                         logger.exception(e)
                     event = self.getEvent()
 
                 await self.run_tasks()
-                await self._onTick()
+
+                now = monotonic()
+                if now >= nextTick:
+                    await self._onTick()
+                    # fixed rate, ticks that were missed completely are dropped
+                    nextTick += self._tickInterval
+                    if nextTick <= now:
+                        nextTick = now + self._tickInterval
+
                 await self.run_interval_events()
 
+    async def handleEvent(self, event) -> bool:
+        """ Dispatches a single pygame event to its listeners. Returns False after a QUIT event """
+        self.__update_event_listeners()
+
+        if event.type == pygame.QUIT:
+            await self._onClose(event)
+            return False
+
+
+        elif event.type == pygame.WINDOWRESIZED:
+            await self._onResize(event)
+
+        elif event.type == pygame.MOUSEMOTION:
+            self.mousePosition = Vector2(event.pos)
+            await self._onMouseMotion(event)
+            #self.last_mouse_motion_event = event
+
+
+        elif event.type == pygame.MOUSEBUTTONDOWN:
+            if event.button == pygame.BUTTON_WHEELUP:
+                await self._onScrollUp(event)
+            elif event.button == pygame.BUTTON_WHEELDOWN:
+                await self._onScrollDown(event)
+            elif event.button == pygame.BUTTON_LEFT:
+                self._last_mouse_down_event = datetime.datetime.now()
+            await self._onMouseDown(event)
+        elif event.type == pygame.WINDOWRESIZED:
+            await self._onResize(event)
+        elif event.type == pygame.MOUSEBUTTONUP:
+            if event.button == pygame.BUTTON_LEFT:
+                if (datetime.datetime.now() - self._last_mouse_down_event).microseconds <= 250000:
+                    if (datetime.datetime.now() - self._last_mouse_click_event).microseconds <= 250000:
+                        if (event.pos[0] - self._last_mouse_click_event_pos[0])**2 + (event.pos[1] - self._last_mouse_click_event_pos[1])**2 <= 50:
+                            # max 7 pixel distance between mouse down and mouse up -> (5*5) + (5*5) = 50 -> sqrt(50) = 7.07 (max distance)
+                            await self._onMouseDoubleClick(event)
+                            self._last_mouse_click_event = datetime.datetime(1970,1,1)
+                        else:
+                            await self._onMouseClick(event)
+                            self._last_mouse_click_event = datetime.datetime.now()
+                            self._last_mouse_click_event_pos = event.pos
+                    else:
+                        await self._onMouseClick(event)
+                        self._last_mouse_click_event = datetime.datetime.now()
+                        self._last_mouse_click_event_pos = event.pos
+            await self._onMouseUp(event)
+
+        elif event.type == pygame.KEYDOWN:
+            if event.key == pygame.KMOD_LSHIFT:
+                self.lshift_active = True
+            elif event.key == pygame.KMOD_RSHIFT:
+                self.rshift_active = True
+            elif event.key == pygame.KMOD_LCTRL:
+                self.lctrl_active = True
+            elif event.key == pygame.KMOD_RCTRL:
+                self.rctrl_active = True
+            elif event.key == pygame.KMOD_LALT:
+                self.lalt_active = True
+            elif event.key == pygame.KMOD_RALT:
+                self.ralt_active = True
+
+            await self._onKeyDown(event)
+
+        elif event.type == pygame.KEYUP:
+            if event.key == pygame.KMOD_LSHIFT:
+                self.lshift_active = False
+            elif event.key == pygame.KMOD_RSHIFT:
+                self.rshift_active = False
+            elif event.key == pygame.KMOD_LCTRL:
+                self.lctrl_active = False
+            elif event.key == pygame.KMOD_RCTRL:
+                self.rctrl_active = False
+            elif event.key == pygame.KMOD_LALT:
+                self.lalt_active = False
+            elif event.key == pygame.KMOD_RALT:
+                self.ralt_active = False
+
+            await self._onKeyUp(event)
+
+        elif event.type == pygame.DROPFILE:
+            await self._onFileDrop(event)
+
+        elif event.type == pygame.DROPTEXT:
+            await self._onTextDrop(event)
+
+        elif event.type == pygame.DROPBEGIN:
+            await self._onDrag(event)
+
+        elif event.type == pygame.DROPCOMPLETE:
+            await self._onDrop(event)
+
+        return True
+
 
     async def run_interval_events(self):
-        tasks = []
-        for event in self._intervalEvents.values():
-            tasks.append(asyncio.create_task(event()))
-        await asyncio.gather(*tasks)
+        await self.timers.run_due()
                     
 
     async def __exec(self, f, e):
@@ -316,11 +408,10 @@ class EventHandler(Thread):
 
 
         try:
-            if inspect.iscoroutinefunction(f):
-                r = asyncio.create_task( f(e) )
+            r = f(e)
+            if f.is_async and r is not None:
+                r = asyncio.create_task(r)
                 self.running_tasks.add(r)
-            else:
-                r = f(e)
         except Exception as exc:
             ex = exc
 
@@ -337,67 +428,67 @@ class EventHandler(Thread):
         return True
 
 
+    async def _dispatch(self, eventtype, event, check = None):
+        """ Calls the focus listeners of eventtype or, if there are none, the global
+            listeners and the listeners of the hitboxes under the cursor """
+        focusListeners = self.focusEventListeners[eventtype]
+        for listener in focusListeners or self.eventListeners[eventtype]:
+            if check is not None and not check(listener, event):
+                continue
+            await self.__exec(listener,event)
+            if listener.callonce:
+                self.removeEventListener(listener.futureWrapper)
+
+        if focusListeners or eventtype not in ROUTED_EVENTS:
+            return
+
+        for hitbox in self.hitboxIndex.query(*event.pos):
+            for listener in hitbox.routedEventListeners.get(eventtype, ()):
+                if check is not None and not check(listener, event):
+                    continue
+                await self.__exec(listener,event)
+                if listener.callonce:
+                    hitbox.removeEventListener(listener.futureWrapper)
+
+    async def _dispatchHover(self, event):
+        """ Sends mouse motion to the hovered hitboxes and those the cursor just left """
+        hovered = [hitbox for hitbox in self.hitboxIndex.query(*event.pos) if hitbox.hasHoverListeners]
+        left = [hitbox for hitbox in self._hoveredHitboxes if hitbox not in hovered]
+        self._hoveredHitboxes = hovered
+
+        for hitbox in self.hitboxIndex.sorted(left + hovered):
+            try:
+                await hitbox._onMouseMotion(event)
+            except Exception as e:
+                logger.exception(e)
+
     async def _onTick(self):
         event = TickEvent(self._tick)
         self._tick += 1
         event.pos = self.mousePosition 
 
-        if self.focusEventListeners["tick"]:
-            self.focusEventListeners["tick"] = [listener for listener in self.focusEventListeners["tick"] 
-                if await self.__exec(listener,event) and not listener.callonce
-            ]
-        else:
-            self.eventListeners["tick"] = [listener for listener in self.eventListeners["tick"] 
-                if await self.__exec(listener,event) and not listener.callonce
-            ]
+        self.__update_event_listeners()
+        await self._dispatch("tick", event)
 
     async def _onFileDrop(self, event):
         if not hasattr(event, "pos"):
             event.pos = self.mousePosition 
-        if self.focusEventListeners["fileDrop"]:
-            self.focusEventListeners["fileDrop"] = [listener for listener in self.focusEventListeners["fileDrop"] 
-                if await self.__exec(listener,event) and not listener.callonce
-            ]
-        else:
-            self.eventListeners["fileDrop"] = [listener for listener in self.eventListeners["fileDrop"] 
-                if await self.__exec(listener,event) and not listener.callonce
-            ]
+        await self._dispatch("fileDrop", event)
 
     async def _onDrag(self, event):
         if not hasattr(event, "pos"):
             event.pos = self.mousePosition 
-        if self.focusEventListeners["drag"]:
-            self.focusEventListeners["drag"] = [listener for listener in self.focusEventListeners["drag"] 
-                if await self.__exec(listener,event) and not listener.callonce
-            ]
-        else:
-            self.eventListeners["drag"] = [listener for listener in self.eventListeners["drag"] 
-                if await self.__exec(listener,event) and not listener.callonce
-            ]
+        await self._dispatch("drag", event)
 
     async def _onDrop(self, event):
         if not hasattr(event, "pos"):
             event.pos = self.mousePosition 
-        if self.focusEventListeners["drop"]:
-            self.focusEventListeners["drop"] = [listener for listener in self.focusEventListeners["drop"] 
-                if await self.__exec(listener,event) and not listener.callonce
-            ]
-        else:
-            self.eventListeners["drop"] = [listener for listener in self.eventListeners["drop"] 
-                if await self.__exec(listener,event) and not listener.callonce
-            ]
+        await self._dispatch("drop", event)
 
     async def _onTextDrop(self, event):
         if not hasattr(event, "pos"):
             event.pos = self.mousePosition 
-        if self.focusEventListeners["textDrop"]:
-            self.focusEventListeners["textDrop"] = [listener for listener in self.focusEventListeners["textDrop"] 
-                if await self.__exec(listener,event) and not listener.callonce
-            ]
-        else:
-            self.eventListeners["textDrop"] = [listener for listener in self.eventListeners["textDrop"] 
-                if await self.__exec(listener,event) and not listener.callonce
-            ]
+        await self._dispatch("textDrop", event)
 
     async def _onClose(self, event):
         if self.obj_has_focus:
@@ -427,92 +518,36 @@ class EventHandler(Thread):
         self.last_mouse_motion_event = None
         self.skipped_mouse_motion_events = 0 
 
-        if self.focusEventListeners["mouseMotion"]:
-            for listener in self.focusEventListeners["mouseMotion"]:
-                await self.__exec(listener,event)
-        else:
-            for listener in self.eventListeners["mouseMotion"]:
-                await self.__exec(listener,event)
+        await self._dispatch("mouseMotion", event)
+        if not self.focusEventListeners["mouseMotion"]:
+            await self._dispatchHover(event)
 
     async def _onResize(self, event):
-        if self.focusEventListeners["resize"]:
-            for listener in self.focusEventListeners["resize"]:
-                await self.__exec(listener,event)
-        else:
-            for listener in self.eventListeners["resize"]:
-                await self.__exec(listener,event)
+        await self._dispatch("resize", event)
 
     async def _onMouseClick(self, event):
-        if self.focusEventListeners["mouseClick"]:
-            for listener in self.focusEventListeners["mouseClick"]:
-                await self.__exec(listener,event)
-        else:
-            for listener in self.eventListeners["mouseClick"]:
-                await self.__exec(listener,event)
+        await self._dispatch("mouseClick", event)
 
     async def _onMouseDoubleClick(self, event):
-        if self.focusEventListeners["mouseDoubleClick"]:
-            for listener in self.focusEventListeners["mouseDoubleClick"]:
-                await self.__exec(listener,event)
-        else:
-            for listener in self.eventListeners["mouseDoubleClick"]:
-                await self.__exec(listener,event)
+        await self._dispatch("mouseDoubleClick", event)
 
     async def _onScrollDown(self, event):
-        if self.focusEventListeners["scrollDown"]:
-            for listener in self.focusEventListeners["scrollDown"]:
-                await self.__exec(listener,event)
-        else:
-            for listener in self.eventListeners["scrollDown"]:
-                await self.__exec(listener,event)
+        await self._dispatch("scrollDown", event)
 
     async def _onScrollUp(self, event):   
-        if self.focusEventListeners["scrollUp"]:
-            for listener in self.focusEventListeners["scrollUp"]:
-                await self.__exec(listener,event)
-        else:
-            for listener in self.eventListeners["scrollUp"]:
-                await self.__exec(listener,event)
+        await self._dispatch("scrollUp", event)
 
     async def _onKeyDown(self, event):
-        if self.focusEventListeners["keyDown"]:
-            for listener in self.focusEventListeners["keyDown"]:
-                if self._keycheck(listener, event):
-                    await self.__exec(listener,event)
-        else:
-            for listener in self.eventListeners["keyDown"]:
-                if self._keycheck(listener, event):
-                    await self.__exec(listener,event)
+        await self._dispatch("keyDown", event, self._keycheck)
 
     async def _onKeyUp(self, event):
-        if self.focusEventListeners["keyUp"]:
-            for listener in self.focusEventListeners["keyUp"]:
-                if self._keycheck(listener, event):
-                    await self.__exec(listener,event)
-        else:
-            for listener in self.eventListeners["keyUp"]:
-                if self._keycheck(listener, event):
-                    await self.__exec(listener,event)
+        await self._dispatch("keyUp", event, self._keycheck)
 
     async def _onMouseDown(self, event):
-        if self.focusEventListeners["mouseDown"]:
-            for listener in self.focusEventListeners["mouseDown"]:
-                if self._buttoncheck(listener, event):
-                    await self.__exec(listener,event)
-        else:
-            for listener in self.eventListeners["mouseDown"]:
-                if self._buttoncheck(listener, event):
-                    await self.__exec(listener,event)
+        await self._dispatch("mouseDown", event, self._buttoncheck)
 
     async def _onMouseUp(self, event):
-        if self.focusEventListeners["mouseUp"]:
-            for listener in self.focusEventListeners["mouseUp"]:
-                if self._buttoncheck(listener, event):
-                    await self.__exec(listener,event)
-        else:
-            for listener in self.eventListeners["mouseUp"]:
-                if self._buttoncheck(listener, event):
-                    await self.__exec(listener,event)
+        await self._dispatch("mouseUp", event, self._buttoncheck)
 
     def _keycheck(self, listener, event):
         if listener.key is None:
@@ -577,43 +612,39 @@ class EventHandler(Thread):
         return True
 
     def addEventListener(self, eventtype, func, once=False, key=None, key_mods:list|None=None, override=False):
-        if eventtype not in self.eventListeners:
+        if eventtype not in self._eventListeners:
             raise ValueError("Unknown event type: %s" % eventtype)
         
-        if not inspect.iscoroutinefunction(func):
-            params = inspect.signature(func).parameters
-            def eventListener(e):
-                if len(params) == 1:
-                    func(e)
-                else:
-                    func()
+        if isinstance(func, EventListener):
+            eventListener = func
+            eventListener.callonce = once
+            eventListener.key = key
+            eventListener.key_mods = key_mods
+            eventListener.futureWrapper = EventListenerFuture(eventListener, eventtype)
         else:
-            async def eventListener(e):
-                params = inspect.signature(func).parameters
-                if len(params) == 1:
-                    await func(e)
-                else:
-                    await func()
-
-        eventListener.callonce = once
-        eventListener.key = key
-        eventListener.key_mods = key_mods
-        eventListener.futureWrapper = EventListenerFuture(eventListener, eventtype)
+            eventListener = EventListener(func, eventtype, once, key, key_mods)
 
-        if override:
-            self._focusEventListeners[eventtype].append(eventListener)
-        else:
-            self._eventListeners[eventtype].append(eventListener)
+        with self._listenersLock:
+            table = self._focusEventListeners if override else self._eventListeners
+            table[eventtype] = table[eventtype] + [eventListener]
+            self._listenersVersion += 1
 
         return eventListener.futureWrapper
 
     def removeEventListener(self, eventListenerFuture: EventListenerFuture):
-        len_before = len(self._eventListeners[eventListenerFuture.eventtype]) + len(self._focusEventListeners[eventListenerFuture.eventtype])
+        eventtype = eventListenerFuture.eventtype
+        removed = 0
+        with self._listenersLock:
+            for table in (self._eventListeners, self._focusEventListeners):
+                listeners = [listener for listener in table[eventtype] if id(listener) != eventListenerFuture.id ]
+                if len(listeners) != len(table[eventtype]):
+                    removed += len(table[eventtype]) - len(listeners)
+                    table[eventtype] = listeners
 
-        self._eventListeners[eventListenerFuture.eventtype] = [listener for listener in self._eventListeners[eventListenerFuture.eventtype] if id(listener) != eventListenerFuture.id ]
-        self._focusEventListeners[eventListenerFuture.eventtype] = [listener for listener in self._focusEventListeners[eventListenerFuture.eventtype] if id(listener) != eventListenerFuture.id ]
+            if removed:
+                self._listenersVersion += 1
 
-        return len_before - len(self._eventListeners[eventListenerFuture.eventtype]) - len(self._focusEventListeners[eventListenerFuture.eventtype])
+        return removed
 
     def setFocus(self, obj):
         self.focusObj = obj
@@ -638,25 +669,40 @@ class EventHandler(Thread):
     def focusEventListeners(self):
         return self._focusEventListeners_cache
         
+    @property
+    def listenersVersion(self) -> int:
+        return self._listenersVersion
+
     def __update_event_listeners(self):
-        self._eventListeners_cache = deepcopy(self._eventListeners)
-        self._focusEventListeners_cache = deepcopy(self._focusEventListeners)
+        if self._dispatchVersion == self._listenersVersion:
+            return
+        with self._listenersLock:
+            self._eventListeners_cache = {k: tuple(v) for k, v in self._eventListeners.items()}
+            self._focusEventListeners_cache = {k: tuple(v) for k, v in self._focusEventListeners.items()}
+            self._dispatchVersion = self._listenersVersion
 
     def queueTask(self, wrapper, args=None):
         self.tasks.put((wrapper, args))
+        self._wakeLoop()
 
     def queueIntervalEvent(self, func, interval) -> int:
-        if isinstance(interval, int):
-            interval = datetime.timedelta(seconds=interval)
-        e = IntervalEvent(func, interval)
-        self._intervalEvents[e.id] = e
-        return e.id
-        
+        """ Runs func every interval (seconds or timedelta), returns the timer id """
+        id = self.timers.add(func, interval).id
+        self._wakeLoop()
+        return id
+
+    def queueTimeoutEvent(self, func, delay) -> int:
+        """ Runs func once after delay (seconds or timedelta), returns the timer id """
+        id = self.timers.add(func, delay, repeat=False).id
+        self._wakeLoop()
+        return id
+
     def removeIntervalEvent(self, id):
-        e = self._intervalEvents.pop(id, None)
-        if e is not None:
-            return True
-        return False
+        return self.timers.cancel(id)
+
+    @property
+    def timerStats(self):
+        return self.timers.stats
 
 
 
@@ -1,79 +1,264 @@
-import datetime
 import threading
 import time
 
 import numpy
-from numpy import append
+
+# Frame time budget in seconds when no target frame rate is set
+DEFAULT_BUDGET = 1 / 60
+# A frame counts as jank once it takes this many budgets, i.e. at least one frame was missed
+JANK_FACTOR = 1.5
+# Edges of the frame time histogram in ms
+HISTOGRAM_BINS_MS = (0, 8, 16, 33, 50, 100, 250, numpy.inf)
 
 
 class FPSCalculator:
-    def __init__(self, history_len = 100):
-        self._history = numpy.array([0])
+    """ Frame times of the last history_len frames in a preallocated ring buffer
+
+        Call it once per frame. Recording a frame is O(1), the statistics (frame rates,
+        frame time percentiles, jank and the histogram) are computed from the buffer
+        when they are asked for.
+    """
+
+    def __init__(self, history_len = 100, budget: float|None = None):
+        if history_len < 1:
+            raise ValueError("history_len must be at least 1")
+        self._history = numpy.zeros(history_len)
         self._history_len = history_len
-        self._last_time = datetime.datetime.now()
+        self._lock = threading.Lock()
+        self.budget = budget
+        self.reset()
 
-    def __call__(self):
-        new_time = datetime.datetime.now()
-        try:
-            self._history = append(self._history, 1 / ( new_time - self._last_time ).total_seconds() )
-        except ZeroDivisionError:
-            return
+    def reset(self):
+        with self._lock:
+            self._index = 0
+            self._count = 0
+            self._last_time = time.perf_counter()
+            self.frames = 0
+            self.jank_frames = 0
+
+    @property
+    def budget(self) -> float:
+        """ Frame time budget in seconds """
+        return self._budget
+
+    @budget.setter
+    def budget(self, value: float|None):
+        self._budget = DEFAULT_BUDGET if value is None else value
+
+    @property
+    def jank_threshold(self) -> float:
+        return self._budget * JANK_FACTOR
+
+    def __call__(self, idle: bool = False):
+        """ Records a frame
+
+            idle: the frame was paced down on purpose (see FrameScheduler), it is not
+            recorded, so idle pauses do not show up as slow frames
+        """
+        new_time = time.perf_counter()
+        with self._lock:
+            frame_time = new_time - self._last_time
+            self._last_time = new_time
+            if idle or frame_time <= 0:
+                return
+
+            self._history[self._index] = frame_time
+            self._index = (self._index + 1) % self._history_len
+            if self._count < self._history_len:
+                self._count += 1
 
-        if self._history.size > self._history_len:
-            self._history.pop(0)
+            self.frames += 1
+            if frame_time > self._budget * JANK_FACTOR:
+                self.jank_frames += 1
 
-        self._last_time = new_time
+    def __len__(self):
+        return self._count
+
+    def frame_times(self) -> numpy.ndarray:
+        """ Copy of the recorded frame times in seconds, oldest first """
+        with self._lock:
+            if self._count < self._history_len:
+                return self._history[:self._count].copy()
+            return numpy.roll(self._history, -self._index)
+
+    def last(self) -> float:
+        """ Time of the last frame in seconds, 0 if none was recorded """
+        with self._lock:
+            if self._count == 0:
+                return 0.0
+            return float(self._history[self._index - 1])
+
+    def _window(self) -> numpy.ndarray:
+        # order does not matter for the statistics, skips the copy of frame_times
+        with self._lock:
+            return self._history[:self._count].copy()
 
     def avg(self):
-        if self._history.size <= 2:
+        frame_times = self._window()
+        if frame_times.size <= 2:
             return 0
-        return numpy.average(self._history)
+        return frame_times.size / frame_times.sum()
 
     def max(self):
-        if self._history.size <= 2:
+        frame_times = self._window()
+        if frame_times.size <= 2:
             return 0
-        return numpy.max(self._history)
+        return 1 / frame_times.min()
 
     def min(self):
-        if self._history.size <= 2:
+        frame_times = self._window()
+        if frame_times.size <= 2:
             return 0
-        return numpy.min(self._history)
+        return 1 / frame_times.max()
+
+    def percentiles(self, q=(50, 95, 99)) -> tuple[float, ...]:
+        """ Frame time percentiles in ms, zeros if no frame was recorded """
+        frame_times = self._window()
+        if frame_times.size == 0:
+            return tuple(0.0 for _ in q)
+        return tuple(float(value) * 1000 for value in numpy.percentile(frame_times, q))
+
+    def jank(self, budget: float|None = None) -> int:
+        """ Frames in the history that took longer than JANK_FACTOR times budget """
+        threshold = (self._budget if budget is None else budget) * JANK_FACTOR
+        return int(numpy.count_nonzero(self._window() > threshold))
+
+    def histogram(self, bins=HISTOGRAM_BINS_MS) -> tuple[numpy.ndarray, numpy.ndarray]:
+        """ Counts and bin edges of the frame times in the history, in ms """
+        return numpy.histogram(self._window() * 1000, bins=bins)
+
+    def as_dict(self) -> dict:
+        p50, p95, p99 = self.percentiles()
+        counts, edges = self.histogram()
+        return {
+            "frames": self.frames,
+            "jank_frames": self.jank_frames,
+            "fps": self.avg(),
+            "p50_ms": p50,
+            "p95_ms": p95,
+            "p99_ms": p99,
+            "jank": self.jank(),
+            "budget_ms": self._budget * 1000,
+            "histogram": dict(zip(edges[:-1].tolist(), counts.tolist())),
+        }
+
+    def summary(self) -> str:
+        p50, p95, p99 = self.percentiles()
+        return (f"frames: p50 {p50:.1f}ms, p95 {p95:.1f}ms, p99 {p99:.1f}ms, "
+                f"jank {self.jank()}/{len(self)} (>{self.jank_threshold * 1000:.0f}ms), {self.jank_frames} total")
 
     def __str__(self):
-        if self._history.size <= 2:
+        last = self.last()
+        if self._count <= 2 or last >= 1:
             return "< 1"
-        return str(int(self._history[-1]))
+        return str(int(1 / last))
 
 
 class ThreadingFPSCalculator(FPSCalculator):
-    def __init__(self, history_len = 1000):
-        super().__init__(history_len)
+    """ Kept for compatibility, the statistics are computed on demand without a thread """
 
-        self.__calc_thread = threading.Thread(target=self._calc_fps, daemon=True, name="FPSCalculator")
-        self.__calc_thread.start()
-        self._avg = 0
-        self._max = 0
-        self._min = 0
+    def __init__(self, history_len = 1000, budget: float|None = None):
+        super().__init__(history_len, budget)
 
-    def avg(self):
-        return self._avg
 
-    def max(self):
-        return self._max
+class FrameScheduler:
+    """ Paces the render loop to a target frame rate
 
-    def min(self):
-        return self._min
-
-    def _calc_fps(self):
-        while 1:
-            try:
-                self._avg = super().avg()
-                self._max = super().max()
-                self._min = super().min()
-                if self._history.size > 2:
-                    self._history = numpy.array(self._history[-1])
-            except Exception:
-                pass
-            time.sleep(2)
-            
+        When no input arrived and nothing changed for `idle_timeout` seconds the
+        scheduler drops to `idle_fps`. A call to `wake()` (e.g. on new input)
+        shortens the current wait and switches back to `target_fps`, but a frame
+        never starts sooner than the `target_fps` interval after the last one.
+    """
+
+    def __init__(self, target_fps: int|None = 60, idle_fps: int|None = 5, idle_timeout: float = 0.5):
+        self.target_fps = target_fps
+        self.idle_fps = idle_fps
+        self.idle_timeout = idle_timeout
+
+        self._wakeup = threading.Event()
+        self._last_activity = time.monotonic()
+        self._next_frame = time.monotonic()
+        self._last_frame = time.monotonic()
+        self.idle_frames = 0
+        self.active_frames = 0
+        # whether the last wait was paced at idle_fps
+        self.last_frame_idle = False
+
+    @staticmethod
+    def _interval(fps: int|None) -> float:
+        if not fps:
+            return 0
+        return 1 / fps
+
+    @property
+    def is_idle(self) -> bool:
+        if self.idle_fps is None:
+            return False
+        return time.monotonic() - self._last_activity >= self.idle_timeout
+
+    @property
+    def frame_interval(self) -> float:
+        if self.is_idle:
+            return self._interval(self.idle_fps)
+        return self._interval(self.target_fps)
+
+    def mark_active(self):
+        self._last_activity = time.monotonic()
+
+    def wake(self):
+        """ Thread-safe: ends the current wait and leaves idle mode """
+        self._last_activity = time.monotonic()
+        self._wakeup.set()
+
+    def wait(self, busy: bool = False, input_pending = None):
+        """ Blocks until the next frame is due
+
+            busy: there is pending work (changed entities, queued events)
+            input_pending: optional callable polled at the target rate while idling
+        """
+        if busy:
+            self.mark_active()
+
+        self.last_frame_idle = self.is_idle
+        if self.last_frame_idle:
+            self.idle_frames += 1
+        else:
+            self.active_frames += 1
+
+        now = time.monotonic()
+        interval = self.frame_interval
+        if interval == 0:
+            self._next_frame = now
+            self._last_frame = now
+            return
+
+        self._next_frame += interval
+        if self._next_frame < now - interval:
+            # we fell behind, do not try to catch up
+            self._next_frame = now
+
+        target_interval = self._interval(self.target_fps)
+        poll_interval = target_interval or interval
+        woken = False
+        while True:
+            remaining = self._next_frame - time.monotonic()
+            if remaining <= 0:
+                break
+            if woken:
+                time.sleep(remaining)
+                break
+            if self._wakeup.wait(min(remaining, poll_interval)):
+                woken = True
+            elif input_pending is not None and input_pending():
+                self.mark_active()
+                woken = True
+            if woken:
+                # input ends an idle wait, but never runs frames faster than target_fps
+                self._next_frame = min(self._next_frame, self._last_frame + target_interval)
+
+        self._wakeup.clear()
+        self._last_frame = time.monotonic()
+        if woken:
+            # woken up early: restart pacing from now
+            self._next_frame = self._last_frame
 
@@ -1,7 +1,6 @@
-import inspect
 from types import NoneType
 from pyscreen.core.vector import Vector2, IVector2
-from .eventHandler import EventHandler, EventListenerFuture
+from .eventHandler import EventHandler, EventListener, EventListenerFuture, ROUTED_EVENTS
 
 from pyscreen.logging import getLogger
 logger = getLogger()
@@ -20,8 +19,31 @@ class HoverStateEvent(object):
     def __init__(self, state):
         self.state = state
 
+class HitboxEventListener(EventListener):
+    """ Listener record that only fires while the event position is inside the hitbox """
+    __slots__ = ("hitbox",)
+
+    def __init__(self, hitbox: "Hitbox", func, eventtype, once=False, key=None, key_mods:list|None=None):
+        super().__init__(func, eventtype, once, key, key_mods)
+        self.hitbox = hitbox
+
+    def __call__(self, event):
+        hitbox = self.hitbox
+        if not hitbox.enabled or not hitbox._mouse_in_hitbox(*event.pos):
+            return None
+        event.target = hitbox.target
+        event.relpos = (
+            event.pos[0] - hitbox.hitbox_location.x,
+            event.pos[1] - hitbox.hitbox_location.y
+        )
+        if self.pass_event:
+            return self.func(event)
+        return self.func()
+
+
 class Hitbox:
-    def __init__(self, eventHandler: EventHandler, location: Vector2|None = None, size: Vector2|None = None, get_global_key_events:bool=False, target=None):
+    def __init__(self, eventHandler: EventHandler, location: Vector2|None = None, size: Vector2|None = None, get_global_key_events:bool=False, target=None, z_index: int = 0):
+        self.z_index = z_index
         self._hitbox_location = Vector2(location) if location is not None else Vector2(0,0)
         self._hitbox_size = Vector2(size) if size is not None else Vector2(0,0)
         self.get_global_key_events = get_global_key_events
@@ -34,7 +56,6 @@ class Hitbox:
         self.start_value = _Void
         self._mouse_was_in_hitbox = False
 
-        self.__mouseMotionListenerAdded = False
         self.__mouseDownListenerAdded = False
         self.__forceReleaseListenerAdded = False
 
@@ -48,6 +69,10 @@ class Hitbox:
             "change": []
         }
 
+        # listeners the EventHandler routes to this hitbox when the cursor is inside
+        self.routedEventListeners: dict[str, list] = {eventtype: [] for eventtype in ROUTED_EVENTS}
+        self.hasHoverListeners = False
+
         self.__eventHandler: EventHandler = eventHandler
         self.__globalEventListeners = []
 
@@ -58,7 +83,11 @@ class Hitbox:
         for e in self.__globalEventListeners:
             self.__eventHandler.removeEventListener(e)
 
-        self.__mouseMotionListenerAdded = False
+        self.routedEventListeners = {eventtype: [] for eventtype in ROUTED_EVENTS}
+        self.hasHoverListeners = False
+        if self.__eventHandler is not None:
+            self.__eventHandler.hitboxIndex.remove(self)
+
         self.__mouseDownListenerAdded = False
         self.__forceReleaseListenerAdded = False
 
@@ -80,12 +109,16 @@ class Hitbox:
         if not isinstance(value, IVector2):
             value = Vector2(value)
         self._hitbox_location = value
+        if self.__eventHandler is not None:
+            self.__eventHandler.hitboxIndex.update(self)
 
     @hitbox_size.setter
     def hitbox_size(self, value):
         if not isinstance(value, IVector2):
             value = Vector2(value)
         self._hitbox_size = value
+        if self.__eventHandler is not None:
+            self.__eventHandler.hitboxIndex.update(self)
 
     @property
     def outer(self):
@@ -99,23 +132,12 @@ class Hitbox:
         r = None
         ex = None
 
-        params = inspect.signature(f).parameters
-        if inspect.iscoroutinefunction(f):
-            try:
-                if len(params) == 1:
-                    r = await f(e)
-                else:
-                    r = await f()
-            except Exception as exc:
-                ex = exc
-        else:
-            try:
-                if len(params) == 1:
-                    r = f(e)
-                else:
-                    r = f()
-            except Exception as exc:
-                ex = exc
+        try:
+            r = f(e)
+            if f.is_async and r is not None:
+                r = await r
+        except Exception as exc:
+            ex = exc
 
         f.futureWrapper.result = r
         f.futureWrapper.exception = ex
@@ -155,7 +177,7 @@ class Hitbox:
         if not self.enabled:
             return
         event.target = self.target
-        if force or (self._mouse_in_hitbox(*event.pos) != self._mouse_was_in_hitbox):
+        if force or (self._mouse_in_hitbox(*event.pos) and not self._mouse_was_in_hitbox):
             self._mouse_was_in_hitbox = True
             self.eventListeners["mouseEnter"] = [listener for listener in self.eventListeners["mouseEnter"] 
                 if await self.__exec(listener,event) and not listener.callonce
@@ -165,7 +187,7 @@ class Hitbox:
         if not self.enabled:
             return
         event.target = self.target
-        if force or (self._mouse_in_hitbox(*event.pos) != self._mouse_was_in_hitbox):
+        if force or (not self._mouse_in_hitbox(*event.pos) and self._mouse_was_in_hitbox):
             self._mouse_was_in_hitbox = False
             self.eventListeners["mouseLeave"] = [listener for listener in self.eventListeners["mouseLeave"] 
                 if await self.__exec(listener,event) and not listener.callonce
@@ -254,76 +276,39 @@ class Hitbox:
 
     def addEventListener(self, eventtype, func, once=False, key=None, key_mods:list|None=None, override:bool=False):
         if eventtype not in self.eventListeners:
-            if not inspect.iscoroutinefunction(func):
-                def wrapper(event):
-                    if not self.enabled:
-                        return
-                    if self._mouse_in_hitbox(*event.pos):
-                        event.target = self.target
-                        if hasattr(event,"pos"):
-                            event.relpos = (
-                                event.pos[0] - self.hitbox_location.x,
-                                event.pos[1] - self.hitbox_location.y
-                            )
-
-                        params = inspect.signature(func).parameters
-                        if len(params) == 1:
-                            func(event)
-                        else:
-                            func()
-
-            else:
-                async def wrapper(event):
-                    if not self.enabled:
-                        return
-                    if self._mouse_in_hitbox(*event.pos):
-                        event.target = self.target
-                        if hasattr(event,"pos"):
-                            event.relpos = (
-                                event.pos[0] - self.hitbox_location.x,
-                                event.pos[1] - self.hitbox_location.y
-                            )
-
-                        params = inspect.signature(func).parameters
-                        if len(params) == 1:
-                            await func(event)
-                        else:
-                            await func()
+            wrapper = HitboxEventListener(self, func, eventtype, once, key, key_mods)
+
+            if eventtype in ROUTED_EVENTS and not override:
+                return self.addRoutedEventListener(eventtype, wrapper, once, key, key_mods)
 
             l = self.addGlobalEventListener(eventtype, wrapper, once, key, key_mods, override)
             self.__globalEventListeners.append(l)
             return l
         
-        if eventtype in ["mouseEnter", "mouseLeave"] and not self.__mouseMotionListenerAdded:
-            self.__globalEventListeners.append(
-                self.__eventHandler.addEventListener("mouseMotion", self._onMouseMotion)
-            )
-            self.__mouseMotionListenerAdded = True
+        if eventtype in ["mouseEnter", "mouseLeave"] and not self.hasHoverListeners:
+            self.hasHoverListeners = True
+            self.__eventHandler.hitboxIndex.insert(self)
         
-        if not inspect.iscoroutinefunction(func):
-            def eventListener(e):
-                params = inspect.signature(func).parameters
-                if len(params) == 1:
-                    func(e)
-                else:
-                    func()
-        else:
-            async def eventListener(e):
-                params = inspect.signature(func).parameters
-                if len(params) == 1:
-                    await func(e)
-                else:
-                    await func()
-
-        eventListener.callonce = once
-        eventListener.key = key
-        eventListener.key_mods = key_mods
-        eventListener.futureWrapper = EventListenerFuture(eventListener, eventtype)
+        eventListener = EventListener(func, eventtype, once, key, key_mods)
 
         self.eventListeners[eventtype].append(eventListener)
 
         return eventListener.futureWrapper
 
+    def addRoutedEventListener(self, eventtype, func, once=False, key=None, key_mods:list|None=None):
+        """ Registers func to be called by the EventHandler when the event happens inside the hitbox """
+        if not isinstance(func, EventListener):
+            func = HitboxEventListener(self, func, eventtype, once, key, key_mods)
+        else:
+            func.callonce = once
+            func.key = key
+            func.key_mods = key_mods
+            func.futureWrapper = EventListenerFuture(func, eventtype)
+
+        self.routedEventListeners[eventtype] = self.routedEventListeners[eventtype] + [func]
+        self.__eventHandler.hitboxIndex.insert(self)
+        return func.futureWrapper
+
     def addGlobalEventListener(self, eventtype, func, once=False, key=None, key_mods:list|None=None, override:bool=False):
         return self.__eventHandler.addEventListener(eventtype, func, once, key, key_mods, override)
 
@@ -332,5 +317,10 @@ class Hitbox:
             len_before = len(self.eventListeners[eventListenerFuture.eventtype])
             self.eventListeners[eventListenerFuture.eventtype] = [listener for listener in self.eventListeners[eventListenerFuture.eventtype] if id(listener) != eventListenerFuture.id ]
             return len_before - len(self.eventListeners[eventListenerFuture.eventtype])
-        else:
-            return self.__eventHandler.removeEventListener(eventListenerFuture)
\ No newline at end of file
+        elif eventListenerFuture.eventtype in self.routedEventListeners:
+            listeners = self.routedEventListeners[eventListenerFuture.eventtype]
+            routed = [listener for listener in listeners if id(listener) != eventListenerFuture.id ]
+            if len(routed) != len(listeners):
+                self.routedEventListeners[eventListenerFuture.eventtype] = routed
+                return len(listeners) - len(routed)
+        return self.__eventHandler.removeEventListener(eventListenerFuture)
\ No newline at end of file
@@ -0,0 +1,163 @@
+from collections import deque
+from threading import Lock
+
+import pygame
+
+from pyscreen.logging import getLogger
+logger = getLogger()
+
+
+# Events that are handled before any queued pointer input
+PRIORITY_EVENTS = frozenset((
+    pygame.QUIT,
+    pygame.WINDOWRESIZED,
+    pygame.VIDEORESIZE,
+    pygame.KEYDOWN,
+    pygame.KEYUP,
+    pygame.TEXTINPUT,
+))
+
+DEFAULT_CAPACITY = 100
+
+# How far back a new pointer event looks for an event it can be merged into
+COALESCE_WINDOW = 8
+
+
+class InputStats:
+    """ Counters of the InputQueue """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.enqueued = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.max_size = 0
+
+    def as_dict(self) -> dict:
+        return {
+            "enqueued": self.enqueued,
+            "coalesced": self.coalesced,
+            "dropped": self.dropped,
+            "max_size": self.max_size,
+        }
+
+    def __str__(self):
+        return f"input: {self.enqueued} queued, {self.coalesced} coalesced, {self.dropped} dropped, max {self.max_size}"
+
+
+def _coalesce_key(e):
+    """ Events with the same key may be merged into one, None means never merge """
+    if e.type == pygame.MOUSEMOTION:
+        return (pygame.MOUSEMOTION, tuple(getattr(e, "buttons", ())))
+    if e.type == pygame.MOUSEWHEEL:
+        return (pygame.MOUSEWHEEL, getattr(e, "flipped", False))
+    if e.type in (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP) and \
+       getattr(e, "button", None) in (pygame.BUTTON_WHEELUP, pygame.BUTTON_WHEELDOWN):
+        return (e.type, e.button)
+    return None
+
+
+def _merge(old, new):
+    """ Folds new into old and returns the merged event """
+    if new.type == pygame.MOUSEMOTION:
+        old_rel = getattr(old, "rel", (0, 0))
+        new_rel = getattr(new, "rel", (0, 0))
+        new.rel = (old_rel[0] + new_rel[0], old_rel[1] + new_rel[1])
+        return new
+
+    if new.type == pygame.MOUSEWHEEL:
+        new.x = getattr(old, "x", 0) + getattr(new, "x", 0)
+        new.y = getattr(old, "y", 0) + getattr(new, "y", 0)
+        if hasattr(new, "precise_x"):
+            new.precise_x = getattr(old, "precise_x", 0) + new.precise_x
+            new.precise_y = getattr(old, "precise_y", 0) + new.precise_y
+        return new
+
+    # wheel buttons: count the notches, keep the latest position
+    new.steps = getattr(old, "steps", 1) + getattr(new, "steps", 1)
+    return new
+
+
+class InputQueue:
+    """ Thread-safe, non-blocking input queue
+
+        Priority events (quit, resize, keys) are handed out before pointer input.
+        Consecutive mouse motion and wheel events are merged, motion accumulates `rel`,
+        wheel events accumulate `x`/`y` and wheel buttons count their notches in `steps`.
+        When a queue is full its oldest event is dropped instead of blocking the producer,
+        QUIT is never dropped.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self.stats = InputStats()
+        self._lock = Lock()
+        self._priority: deque = deque()
+        self._pointer: deque = deque()
+
+    def __len__(self):
+        return len(self._priority) + len(self._pointer)
+
+    def empty(self) -> bool:
+        return not self._priority and not self._pointer
+
+    def put(self, e):
+        with self._lock:
+            self.stats.enqueued += 1
+            if e.type in PRIORITY_EVENTS:
+                self._put_priority(e)
+            else:
+                self._put_pointer(e)
+
+            size = len(self._priority) + len(self._pointer)
+            if size > self.stats.max_size:
+                self.stats.max_size = size
+
+    def _put_priority(self, e):
+        queue = self._priority
+        if len(queue) >= self.capacity:
+            for i, queued in enumerate(queue):
+                if queued.type != pygame.QUIT:
+                    del queue[i]
+                    self.stats.dropped += 1
+                    break
+        queue.append(e)
+
+    def _put_pointer(self, e):
+        queue = self._pointer
+        key = _coalesce_key(e)
+        if key is not None:
+            # merge with a pending event of the same kind unless other input lies in between
+            for i in range(len(queue) - 1, max(len(queue) - 1 - COALESCE_WINDOW, -1), -1):
+                queued_key = _coalesce_key(queue[i])
+                if queued_key is None:
+                    break
+                if queued_key == key:
+                    merged = _merge(queue[i], e)
+                    del queue[i]
+                    queue.append(merged)
+                    self.stats.coalesced += 1
+                    return
+
+        if len(queue) >= self.capacity:
+            queue.popleft()
+            self.stats.dropped += 1
+        queue.append(e)
+
+    def get(self):
+        """ Returns the next event or None """
+        with self._lock:
+            if self._priority:
+                return self._priority.popleft()
+            if self._pointer:
+                return self._pointer.popleft()
+        return None
+
+    def clear(self):
+        with self._lock:
+            self._priority.clear()
+            self._pointer.clear()
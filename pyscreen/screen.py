@@ -6,15 +6,19 @@ from enum import Enum
 import pygame
 from pygame.display import flip, set_caption, set_icon, set_mode
 from pygame.locals import *
-from pygame import Surface
+from pygame import Rect, Surface
 
+from pyscreen.core.cache import cache_policy
 from pyscreen.core.entity import Entity, Renderable
 
 from pyscreen.eventHandler import EventHandler
 
-from pyscreen.drawobj.util.renderstats import render_stats
+from pyscreen.drawobj.util.renderstats import stats_text, text_lines
 from pyscreen.drawobj.util.loadingscreen import LoadingScreen
-from .fps import ThreadingFPSCalculator
+from .fps import FPSCalculator, FrameScheduler
+from .compositor import DirtyRectCompositor, DEFAULT_DAMAGE_THRESHOLD
+from pyscreen.drawobj.util.surfacepool import surface_pool
+from pyscreen.drawobj.util.textcache import text_cache
 
 class UpscalingQuality(int, Enum):
     ULTRA = 8294400
@@ -32,7 +36,9 @@ class Screen(Thread):
 
     def __init__(self, eventHandler: EventHandler, width:int = 1250, height:int = 800, title="Window", 
                  icon = "icon.png", use_clear_screen: bool = False, resizeable: bool = True, titleframe: bool = True, 
-                 use_double_buffer: bool = True, use_upscaling: bool = False, upscaling_quality:UpscalingQuality = UpscalingQuality.HIGH):
+                 use_double_buffer: bool = True, use_upscaling: bool = False, upscaling_quality:UpscalingQuality = UpscalingQuality.HIGH,
+                 use_dirty_rects: bool = False, dirty_rect_threshold: float = DEFAULT_DAMAGE_THRESHOLD,
+                 target_fps: int|None = 60, idle_fps: int|None = 5, idle_timeout: float = 0.5):
         self.eventHandler = eventHandler
         self.resizeable = resizeable
         self.titleframe = titleframe
@@ -43,6 +49,8 @@ class Screen(Thread):
         self._height = height
         self.use_upscaling = use_upscaling
         self.upscaling_from = upscaling_quality.value
+        self.use_dirty_rects = use_dirty_rects
+        self.compositor = DirtyRectCompositor(dirty_rect_threshold)
 
         self.title = title
 
@@ -58,8 +66,10 @@ class Screen(Thread):
             self.icon = pygame.image.load(icon)
         except FileNotFoundError:
             self.icon = None
-        self.fps = ThreadingFPSCalculator()
-        self._clock = pygame.time.Clock()
+        self.fps = FPSCalculator(history_len=1000, budget=FrameScheduler._interval(target_fps) or None)
+        self.scheduler = FrameScheduler(target_fps, idle_fps, idle_timeout)
+        if self.eventHandler is not None:
+            self.eventHandler.addWakeupCallback(self.scheduler.wake)
 
         self.motionlock = RLock()
         self.entitieslock = RLock()
@@ -99,6 +109,46 @@ class Screen(Thread):
     def show_debug(self):
         return bool(self._show_debug)
 
+    @property
+    def target_fps(self) -> int|None:
+        return self.scheduler.target_fps
+
+    @target_fps.setter
+    def target_fps(self, value: int|None):
+        self.scheduler.target_fps = value
+        self.fps.budget = FrameScheduler._interval(value) or None
+        self.scheduler.wake()
+
+    @property
+    def idle_fps(self) -> int|None:
+        return self.scheduler.idle_fps
+
+    @idle_fps.setter
+    def idle_fps(self, value: int|None):
+        self.scheduler.idle_fps = value
+        self.scheduler.wake()
+
+    def request_frame(self):
+        """ Thread-safe: renders the next frame as soon as possible """
+        self.scheduler.wake()
+
+    def _has_pending_work(self) -> bool:
+        if self.eventHandler is not None and self.eventHandler.hasPendingEvents:
+            return True
+        if self.loadingscreen is not None and self.loadingscreen.is_loading:
+            return True
+        if self._show_debug:
+            return True
+        with self.entitieslock, self.popupslock:
+            for entity in list(self.entities.values()) + list(self.popups.values()):
+                if entity.changed:
+                    return True
+        return False
+
+    @property
+    def damage_stats(self) -> dict:
+        return self.compositor.stats.as_dict()
+
     @property
     def entities(self):
         return self._entities
@@ -140,6 +190,7 @@ class Screen(Thread):
 
     def close(self):
         self._is_open = False
+        self.scheduler.wake()
 
     def wait_until_quit(self):
         self.join()
@@ -185,6 +236,8 @@ class Screen(Thread):
         else:
             self.surface = self.window
         self.__last_window_size = (self.window.get_width(), self.window.get_height())
+        self.__last_dirty_size = None
+        self.__overlay_rects: list[Rect] = []
 
         
         set_caption(self.title)   
@@ -208,8 +261,9 @@ class Screen(Thread):
                     self.eventHandler.enqueueEvent(e)
                 
 
-            self.fps()
+            self.fps(idle=self.scheduler.last_frame_idle)
             self._render()
+            self.scheduler.wait(self._has_pending_work(), pygame.event.peek)
 
     def _render(self):
             scale = 1
@@ -228,8 +282,29 @@ class Screen(Thread):
                     
             self._width, self._height = self.surface.get_size()
 
+            if self._use_compositor():
+                self._render_dirty()
+                return
+
             self._clear_screen()
+            self._render_all()
 
+            if self.use_upscaling:
+                if scale == 1:
+                    pygame.transform.scale(
+                        self.surface, 
+                        (self.window.get_width(), self.window.get_height()),
+                        self.window), 
+                    (0, 0)
+                else:
+                    self.window.blit(self.surface, (0, 0))
+
+            flip()
+
+            if self.use_dirty_rects:
+                self.compositor.commit(self._compositor_entities(), None, self.surface.get_rect())
+
+    def _render_all(self):
             if self.loadingscreen is not None and self.loadingscreen.is_loading:
                     self.loadingscreen.render(self.surface)
             else:
@@ -249,61 +324,132 @@ class Screen(Thread):
                     self._print_popups()
 
                 self._print_hitboxes()
-                self._print_fps()
-                self._print_stats()
-
-            if self.use_upscaling:
-                if scale == 1:
-                    pygame.transform.scale(
-                        self.surface, 
-                        (self.window.get_width(), self.window.get_height()),
-                        self.window), 
-                    (0, 0)
-                else:
-                    self.window.blit(self.surface, (0, 0))
+                self.surface.blits(self._debug_overlay())
 
-            flip()
+    def _use_compositor(self) -> bool:
+        # upscaling and the loading screen always need the full frame
+        if not self.use_dirty_rects or self.use_upscaling:
+            return False
+        if self.loadingscreen is not None and self.loadingscreen.is_loading:
+            self.compositor.invalidate()
+            return False
+        return True
+
+    def _compositor_entities(self) -> list[Renderable]:
+        with self.entitieslock, self.popupslock:
+            return list(self.entities.values()) + list(self.popups.values())
+
+    def _render_dirty(self):
+        screen_rect = self.surface.get_rect()
+        if self.__last_dirty_size != screen_rect.size:
+            self.__last_dirty_size = screen_rect.size
+            self.compositor.invalidate()
+
+        if self.eventHandler is not None:
+            self.eventHandler.lock.acquire()
+        try:
+            entities = self._compositor_entities()
+            overlay = self._debug_overlay()
+            overlay_rects = [Rect(pos, surface.get_size()) for surface, pos in overlay]
+            # the debug overlay damages where it is drawn now and where it was drawn in the last frame
+            rects = self.compositor.collect(entities, screen_rect, self.__overlay_rects + overlay_rects)
+
+            if rects is None:
+                self._clear_screen()
+                self._print_entities()
+                self._print_popups()
+                self._print_hitboxes()
+                self.surface.blits(overlay)
+                flip()
+            elif rects:
+                for rect in rects:
+                    self.surface.set_clip(rect)
+                    self._clear_screen()
+                    for entity in entities:
+                        if self.compositor.overlaps(entity, [rect]):
+                            self._print_entity(entity)
+                    self._print_hitboxes()
+                self.surface.set_clip(None)
+                self.surface.blits(overlay)
+                pygame.display.update(rects)
+
+            self.__overlay_rects = overlay_rects
+            self.compositor.commit(entities, rects, screen_rect)
+        finally:
+            if self.eventHandler is not None:
+                self.eventHandler.lock.release()
+
+    def _print_entity(self, entity: Renderable):
+        def f():
+            entity.render(self.surface)
+        time = timeit(f, number=1)
+        self.render_stats[entity.__class__.__name__] = {
+            "obj": entity,
+            "time": time
+        }
 
     def _print_entities(self):
         with self.entitieslock:
             for entity in self.entities.values():
-                def f():
-                    entity.render(self.surface)
-                time = timeit(f, number=1)
-                self.render_stats[entity.__class__.__name__] = {
-                    "obj": entity,
-                    "time": time
-                }
+                self._print_entity(entity)
 
     def _print_popups(self):
         with self.popupslock:
             for popup in self.popups.values():
-                def f():
-                    popup.render(self.surface)
-                time = timeit(f, number=1)
-                self.render_stats[popup.__class__.__name__] = {
-                    "obj": popup,
-                    "time": time
-                }
+                self._print_entity(popup)
+
+    def _debug_overlay(self) -> list[tuple[Surface, tuple[int,int]]]:
+        """ Surfaces and positions of the debug overlay of the current level """
+        self._debug_blits = []
+        self._print_fps()
+        self._print_stats()
+        return self._debug_blits
+
+    def _blit_debug(self, surface: Surface, pos: tuple[int,int]):
+        self._debug_blits.append((surface, pos))
 
     def _print_stats(self):
         if self._show_debug == 3:
-            render_stats(self.surface, (10, 10), self.default_font, self)
+            for line, pos in text_lines(stats_text(self), (10, 10), self.default_font):
+                self._blit_debug(line, pos)
+            if self.use_dirty_rects:
+                text_damage = self.default_font.render(str(self.compositor.stats), True, (250,250,210))
+                self._blit_debug(text_damage, (10, self.height - 25))
+            if self.eventHandler is not None:
+                text_input = self.default_font.render(str(self.eventHandler.inputStats), True, (250,250,210))
+                self._blit_debug(text_input, (10, self.height - 45))
+                text_timers = self.default_font.render(str(self.eventHandler.timerStats), True, (250,250,210))
+                self._blit_debug(text_timers, (10, self.height - 65))
+            text_pool = self.default_font.render(str(surface_pool), True, (250,250,210))
+            self._blit_debug(text_pool, (10, self.height - 85))
+            text_glyphs = self.default_font.render(str(text_cache), True, (250,250,210))
+            self._blit_debug(text_glyphs, (10, self.height - 105))
+            text_core = self.default_font.render(str(cache_policy), True, (250,250,210))
+            self._blit_debug(text_core, (10, self.height - 125))
+            text_frames = self.default_font.render(self.fps.summary(), True, (250,250,210))
+            self._blit_debug(text_frames, (10, self.height - 145))
 
 
     def _print_fps(self):
         if self._show_debug == 1:
             text_fps = self.default_font.render(f"fps: {self.fps}", True, (250,250,210))
-            self.surface.blit(text_fps,(self.width - 90, 10))
+            self._blit_debug(text_fps, (self.width - 90, 10))
         if self._show_debug == 2:
             text_fps = self.default_font.render(f"fps: {self.fps}", True, (250,250,210))
-            self.surface.blit(text_fps,(self.width - 120, 10))
+            self._blit_debug(text_fps, (self.width - 120, 10))
             text_fps = self.default_font.render(f"min: {int(self.fps.min())}", True, (250,250,210))
-            self.surface.blit(text_fps,(self.width - 90, 30))
+            self._blit_debug(text_fps, (self.width - 90, 30))
             text_fps = self.default_font.render(f"max: {int(self.fps.max())}", True, (250,250,210))
-            self.surface.blit(text_fps,(self.width - 90, 50))
+            self._blit_debug(text_fps, (self.width - 90, 50))
             text_fps = self.default_font.render(f"avg: {int(self.fps.avg())}", True, (250,250,210))
-            self.surface.blit(text_fps,(self.width - 90, 70))
+            self._blit_debug(text_fps, (self.width - 90, 70))
+            p50, p95, p99 = self.fps.percentiles()
+            text_fps = self.default_font.render(f"p95: {p95:.1f}ms", True, (250,250,210))
+            self._blit_debug(text_fps, (self.width - 90, 90))
+            text_fps = self.default_font.render(f"p99: {p99:.1f}ms", True, (250,250,210))
+            self._blit_debug(text_fps, (self.width - 90, 110))
+            text_fps = self.default_font.render(f"jank: {self.fps.jank()}", True, (250,250,210))
+            self._blit_debug(text_fps, (self.width - 90, 130))
 
     def _print_hitboxes(self):
         if self._show_debug == 3:
@@ -313,6 +459,7 @@ class Screen(Thread):
             
 
     def toggle_debug_view(self):
+        self.compositor.invalidate()
         if self._show_debug < 3:
             self._show_debug += 1
         elif self._show_debug == 3:
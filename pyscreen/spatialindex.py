@@ -0,0 +1,103 @@
+from itertools import count
+from threading import RLock
+from typing import Iterable
+
+# Edge length of a grid cell in pixels
+DEFAULT_CELL_SIZE = 64
+
+
+class HitboxIndex:
+    """ Uniform grid over the screen, used to find the hitboxes under the cursor
+
+        Every hitbox is stored in all cells its rect touches. Lookups only test the
+        hitboxes of a single cell, results are returned in z-order
+        (ascending `z_index`, then registration order).
+    """
+
+    def __init__(self, cell_size: int = DEFAULT_CELL_SIZE):
+        if cell_size <= 0:
+            raise ValueError("cell_size must be positive")
+        self.cell_size = cell_size
+        self._lock = RLock()
+        self._cells: dict[tuple[int,int], set] = {}
+        self._hitbox_cells: dict[int, tuple[tuple[int,int], ...]] = {}
+        self._order: dict[int, int] = {}
+        self._sequence = count()
+
+    def __len__(self):
+        return len(self._hitbox_cells)
+
+    def __contains__(self, hitbox):
+        return id(hitbox) in self._hitbox_cells
+
+    def _cells_of(self, hitbox) -> tuple[tuple[int,int], ...]:
+        x, y = hitbox.hitbox_location
+        w, h = hitbox.hitbox_size
+        cs = self.cell_size
+        x0 = int(x // cs)
+        y0 = int(y // cs)
+        x1 = int((x + max(w, 0)) // cs)
+        y1 = int((y + max(h, 0)) // cs)
+        return tuple((cx, cy) for cx in range(x0, x1 + 1) for cy in range(y0, y1 + 1))
+
+    def insert(self, hitbox):
+        with self._lock:
+            if id(hitbox) in self._hitbox_cells:
+                self.update(hitbox)
+                return
+            self._order[id(hitbox)] = next(self._sequence)
+            cells = self._cells_of(hitbox)
+            self._hitbox_cells[id(hitbox)] = cells
+            for cell in cells:
+                self._cells.setdefault(cell, set()).add(hitbox)
+
+    def remove(self, hitbox):
+        with self._lock:
+            cells = self._hitbox_cells.pop(id(hitbox), None)
+            self._order.pop(id(hitbox), None)
+            if cells is None:
+                return
+            for cell in cells:
+                bucket = self._cells.get(cell)
+                if bucket is None:
+                    continue
+                bucket.discard(hitbox)
+                if not bucket:
+                    del self._cells[cell]
+
+    def update(self, hitbox):
+        """ Moves the hitbox to the cells of its current location and size """
+        with self._lock:
+            old_cells = self._hitbox_cells.get(id(hitbox))
+            if old_cells is None:
+                return
+            new_cells = self._cells_of(hitbox)
+            if new_cells == old_cells:
+                return
+
+            old = set(old_cells)
+            new = set(new_cells)
+            for cell in old - new:
+                bucket = self._cells.get(cell)
+                if bucket is not None:
+                    bucket.discard(hitbox)
+                    if not bucket:
+                        del self._cells[cell]
+            for cell in new - old:
+                self._cells.setdefault(cell, set()).add(hitbox)
+            self._hitbox_cells[id(hitbox)] = new_cells
+
+    def sorted(self, hitboxes: Iterable) -> list:
+        """ Sorts hitboxes in z-order """
+        order = self._order
+        return sorted(hitboxes, key=lambda h: (h.z_index, order.get(id(h), 0)))
+
+    def query(self, x, y) -> list:
+        """ Returns the enabled hitboxes containing (x, y) in z-order """
+        cs = self.cell_size
+        with self._lock:
+            bucket = self._cells.get((int(x // cs), int(y // cs)))
+            if not bucket:
+                return []
+            candidates = [h for h in bucket if h.enabled and h._mouse_in_hitbox(x, y)]
+        return self.sorted(candidates)
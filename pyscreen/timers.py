@@ -0,0 +1,189 @@
+import asyncio
+import datetime
+import heapq
+import inspect
+from itertools import count
+from threading import Lock
+from time import monotonic
+from typing import Callable
+
+from pyscreen.logging import getLogger
+logger = getLogger()
+
+
+def _seconds(interval) -> float:
+    if isinstance(interval, datetime.timedelta):
+        return interval.total_seconds()
+    return float(interval)
+
+
+class Timer:
+    """ One-shot or repeating timer, created by TimerScheduler.add """
+    __slots__ = ("id", "func", "interval", "deadline", "repeat", "cancelled", "is_async", "runs")
+
+    def __init__(self, id: int, func: Callable, interval: float, deadline: float, repeat: bool):
+        self.id = id
+        self.func = func
+        self.interval = interval
+        self.deadline = deadline
+        self.repeat = repeat
+        self.cancelled = False
+        self.is_async = inspect.iscoroutinefunction(func)
+        self.runs = 0
+
+
+class TimerStats:
+    """ Lag of the timers, the time between their deadline and the moment they were run """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.fired = 0
+        self.missed = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self._lag_sum = 0.0
+
+    @property
+    def avg_lag(self) -> float:
+        if self.fired == 0:
+            return 0.0
+        return self._lag_sum / self.fired
+
+    def record(self, lag: float, missed: int):
+        self.fired += 1
+        self.missed += missed
+        self.last_lag = lag
+        self._lag_sum += lag
+        if lag > self.max_lag:
+            self.max_lag = lag
+
+    def as_dict(self) -> dict:
+        return {
+            "fired": self.fired,
+            "missed": self.missed,
+            "last_lag": self.last_lag,
+            "max_lag": self.max_lag,
+            "avg_lag": self.avg_lag,
+        }
+
+    def __str__(self):
+        return (f"timers: {self.fired} fired, {self.missed} missed, lag {self.last_lag*1000:.1f}ms "
+                f"(avg {self.avg_lag*1000:.1f}ms, max {self.max_lag*1000:.1f}ms)")
+
+
+class TimerScheduler:
+    """ Min-heap of timer deadlines on the monotonic clock
+
+        Only timers whose deadline has passed are touched. Repeating timers are
+        rescheduled relative to their previous deadline, so they do not drift;
+        periods that were missed completely are skipped (and counted) instead of
+        being run back to back.
+    """
+
+    def __init__(self):
+        self.stats = TimerStats()
+        self._lock = Lock()
+        self._heap: list[tuple[float, int, Timer]] = []
+        self._timers: dict[int, Timer] = {}
+        self._sequence = count()
+        self._ids = count(1)
+
+    def __len__(self):
+        return len(self._timers)
+
+    def __contains__(self, id):
+        return id in self._timers
+
+    def add(self, func: Callable, interval, repeat: bool = True, delay=None) -> Timer:
+        """ Runs func every interval (or once after interval if repeat is False).
+            The first run happens after delay, which defaults to interval """
+        interval = _seconds(interval)
+        if interval < 0 or (repeat and interval == 0):
+            raise ValueError("interval must be positive")
+        delay = interval if delay is None else _seconds(delay)
+
+        with self._lock:
+            timer = Timer(next(self._ids), func, interval, monotonic() + delay, repeat)
+            self._timers[timer.id] = timer
+            heapq.heappush(self._heap, (timer.deadline, next(self._sequence), timer))
+        return timer
+
+    def cancel(self, id: int) -> bool:
+        with self._lock:
+            timer = self._timers.pop(id, None)
+        if timer is None:
+            return False
+        # the heap entry is discarded lazily once it comes due
+        timer.cancelled = True
+        return True
+
+    def clear(self):
+        with self._lock:
+            for timer in self._timers.values():
+                timer.cancelled = True
+            self._timers.clear()
+            self._heap.clear()
+
+    def next_deadline(self) -> float|None:
+        """ Monotonic time of the next due timer or None if there are no timers """
+        with self._lock:
+            while self._heap and self._heap[0][2].cancelled:
+                heapq.heappop(self._heap)
+            if not self._heap:
+                return None
+            return self._heap[0][0]
+
+    def timeout(self, now: float|None = None) -> float|None:
+        """ Seconds until the next timer is due """
+        deadline = self.next_deadline()
+        if deadline is None:
+            return None
+        if now is None:
+            now = monotonic()
+        return max(deadline - now, 0.0)
+
+    def pop_due(self, now: float|None = None) -> list[Timer]:
+        """ Returns the timers that are due and reschedules the repeating ones """
+        if now is None:
+            now = monotonic()
+
+        due = []
+        with self._lock:
+            heap = self._heap
+            while heap and heap[0][0] <= now:
+                deadline, _, timer = heapq.heappop(heap)
+                if timer.cancelled:
+                    continue
+
+                lag = now - deadline
+                missed = 0
+                if timer.repeat:
+                    missed = int(lag // timer.interval)
+                    timer.deadline = deadline + (missed + 1) * timer.interval
+                    heapq.heappush(heap, (timer.deadline, next(self._sequence), timer))
+                else:
+                    self._timers.pop(timer.id, None)
+
+                timer.runs += 1
+                self.stats.record(lag, missed)
+                due.append(timer)
+        return due
+
+    async def run_due(self, now: float|None = None):
+        """ Runs the due timers, coroutine functions are awaited together """
+        coros = []
+        for timer in self.pop_due(now):
+            try:
+                if timer.is_async:
+                    coros.append(timer.func())
+                else:
+                    timer.func()
+            except Exception as e:
+                logger.exception(e)
+
+        if coros:
+            for result in await asyncio.gather(*coros, return_exceptions=True):
+                if isinstance(result, Exception):
+                    logger.exception(result)